@@ -0,0 +1,394 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for the SensoryAI system
+Measures the text sensing and integration hot paths, the numeric sensing
+paths and memory growth, and writes machine-readable JSON results
+
+Usage:
+    python benchmarks.py                      # run everything
+    python benchmarks.py see experience       # run selected benchmarks
+    python benchmarks.py --quick --json out.json --compare baseline.json
+"""
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+import numpy as np
+from sensory_ai import SensoryAI, SensoryBrain, Vision, Hearing, Touch, Smell, Taste
+from sensory_corpus import EnvironmentGenerator, generate_environments
+from sensory_similarity import SimilarityIndex, encode_experience
+
+def _best_time(run, repeats: int) -> float:
+    """Fastest of several timed runs, to filter out scheduler noise"""
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def bench_analyzer(sense: str, calls: int = 20000, words: int = 12, hit_density: float = 0.25,
+                   repeats: int = 5, seed: int = 0) -> dict:
+    """Time one text analyzer on synthetic descriptions"""
+    generator = EnvironmentGenerator(words=words, keyword_density=hit_density, seed=seed)
+    descriptions = [generator.description(sense) for _ in range(calls)]
+    analyzer = {
+        'vision': lambda: Vision().see,
+        'hearing': lambda: Hearing().hear,
+        'touch': lambda: Touch().feel,
+        'smell': lambda: Smell().smell,
+        'taste': lambda: Taste().taste
+    }[sense]
+
+    def run():
+        analyze = analyzer()  # fresh instance so memory growth is the same each repeat
+        for description in descriptions:
+            analyze(description)
+
+    elapsed = _best_time(run, repeats)
+    return {
+        'benchmark': f"analyzer_{sense}",
+        'calls': calls,
+        'words': words,
+        'hit_density': hit_density,
+        'seconds': elapsed,
+        'calls_per_second': calls / elapsed,
+        'microseconds_per_call': elapsed / calls * 1e6
+    }
+
+def bench_integrate_senses(calls: int = 20000, repeats: int = 5) -> dict:
+    """Time SensoryBrain.integrate_senses with full recent memories"""
+    def run():
+        brain = SensoryBrain()
+        for environment in generate_environments(10):
+            for sense, description in environment.items():
+                brain.process_sensory_input(sense, description)
+        for _ in range(calls):
+            brain.integrate_senses()
+
+    elapsed = _best_time(run, repeats)
+    return {
+        'benchmark': 'integrate_senses',
+        'calls': calls,
+        'seconds': elapsed,
+        'calls_per_second': calls / elapsed,
+        'microseconds_per_call': elapsed / calls * 1e6
+    }
+
+def bench_experience(calls: int = 5000, words: int = 12, hit_density: float = 0.25,
+                     repeats: int = 3) -> dict:
+    """Time the full SensoryAI.experience path (without console output)"""
+    environments = list(generate_environments(calls, words=words, keyword_density=hit_density))
+
+    def run():
+        ai = SensoryAI("Bench", verbose=False)
+        for environment in environments:
+            ai.experience(environment)
+
+    elapsed = _best_time(run, repeats)
+    return {
+        'benchmark': 'experience',
+        'calls': calls,
+        'words': words,
+        'hit_density': hit_density,
+        'seconds': elapsed,
+        'experiences_per_second': calls / elapsed,
+        'microseconds_per_call': elapsed / calls * 1e6
+    }
+
+def bench_history_growth(total: int = 50000, checkpoints: int = 5) -> dict:
+    """Throughput of experience() in successive segments as the history grows"""
+    environments = list(generate_environments(1000))
+    ai = SensoryAI("Bench", verbose=False)
+    segment = total // checkpoints
+    rates = []
+    for _ in range(checkpoints):
+        start = time.perf_counter()
+        for i in range(segment):
+            ai.experience(environments[i % len(environments)])
+        rates.append(segment / (time.perf_counter() - start))
+    return {
+        'benchmark': 'history_growth',
+        'experiences': total,
+        'segment_rates_per_second': rates,
+        # Below 1.0 means experiences get slower as the history grows
+        'last_to_first_ratio': rates[-1] / rates[0],
+        'history_query_microseconds': _best_time(ai.get_experience_history, 5) * 1e6
+    }
+
+def bench_memory_footprint(experiences: int = 5000) -> dict:
+    """Traced allocations retained per experience, scaled to a million"""
+    environments = list(generate_environments(1000))
+    ai = SensoryAI("Bench", verbose=False)
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    for i in range(experiences):
+        ai.experience(environments[i % len(environments)])
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    retained = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+    return {
+        'benchmark': 'memory_footprint',
+        'experiences': experiences,
+        'bytes_per_experience': retained / experiences,
+        'megabytes_per_million': retained / experiences  # bytes per experience == MB per million
+    }
+
+# Child process that times a cold import and reports which heavy modules it loaded
+IMPORT_PROBE = (
+    "import sys, time\n"
+    "start = time.perf_counter()\n"
+    "import {module}\n"
+    "elapsed = time.perf_counter() - start\n"
+    "{module}.SensoryAI('Probe', verbose=False).experience({{'vision': 'red car', 'smell': 'coffee'}})\n"
+    "print(elapsed, *[name for name in ('numpy', 'pickle', 'asyncio', 'http.server')\n"
+    "                 if name in sys.modules])\n"
+)
+
+def bench_import_time(module: str = 'sensory_ai', repeats: int = 7) -> dict:
+    """Median cold import time in fresh interpreters, as short-lived workers see it"""
+    times = []
+    for _ in range(repeats):
+        output = subprocess.run([sys.executable, '-c', IMPORT_PROBE.format(module=module)],
+                                capture_output=True, text=True, check=True).stdout.split()
+        times.append(float(output[0]))
+    times.sort()
+    return {
+        'benchmark': 'import_time',
+        'module': module,
+        'repeats': repeats,
+        'seconds': times[len(times) // 2],
+        # Heavy modules still loaded after importing and running a text experience
+        'heavy_modules_loaded': " ".join(output[1:]) or "none"
+    }
+
+def bench_vision_frames(frames: int = 20, width: int = 1920, height: int = 1080,
+                        seed: int = 0) -> dict:
+    """Time Vision.see_image on random full-HD RGB frames"""
+    rng = np.random.default_rng(seed)
+    frame = rng.integers(0, 256, size=(height, width, 3), dtype=np.uint8)
+    vision = Vision()
+    vision.see_image(frame)  # warm up
+
+    start = time.perf_counter()
+    for _ in range(frames):
+        vision.see_image(frame)
+    elapsed = time.perf_counter() - start
+
+    return {
+        'benchmark': 'vision_frames',
+        'resolution': f"{width}x{height}",
+        'frames': frames,
+        'seconds': elapsed,
+        'frames_per_second': frames / elapsed,
+        'megapixels_per_second': frames * width * height / elapsed / 1e6
+    }
+
+def bench_audio_stream(seconds: float = 60.0, sample_rate: int = 48000,
+                       chunk_size: int = 4800, seed: int = 0) -> dict:
+    """Stream noisy tones through Hearing.listen and report the realtime factor"""
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    signal = 0.3 * np.sin(2 * np.pi * 440 * t) + 0.05 * rng.standard_normal(len(t))
+    pcm = (signal * 32767).astype(np.int16)
+    chunks = [pcm[i:i + chunk_size] for i in range(0, len(pcm), chunk_size)]
+    hearing = Hearing()
+
+    start = time.perf_counter()
+    windows = sum(1 for _ in hearing.listen(chunks, sample_rate=sample_rate))
+    elapsed = time.perf_counter() - start
+
+    return {
+        'benchmark': 'audio_stream',
+        'audio_seconds': seconds,
+        'sample_rate': sample_rate,
+        'windows': windows,
+        'seconds': elapsed,
+        # Processing time per second of audio; below 1.0 keeps up with realtime
+        'realtime_factor': elapsed / seconds
+    }
+
+def bench_touch_feed(seconds: float = 60.0, sample_rate: int = 5000,
+                     chunk_size: int = 500, seed: int = 0) -> dict:
+    """Feed kHz pressure and temperature readings through Touch.feel_stream"""
+    rng = np.random.default_rng(seed)
+    total = int(seconds * sample_rate)
+    pressure = rng.normal(40.0, 8.0, total)
+    temperature = rng.normal(30.0, 0.5, total)
+    chunks = [(pressure[i:i + chunk_size], temperature[i:i + chunk_size])
+              for i in range(0, total, chunk_size)]
+    touch = Touch()
+
+    start = time.perf_counter()
+    for _ in touch.feel_stream(chunks):
+        pass
+    elapsed = time.perf_counter() - start
+
+    return {
+        'benchmark': 'touch_feed',
+        'samples': total,
+        'window_size': touch.window_size,
+        'seconds': elapsed,
+        'samples_per_second': 2 * total / elapsed
+    }
+
+def bench_recall(vectors: int = 1_000_000, queries: int = 200, k: int = 10,
+                 seed: int = 0) -> dict:
+    """k-NN lookups over encoded experiences: brute force versus the IVF index"""
+    rng = np.random.default_rng(seed)
+    ai = SensoryAI("Bench", verbose=False)
+    for environment in generate_environments(2000, seed=seed):
+        ai.experience(environment)
+    encoded = np.stack([encode_experience(integrated) for integrated in ai.brain.sensory_integration])
+    # Jitter real encodings to reach the requested size without duplicate rows
+    data = encoded[rng.integers(0, len(encoded), vectors)]
+    data += rng.normal(0.0, 0.02, data.shape).astype(np.float32)
+    probes = data[rng.integers(0, vectors, queries)]
+
+    start = time.perf_counter()
+    ivf = SimilarityIndex()
+    for begin in range(0, vectors, 100_000):
+        ivf.add(data[begin:begin + 100_000])
+    build = time.perf_counter() - start
+    flat = SimilarityIndex(ivf_threshold=vectors + 1)
+    flat.add(data)
+
+    def timed(index):
+        start = time.perf_counter()
+        results = [[position for position, _ in index.search(probe, k)] for probe in probes]
+        return results, (time.perf_counter() - start) / queries
+    approximate, ivf_seconds = timed(ivf)
+    exact, flat_seconds = timed(flat)
+    recall = np.mean([len(set(a) & set(e)) / k for a, e in zip(approximate, exact)])
+
+    return {
+        'benchmark': 'recall',
+        'vectors': vectors,
+        'k': k,
+        'ivf_lists': len(ivf._lists),
+        'build_seconds': build,
+        'brute_force_ms': flat_seconds * 1e3,
+        'ivf_ms': ivf_seconds * 1e3,
+        'recall_at_k': float(recall)
+    }
+
+BENCHMARKS = {
+    'see': lambda **kw: bench_analyzer('vision', **kw),
+    'hear': lambda **kw: bench_analyzer('hearing', **kw),
+    'feel': lambda **kw: bench_analyzer('touch', **kw),
+    'smell': lambda **kw: bench_analyzer('smell', **kw),
+    'taste': lambda **kw: bench_analyzer('taste', **kw),
+    'integrate': bench_integrate_senses,
+    'experience': bench_experience,
+    'history': bench_history_growth,
+    'memory': bench_memory_footprint,
+    'import': bench_import_time,
+    'vision_frames': bench_vision_frames,
+    'audio_stream': bench_audio_stream,
+    'touch_feed': bench_touch_feed,
+    'recall': bench_recall,
+}
+
+# Smaller workloads for smoke runs (--quick)
+QUICK_ARGS = {
+    'see': {'calls': 2000, 'repeats': 2},
+    'hear': {'calls': 2000, 'repeats': 2},
+    'feel': {'calls': 2000, 'repeats': 2},
+    'smell': {'calls': 2000, 'repeats': 2},
+    'taste': {'calls': 2000, 'repeats': 2},
+    'integrate': {'calls': 2000, 'repeats': 2},
+    'experience': {'calls': 500, 'repeats': 2},
+    'history': {'total': 5000},
+    'memory': {'experiences': 1000},
+    'import': {'repeats': 3},
+    'vision_frames': {'frames': 3},
+    'audio_stream': {'seconds': 5.0},
+    'touch_feed': {'seconds': 5.0},
+    'recall': {'vectors': 100_000, 'queries': 50},
+}
+
+def run_metadata() -> dict:
+    """Environment details stored alongside results so runs can be compared"""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True,
+                                text=True, timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        'timestamp': datetime.now().isoformat(),
+        'commit': commit,
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'processor': platform.processor()
+    }
+
+def run_benchmarks(names=None, quick: bool = False) -> dict:
+    """Run benchmarks by name (all by default) and return a JSON-ready report"""
+    results = []
+    for name in names or list(BENCHMARKS):
+        result = BENCHMARKS[name](**(QUICK_ARGS.get(name, {}) if quick else {}))
+        result['name'] = name
+        results.append(result)
+    return {'meta': run_metadata(), 'quick': quick, 'results': results}
+
+# Result keys where a larger value is better; all other rates are times
+THROUGHPUT_SUFFIXES = ('_per_second', 'last_to_first_ratio', 'recall_at_k')
+
+def compare_reports(current: dict, baseline: dict) -> list:
+    """Lines describing how each numeric result moved against a baseline report"""
+    previous = {result['name']: result for result in baseline.get('results', [])}
+    lines = []
+    for result in current['results']:
+        old = previous.get(result['name'])
+        if old is None:
+            continue
+        for key, value in result.items():
+            # Unchanged floats are workload parameters such as hit_density
+            if isinstance(value, float) and isinstance(old.get(key), float) and old[key] \
+                    and value != old[key]:
+                change = value / old[key] - 1.0
+                better = change > 0 if key.endswith(THROUGHPUT_SUFFIXES) else change < 0
+                lines.append(f"{result['name']:<15} {key:<28} {old[key]:>12.4g} -> {value:>12.4g} "
+                             f"({change:+.1%}{'' if abs(change) < 0.05 else ' better' if better else ' worse'})")
+    return lines
+
+def main():
+    """Run the selected benchmarks, print the results and optionally save JSON"""
+    parser = argparse.ArgumentParser(description="SensoryAI benchmarks")
+    parser.add_argument('names', nargs='*', metavar='name',
+                        help=f"benchmarks to run: {', '.join(BENCHMARKS)}")
+    parser.add_argument('--quick', action='store_true', help="use small workloads")
+    parser.add_argument('--json', metavar='PATH', help="write results as JSON")
+    parser.add_argument('--compare', metavar='PATH', help="compare against a previous JSON report")
+    args = parser.parse_args()
+    unknown = [name for name in args.names if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmark(s): {', '.join(unknown)}")
+
+    report = run_benchmarks(args.names, args.quick)
+    for result in report['results']:
+        print(f"\n=== {result['benchmark']} ===")
+        for key, value in result.items():
+            if key not in ('benchmark', 'name'):
+                if isinstance(value, list):
+                    value = ", ".join(f"{v:.4g}" for v in value)
+                print(f"  {key}: {value:.4g}" if isinstance(value, float) else f"  {key}: {value}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults written to {args.json}")
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        print(f"\n=== Comparison with {args.compare} ===")
+        print("\n".join(compare_reports(report, baseline)) or "No comparable results")
+
+if __name__ == "__main__":
+    main()
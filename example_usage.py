@@ -4,7 +4,8 @@ Example usage of the SensoryAI system
 Demonstrates various environments and scenarios
 """
 
-from sensory_ai import SensoryAI
+from sensory_ai import SensoryAI, format_sensory_stats
+from sensory_corpus import PRESETS
 import time
 
 def demo_basic_usage():
@@ -34,47 +35,15 @@ def demo_environment_comparison():
     ai = SensoryAI("CompareAI")
     ai.wake_up()
     
-    # Environment 1: Peaceful nature
-    nature_env = {
-        "vision": "Green forest with tall trees and blue sky",
-        "hearing": "Soft wind and distant bird songs",
-        "touch": "Cool breeze and soft grass under feet",
-        "smell": "Fresh pine and earth",
-        "taste": "Clean, fresh air"
-    }
-    
-    print("\n--- Nature Environment ---")
-    ai.experience(nature_env)
-    
-    # Environment 2: Urban chaos
-    urban_env = {
-        "vision": "Tall buildings, bright lights, moving cars",
-        "hearing": "Loud traffic, horns, people talking",
-        "touch": "Hard concrete, warm air",
-        "smell": "Exhaust fumes and city smells",
-        "taste": "Polluted air taste"
-    }
-    
-    print("\n--- Urban Environment ---")
-    ai.experience(urban_env)
-    
-    # Environment 3: Cozy home
-    home_env = {
-        "vision": "Warm lighting, comfortable furniture, family photos",
-        "hearing": "Soft music, gentle conversation",
-        "touch": "Soft cushions, warm temperature",
-        "smell": "Home cooking and comfort",
-        "taste": "Warm tea taste"
-    }
-    
-    print("\n--- Home Environment ---")
-    ai.experience(home_env)
+    # Environments 1-3: peaceful nature, urban chaos and a cozy home
+    for name in ("Forest Adventure", "Busy City Street", "Cozy Home"):
+        print(f"\n--- {name} ---")
+        ai.experience(PRESETS[name])
     
     # Show statistics
     print("\n--- Final Statistics ---")
-    stats = ai.get_sensory_stats()
-    for key, value in stats.items():
-        print(f"{key.replace('_', ' ').title()}: {value}")
+    for line in format_sensory_stats(ai.get_sensory_stats()):
+        print(line)
     
     ai.sleep()
 
@@ -4,7 +4,8 @@ Interactive demo for the SensoryAI system
 Allows users to create custom sensory experiences
 """
 
-from sensory_ai import SensoryAI
+from sensory_ai import SensoryAI, format_sensory_stats
+from sensory_corpus import PRESETS
 import json
 
 def print_banner():
@@ -62,57 +63,10 @@ def create_custom_environment():
 
 def preset_environments():
     """Show preset environments"""
+    icons = ["🌅", "🏙️", "🌲", "🏠", "🎵"]
     presets = {
-        "1": {
-            "name": "🌅 Peaceful Sunrise",
-            "environment": {
-                "vision": "Golden sunrise over calm ocean, pink clouds, seagulls flying",
-                "hearing": "Gentle ocean waves, distant seagull calls, soft wind",
-                "touch": "Warm morning sun, cool ocean breeze, soft sand",
-                "smell": "Fresh ocean air, salty breeze, morning dew",
-                "taste": "Clean, fresh morning air"
-            }
-        },
-        "2": {
-            "name": "🏙️ Busy City Street",
-            "environment": {
-                "vision": "Tall skyscrapers, bright neon lights, busy traffic, people walking",
-                "hearing": "Loud traffic, car horns, people talking, sirens",
-                "touch": "Hard concrete sidewalk, warm city air, vibration from traffic",
-                "smell": "Car exhaust, street food, city air",
-                "taste": "Polluted air, street food aromas"
-            }
-        },
-        "3": {
-            "name": "🌲 Forest Adventure",
-            "environment": {
-                "vision": "Tall green trees, dappled sunlight, moss-covered rocks, wildlife",
-                "hearing": "Rustling leaves, bird songs, flowing stream, animal sounds",
-                "touch": "Rough tree bark, soft moss, cool shade, fresh air",
-                "smell": "Pine trees, earth, fresh air, wildflowers",
-                "taste": "Clean forest air, natural freshness"
-            }
-        },
-        "4": {
-            "name": "🏠 Cozy Home",
-            "environment": {
-                "vision": "Warm lighting, comfortable furniture, family photos, fireplace",
-                "hearing": "Soft music, gentle conversation, crackling fire, quiet comfort",
-                "touch": "Soft cushions, warm temperature, comfortable fabrics",
-                "smell": "Home cooking, comfort, warmth, family",
-                "taste": "Warm tea, home-cooked meal, comfort"
-            }
-        },
-        "5": {
-            "name": "🎵 Concert Hall",
-            "environment": {
-                "vision": "Bright stage lights, musicians, audience, elegant hall",
-                "hearing": "Beautiful music, applause, instruments, acoustics",
-                "touch": "Vibrating bass, warm crowd, excitement, elegant seating",
-                "smell": "Perfume, excitement, venue air, anticipation",
-                "taste": "Excitement, anticipation, elegant atmosphere"
-            }
-        }
+        str(number): {"name": f"{icon} {name}", "environment": environment}
+        for number, (icon, (name, environment)) in enumerate(zip(icons, PRESETS.items()), 1)
     }
     
     print("\n🎭 Available Preset Environments:")
@@ -173,32 +127,49 @@ def view_statistics(ai):
     print("\n📊 Sensory Statistics")
     print("-" * 30)
     
-    stats = ai.get_sensory_stats()
-    for key, value in stats.items():
-        formatted_key = key.replace('_', ' ').title()
-        print(f"{formatted_key}: {value}")
+    for line in format_sensory_stats(ai.get_sensory_stats()):
+        print(line)
 
 def view_history(ai):
     """View experience history"""
     print("\n📚 Experience History")
     print("-" * 30)
     
-    history = ai.get_experience_history()
-    
-    if not history:
+    if not ai.get_experience_history():
         print("No experiences recorded yet.")
         return
     
-    for i, experience in enumerate(history, 1):
-        print(f"\nExperience {i}:")
-        print(f"  Timestamp: {experience['timestamp']}")
-        print(f"  Environment: {list(experience['environment'].keys())}")
+    # Optional filters; only one page of history is read at a time
+    senses = ai.history.senses()
+    sense = get_user_input(f"Dominant sense filter ({', '.join(senses)}) or Enter for all")
+    since = get_user_input("Since (YYYY-MM-DD) or Enter for all") or None
+    page_number = 0
+    
+    while True:
+        page = ai.query_history(page_number, 5, since=since, dominant_sense=sense or None)
+        if page.total == 0:
+            print("No experiences match these filters.")
+            return
+        
+        print(f"\nPage {page.page + 1} of {page.pages} ({page.total} experiences, newest first)")
+        for position, experience in zip(page.positions, page.entries):
+            print(f"\nExperience {position + 1}:")
+            print(f"  Timestamp: {experience['timestamp']}")
+            print(f"  Environment: {list(experience['environment'].keys())}")
+            
+            # Show brief summary
+            integrated = experience['experience']['integrated_experience']
+            print(f"  Quality: {integrated['experience_quality']}")
+            print(f"  Dominant Sense: {integrated['dominant_sense']}")
+            print(f"  Overall Intensity: {integrated['overall_intensity']:.2f}")
         
-        # Show brief summary
-        integrated = experience['experience']['integrated_experience']
-        print(f"  Quality: {integrated['experience_quality']}")
-        print(f"  Dominant Sense: {integrated['dominant_sense']}")
-        print(f"  Overall Intensity: {integrated['overall_intensity']:.2f}")
+        action = get_user_input("\n[n]ext page, [p]revious page or Enter to return").lower()
+        if action == "n" and page_number + 1 < page.pages:
+            page_number += 1
+        elif action == "p" and page_number > 0:
+            page_number -= 1
+        elif action not in ("n", "p"):
+            return
 
 def quick_experiments(ai):
     """Run quick experiments"""
@@ -1,11 +1,50 @@
+from __future__ import annotations
+
+import importlib
+import sys
 import time
-import json
+import bisect
+import mmap
+import os
+import struct
+import zlib
+import copy
 import threading
-from typing import Dict, List, Any, Optional
-from dataclasses import dataclass
+from collections.abc import Sequence
+from typing import Dict, List, Any, Iterable, Iterator, Optional, Tuple
+from dataclasses import dataclass, field, replace
+from operator import attrgetter
 from datetime import datetime
-import random
-import numpy as np
+from sensory_feed import (ChangeFeed, Subscription, DROP, SENSORY_INPUT,
+                          INTEGRATED_EXPERIENCE, EXPERIENCE)
+from sensory_consolidation import MemoryConsolidation
+from sensory_stats import IntensityDistribution, KeywordSketch
+from sensory_timeline import IntensityTimeline, TimelineSeries
+from sensory_instrumentation import (Profiler, ChromeTracer, describe_for_trace, STAGE_EXPERIENCE,
+                                     STAGE_INTEGRATE, STAGE_QUALITY, STAGE_LOGGING, STAGE_PRINTING)
+
+class _LazyModule:
+    """Stand-in for a heavy module that is imported on first attribute access"""
+    
+    def __init__(self, name: str, alias: str):
+        self._name = name
+        self._alias = alias
+    
+    def __getattr__(self, attr):
+        module = importlib.import_module(self._name)
+        globals()[self._alias] = module  # later lookups skip the stand-in
+        return getattr(module, attr)
+
+# numpy is only needed for raw image, audio and sensor arrays and pickle only
+# for snapshots, so text-only workers never pay for importing them
+np = _LazyModule('numpy', 'np')
+pickle = _LazyModule('pickle', 'pickle')
+sensory_similarity = _LazyModule('sensory_similarity', 'sensory_similarity')
+
+def _is_ndarray(value) -> bool:
+    """isinstance(value, np.ndarray) without importing numpy"""
+    numpy = sys.modules.get('numpy')
+    return numpy is not None and isinstance(value, numpy.ndarray)
 
 @dataclass
 class SensoryInput:
@@ -15,16 +54,381 @@ class SensoryInput:
     quality: str
     location: Optional[str] = None
     timestamp: float = None
+    details: Optional[Dict[str, Any]] = None  # measurements from numeric inputs
     
     def __post_init__(self):
         if self.timestamp is None:
             self.timestamp = time.time()
 
+# Snapshot container format: a sequence of frames, each a fixed header followed
+# by a pickled payload.  The first frame of a file is a full checkpoint; any
+# frames after it are deltas holding only what was appended since the previous
+# frame, so a checkpoint file can be extended cheaply and restored in one pass.
+SNAPSHOT_MAGIC = b'SAIS'
+SNAPSHOT_VERSION = 1
+SNAPSHOT_FULL = 0
+SNAPSHOT_DELTA = 1
+_SNAPSHOT_COMPRESSED = 0x80
+_SNAPSHOT_HEADER = struct.Struct('<4sBBQIQ')  # magic, version, kind|flags, chain id, sequence, payload length
+
+def iter_snapshot_frames(buffer):
+    """Yield (kind, chain_id, sequence, payload) for each frame in a snapshot buffer"""
+    view = memoryview(buffer)
+    offset = 0
+    try:
+        while offset < len(view):
+            if len(view) - offset < _SNAPSHOT_HEADER.size:
+                raise ValueError("Truncated snapshot frame header")
+            magic, version, kind, chain_id, sequence, length = _SNAPSHOT_HEADER.unpack_from(view, offset)
+            if magic != SNAPSHOT_MAGIC:
+                raise ValueError("Not a SensoryAI snapshot")
+            if version != SNAPSHOT_VERSION:
+                raise ValueError(f"Unsupported snapshot version: {version}")
+            offset += _SNAPSHOT_HEADER.size
+            if len(view) - offset < length:
+                raise ValueError("Truncated snapshot frame payload")
+            with view[offset:offset + length] as payload:
+                if kind & _SNAPSHOT_COMPRESSED:
+                    state = pickle.loads(zlib.decompress(payload))
+                else:
+                    state = pickle.loads(payload)
+            offset += length
+            yield kind & ~_SNAPSHOT_COMPRESSED, chain_id, sequence, state
+    finally:
+        view.release()
+
+# Default sense priority when shedding work; the sense matching the current
+# attention focus is always promoted to the front
+SENSE_PRIORITY = ('vision', 'hearing', 'touch', 'smell', 'taste')
+ATTENTION_SENSES = {
+    'visual': 'vision',
+    'auditory': 'hearing',
+    'tactile': 'touch',
+    'olfactory': 'smell',
+    'gustatory': 'taste'
+}
+# Integration variants from full to cheapest: (cost key, include_inputs, assess_quality)
+INTEGRATION_MODES = (
+    ('integrate_full', True, True),
+    ('integrate_lean', False, True),
+    ('integrate_minimal', False, False)
+)
+
+# Attribute holding each sense's memory, and the summary totals that count it
+SENSE_MEMORIES = {
+    'vision': 'visual_memory',
+    'hearing': 'auditory_memory',
+    'touch': 'tactile_memory',
+    'smell': 'olfactory_memory',
+    'taste': 'gustatory_memory'
+}
+SUMMARY_TOTALS = {
+    'total_visual_experiences': 'vision',
+    'total_auditory_experiences': 'hearing',
+    'total_tactile_experiences': 'touch',
+    'total_olfactory_experiences': 'smell',
+    'total_gustatory_experiences': 'taste',
+    'total_integrated_experiences': 'sensory_integration'
+}
+# The append-only logs an agent checkpoints, and getters reading them all at once
+SNAPSHOT_LOGS = tuple(SENSE_MEMORIES) + ('sensory_integration', 'experience_log')
+_sense_memory_logs = attrgetter(*(f"{sense}.{memory}" for sense, memory in SENSE_MEMORIES.items()))
+_agent_logs = attrgetter(*(f"brain.{sense}.{memory}" for sense, memory in SENSE_MEMORIES.items()),
+                         'brain.sensory_integration', 'experience_log')
+
+# Degradation flags reported when a latency budget forces shortcuts
+DEGRADED_INPUT_COPIES = "skipped_sensory_inputs"
+DEGRADED_QUALITY = "stale_quality"
+DEGRADED_CACHED_SENSES = "cached_senses"
+DEGRADED_SKIPPED_SENSES = "skipped_senses"
+
+class _LogSegment:
+    """Frozen run of log items, linked to the segment before it"""
+    __slots__ = ('prev', 'items', 'start')
+    
+    def __init__(self, prev: Optional['_LogSegment'], items: list, start: int):
+        self.prev = prev
+        self.items = items
+        self.start = start
+
+class SharedLog(Sequence):
+    """Append-only list whose history can be shared between forks
+    
+    Items live in a chain of frozen segments plus a private tail.  Forking
+    freezes the tail into a new segment (without copying it) and hands the
+    child the same chain, so both sides share the prefix and only their own
+    appends are materialized.  Appends and recent slices touch only the tail;
+    older items are reached by walking back through the segments.
+    """
+    __slots__ = ('_segment', '_frozen_len', '_tail')
+    
+    def __init__(self, items=None):
+        self._segment = None
+        self._frozen_len = 0
+        self._tail = list(items) if items is not None else []
+    
+    def append(self, item: Any):
+        self._tail.append(item)
+    
+    def extend(self, items):
+        self._tail.extend(items)
+    
+    def fork(self) -> 'SharedLog':
+        """Return an O(1) copy that shares all current items with this log"""
+        if self._tail:
+            self._segment = _LogSegment(self._segment, self._tail, self._frozen_len)
+            self._frozen_len += len(self._tail)
+            self._tail = []
+        child = SharedLog.__new__(SharedLog)
+        child._segment = self._segment
+        child._frozen_len = self._frozen_len
+        child._tail = []
+        return child
+    
+    def __len__(self) -> int:
+        return self._frozen_len + len(self._tail)
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                return list(self)[index]
+            return self._range(start, stop)
+        
+        if index < 0:
+            index += len(self)
+        if index < 0 or index >= len(self):
+            raise IndexError("SharedLog index out of range")
+        if index >= self._frozen_len:
+            return self._tail[index - self._frozen_len]
+        segment = self._segment
+        while segment.start > index:
+            segment = segment.prev
+        return segment.items[index - segment.start]
+    
+    def _range(self, start: int, stop: int) -> list:
+        """Items in [start, stop) as a plain list"""
+        frozen = self._frozen_len
+        if start >= frozen:
+            return self._tail[start - frozen:stop - frozen]
+        
+        pieces = [self._tail[:max(0, stop - frozen)]]
+        segment = self._segment
+        while segment is not None and segment.start + len(segment.items) > start:
+            if segment.start < stop:
+                pieces.append(segment.items[max(0, start - segment.start):stop - segment.start])
+            segment = segment.prev
+        result = []
+        for piece in reversed(pieces):
+            result.extend(piece)
+        return result
+    
+    def _segments(self) -> List[list]:
+        """Frozen item runs, oldest first"""
+        runs = []
+        segment = self._segment
+        while segment is not None:
+            runs.append(segment.items)
+            segment = segment.prev
+        runs.reverse()
+        return runs
+    
+    def __iter__(self):
+        for items in self._segments():
+            yield from items
+        yield from self._tail
+    
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (SharedLog, list)):
+            return len(self) == len(other) and list(self) == list(other)
+        return NotImplemented
+    
+    def __repr__(self) -> str:
+        return f"SharedLog({list(self)!r})"
+    
+    def __reduce__(self):
+        return (SharedLog, (list(self),))
+
+class InternTable:
+    """Content-addressed store that lets history entries share repeated environments
+    
+    Equal environment dicts are stored once, keyed by a hash of their
+    content, and every history entry points at the same canonical copy.
+    The description strings inside are interned too, so environments that
+    differ in one sense still share the others.  History holds the
+    canonical objects directly, so nothing it references is ever freed
+    early; sweep() rebuilds the table from the entries still in history to
+    reclaim the rest.  Canonical environments are shared and must not be
+    mutated.
+    """
+    
+    def __init__(self):
+        self.environments: Dict[int, Dict[str, Any]] = {}  # content hash -> canonical dict
+        self.descriptions: Dict[str, str] = {}
+        self.hits = 0
+    
+    def __len__(self) -> int:
+        return len(self.environments)
+    
+    def description(self, description):
+        """Canonical copy of a description string (other values pass through)"""
+        if type(description) is not str:
+            return description
+        return self.descriptions.setdefault(description, description)
+    
+    def environment(self, environment: Dict[str, Any]) -> Dict[str, Any]:
+        """Canonical copy of an environment, storing it on first sight"""
+        try:
+            key = hash(frozenset(environment.items()))
+        except TypeError:  # unhashable values such as image arrays are kept as given
+            return environment
+        known = self.environments.get(key)
+        if known is not None and known == environment:
+            self.hits += 1
+            return known
+        canonical = {sense: self.description(value) for sense, value in environment.items()}
+        if known is None:  # on a hash collision the first environment keeps the slot
+            self.environments[key] = canonical
+        return canonical
+    
+    def sweep(self, live: Iterable[Dict[str, Any]]) -> int:
+        """Keep only the environments still referenced; returns how many were dropped"""
+        before = len(self.environments)
+        environments, descriptions = {}, {}
+        for environment in live:
+            try:
+                key = hash(frozenset(environment.items()))
+            except TypeError:
+                continue
+            environments.setdefault(key, environment)
+            for value in environment.values():
+                if type(value) is str:
+                    descriptions.setdefault(value, value)
+        self.environments, self.descriptions = environments, descriptions
+        return before - len(environments)
+
+@dataclass
+class HistoryPage:
+    """One page of experience history matching a query"""
+    entries: List[Any]        # log entries on this page
+    positions: List[int]      # their positions in the experience log
+    page: int
+    page_size: int
+    total: int                # entries matching the query on all pages
+    
+    @property
+    def pages(self) -> int:
+        return max(1, -(-self.total // self.page_size))
+
+class HistoryIndex:
+    """Incremental index over an experience log for paged, filtered queries
+    
+    Keeps each entry's timestamp and the positions of the entries per
+    dominant sense, catching up with new entries when queried.  A query
+    finds its date range by bisection and reads only the entries on the
+    requested page, so its cost depends on the page size rather than on
+    the length of the history.  Date filters assume timestamps do not go
+    backwards; if the clock was moved back they fall back to a scan.
+    """
+    
+    def __init__(self, log: SharedLog):
+        self.log = log
+        self._timestamps = SharedLog()
+        self._by_sense = {}
+        self._ordered = True
+    
+    def fork(self, log: SharedLog) -> 'HistoryIndex':
+        """Index for a forked log, sharing what has been indexed so far"""
+        child = HistoryIndex(log)
+        child._timestamps = self._timestamps.fork()
+        child._by_sense = {sense: positions.fork() for sense, positions in self._by_sense.items()}
+        child._ordered = self._ordered
+        return child
+    
+    def _catch_up(self):
+        start = len(self._timestamps)
+        if start == len(self.log):
+            return
+        for position, entry in enumerate(self.log[start:], start):
+            timestamp = entry['timestamp']
+            if self._ordered and self._timestamps and timestamp < self._timestamps[-1]:
+                self._ordered = False
+            self._timestamps.append(timestamp)
+            sense = entry['experience'].get('integrated_experience', {}).get('dominant_sense')
+            positions = self._by_sense.get(sense)
+            if positions is None:
+                positions = self._by_sense[sense] = SharedLog()
+            positions.append(position)
+    
+    @staticmethod
+    def _bound(value) -> Optional[str]:
+        """Log timestamps are ISO strings; accept datetimes, epoch seconds or ISO"""
+        if value is None or isinstance(value, str):
+            return value
+        if isinstance(value, datetime):
+            return value.isoformat()
+        return datetime.fromtimestamp(value).isoformat()
+    
+    def senses(self) -> List[str]:
+        """Dominant senses that occur in the history"""
+        self._catch_up()
+        return sorted(sense for sense in self._by_sense if sense is not None)
+    
+    def query(self, page: int = 0, page_size: int = 20, since=None, until=None,
+              dominant_sense: Optional[str] = None, newest_first: bool = True) -> HistoryPage:
+        """Entries with since <= timestamp < until and the given dominant sense"""
+        if page_size < 1:
+            raise ValueError("Page size must be at least 1")
+        self._catch_up()
+        since, until = self._bound(since), self._bound(until)
+        
+        if self._ordered:
+            low = 0 if since is None else bisect.bisect_left(self._timestamps, since)
+            high = len(self._timestamps) if until is None else bisect.bisect_left(self._timestamps, until)
+            high = max(low, high)
+            sense_positions = None  # matches index into this when filtering by sense
+            if dominant_sense is None:
+                matches = range(low, high)
+            else:
+                sense_positions = self._by_sense.get(dominant_sense, SharedLog())
+                first = bisect.bisect_left(sense_positions, low)
+                matches = range(first, bisect.bisect_left(sense_positions, high, first))
+        else:
+            sense_positions = None
+            candidates = range(len(self._timestamps)) if dominant_sense is None \
+                else self._by_sense.get(dominant_sense, [])
+            timestamps = self._timestamps
+            matches = [p for p in candidates
+                       if (since is None or timestamps[p] >= since)
+                       and (until is None or timestamps[p] < until)]
+        
+        total = len(matches)
+        page = max(0, page)
+        start = page * page_size
+        if newest_first:
+            selected = matches[max(0, total - start - page_size):max(0, total - start)]
+        else:
+            selected = matches[start:start + page_size]
+        if sense_positions is not None:
+            # Read only this page's positions, not every match
+            selected = sense_positions[selected.start:selected.stop]
+        positions = list(selected)[::-1] if newest_first else list(selected)
+        if isinstance(matches, range) and sense_positions is None and positions:
+            # Contiguous positions: one slice instead of a lookup per entry
+            low_position = min(positions[0], positions[-1])
+            run = self.log[low_position:low_position + len(positions)]
+            entries = run[::-1] if newest_first else run
+        else:
+            entries = [self.log[p] for p in positions]
+        return HistoryPage(entries, positions, page, page_size, total)
+
 class Vision:
     """Simulates the sense of sight"""
     
     def __init__(self):
-        self.visual_memory = []
+        self.visual_memory = SharedLog()
+        self.memory_lock = threading.RLock()  # the brain's lock once part of a brain
+        self.clock = time.time  # source of input timestamps
         self.color_perception = {
             'red': (255, 0, 0),
             'green': (0, 255, 0),
@@ -38,15 +442,19 @@ class Vision:
         self.shapes = ['circle', 'square', 'triangle', 'rectangle', 'oval']
         self.objects = ['person', 'car', 'tree', 'building', 'animal', 'book', 'phone']
     
-    def see(self, scene_description: str) -> SensoryInput:
-        """Process visual information"""
+    def see(self, scene_description) -> SensoryInput:
+        """Process visual information from a description or an RGB image array"""
+        if _is_ndarray(scene_description):
+            return self.see_image(scene_description)
+        
         # Simulate visual processing
+        text = scene_description.lower()
         colors = [color for color in self.color_perception.keys() 
-                 if color in scene_description.lower()]
+                 if color in text]
         shapes = [shape for shape in self.shapes 
-                 if shape in scene_description.lower()]
+                 if shape in text]
         objects = [obj for obj in self.objects 
-                  if obj in scene_description.lower()]
+                  if obj in text]
         
         # Calculate visual intensity based on scene complexity
         intensity = min(1.0, (len(colors) + len(shapes) + len(objects)) / 10.0)
@@ -63,10 +471,84 @@ class Vision:
             sense_type="vision",
             intensity=intensity,
             quality=quality,
-            location="visual field"
+            location="visual field",
+            timestamp=self.clock()
+        )
+        
+        with self.memory_lock:
+            self.visual_memory.append(visual_input)
+        return visual_input
+    
+    def see_image(self, image: np.ndarray, max_pixels: int = 250_000,
+                  chunk_pixels: int = 65_536) -> SensoryInput:
+        """Process an H x W x 3 RGB image
+        
+        Frames larger than max_pixels are sampled on a regular grid, and the
+        sampled pixels are classified chunk_pixels at a time, so the working
+        set stays bounded regardless of the frame size.  Each pixel is assigned
+        to its nearest color_perception entry; intensity combines the color
+        diversity of that assignment with the luminance contrast.
+        """
+        if image.ndim != 3 or image.shape[2] not in (3, 4) or image.size == 0:
+            raise ValueError(f"Expected an H x W x 3 image, got shape {image.shape}")
+        
+        # Downsample with a uniform stride to stay within the pixel budget
+        height, width = image.shape[:2]
+        stride = max(1, int(np.ceil(np.sqrt(height * width / max_pixels))))
+        sampled = image[::stride, ::stride, :3]
+        
+        names = list(self.color_perception.keys())
+        palette = np.array(list(self.color_perception.values()), dtype=np.float32)
+        palette_norms = (palette * palette).sum(axis=1)
+        luma_weights = np.array([0.299, 0.587, 0.114], dtype=np.float32)
+        
+        counts = np.zeros(len(names), dtype=np.int64)
+        luma_sum = 0.0
+        luma_sq_sum = 0.0
+        rows_per_chunk = max(1, chunk_pixels // sampled.shape[1])
+        for row in range(0, sampled.shape[0], rows_per_chunk):
+            pixels = sampled[row:row + rows_per_chunk].reshape(-1, 3).astype(np.float32)
+            # Nearest palette entry: argmin of |c|^2 - 2 p.c (|p|^2 is constant per pixel)
+            nearest = np.argmin(palette_norms - 2.0 * (pixels @ palette.T), axis=1)
+            counts += np.bincount(nearest, minlength=len(names))
+            luma = pixels @ luma_weights
+            luma_sum += float(luma.sum(dtype=np.float64))
+            luma_sq_sum += float((luma * luma).sum(dtype=np.float64))
+        
+        total = int(counts.sum())
+        shares = counts / total
+        present = shares[shares > 0]
+        diversity = float(-(present * np.log(present)).sum() / np.log(len(names)))
+        luma_mean = luma_sum / total
+        contrast = min(1.0, np.sqrt(max(0.0, luma_sq_sum / total - luma_mean ** 2)) / 127.5)
+        intensity = min(1.0, 0.5 * diversity + 0.5 * contrast)
+        
+        # Determine visual quality from how many colors share the scene
+        if diversity > 0.66:
+            quality = "complex scene"
+        elif diversity > 0.33:
+            quality = "moderate detail"
+        else:
+            quality = "simple scene"
+        
+        order = np.argsort(-counts, kind='stable')
+        visual_input = SensoryInput(
+            sense_type="vision",
+            intensity=intensity,
+            quality=quality,
+            location="visual field",
+            details={
+                'dominant_colors': [names[i] for i in order[:3] if counts[i] > 0],
+                'color_shares': {names[i]: float(shares[i]) for i in order if counts[i] > 0},
+                'diversity': diversity,
+                'contrast': float(contrast),
+                'sample_stride': stride
+            },
+            timestamp=self.clock()
         )
         
-        self.visual_memory.append(visual_input)
+        with self.memory_lock:
+            self.visual_memory.append(visual_input)
         return visual_input
     
     def get_visual_memory(self) -> List[SensoryInput]:
@@ -77,7 +559,9 @@ class Hearing:
     """Simulates the sense of hearing"""
     
     def __init__(self):
-        self.auditory_memory = []
+        self.auditory_memory = SharedLog()
+        self.memory_lock = threading.RLock()  # the brain's lock once part of a brain
+        self.clock = time.time  # source of input timestamps
         self.sounds = {
             'loud': ['thunder', 'explosion', 'siren', 'shout'],
             'moderate': ['conversation', 'music', 'traffic', 'footsteps'],
@@ -88,20 +572,30 @@ class Hearing:
             'medium': ['human voice', 'music', 'traffic'],
             'high': ['whistle', 'bird chirp', 'alarm']
         }
+        # Frequency ranges (Hz) used when analyzing raw PCM audio
+        self.frequency_bands = {
+            'low': (0.0, 300.0),
+            'medium': (300.0, 3000.0),
+            'high': (3000.0, float('inf'))
+        }
     
-    def hear(self, sound_description: str) -> SensoryInput:
-        """Process auditory information"""
+    def hear(self, sound_description) -> SensoryInput:
+        """Process auditory information from a description or a PCM sample array"""
+        if _is_ndarray(sound_description):
+            return self.hear_pcm(sound_description)
+        text = sound_description.lower()
+        
         # Determine sound intensity
         intensity = 0.5  # Default moderate
         for level, sounds in self.sounds.items():
-            if any(sound in sound_description.lower() for sound in sounds):
+            if any(sound in text for sound in sounds):
                 intensity = {'loud': 0.9, 'moderate': 0.5, 'quiet': 0.2}[level]
                 break
         
         # Determine frequency quality
         quality = "medium frequency"
         for freq, sounds in self.frequencies.items():
-            if any(sound in sound_description.lower() for sound in sounds):
+            if any(sound in text for sound in sounds):
                 quality = f"{freq} frequency"
                 break
         
@@ -109,21 +603,160 @@ class Hearing:
             sense_type="hearing",
             intensity=intensity,
             quality=quality,
-            location="auditory field"
+            location="auditory field",
+            timestamp=self.clock()
         )
         
-        self.auditory_memory.append(auditory_input)
+        with self.memory_lock:
+            self.auditory_memory.append(auditory_input)
         return auditory_input
     
+    def hear_pcm(self, samples: np.ndarray, sample_rate: int = 16000,
+                 window_size: int = 2048) -> SensoryInput:
+        """Process a complete PCM buffer into a single auditory input"""
+        stream = AudioStream(self, sample_rate, window_size, window_size)
+        samples = _pcm_to_float(samples)
+        if len(samples) < window_size:
+            samples = np.pad(samples, (0, window_size - len(samples)))
+        rms, band_energy = stream.analyze(samples)
+        
+        auditory_input = self._pcm_input(float(np.sqrt(np.mean(rms * rms))),
+                                         band_energy.sum(axis=0), stream.band_names)
+        with self.memory_lock:
+            self.auditory_memory.append(auditory_input)
+        return auditory_input
+    
+    def stream(self, sample_rate: int = 16000, window_size: int = 2048,
+               hop_size: int = 1024) -> 'AudioStream':
+        """Start incremental analysis of a continuous PCM stream"""
+        return AudioStream(self, sample_rate, window_size, hop_size)
+    
+    def listen(self, chunks: Iterable[np.ndarray], sample_rate: int = 16000,
+               window_size: int = 2048, hop_size: int = 1024) -> Iterator[SensoryInput]:
+        """Yield one auditory input per analysis window of a chunked PCM stream"""
+        stream = self.stream(sample_rate, window_size, hop_size)
+        for chunk in chunks:
+            yield from stream.feed(chunk)
+    
+    def _pcm_input(self, rms: float, band_energy: np.ndarray, band_names: List[str],
+                   start_sample: Optional[int] = None) -> SensoryInput:
+        """Build an auditory input from RMS loudness and per-band energy"""
+        # Map loudness from -60..0 dBFS onto the 0..1 intensity scale
+        rms_dbfs = 20.0 * np.log10(max(rms, 1e-10))
+        intensity = float(min(1.0, max(0.0, (rms_dbfs + 60.0) / 60.0)))
+        
+        # Determine frequency quality from the band holding the most energy
+        quality = "medium frequency"
+        if band_energy.sum() > 1e-12:
+            quality = f"{band_names[int(np.argmax(band_energy))]} frequency"
+        
+        details = {
+            'rms_dbfs': float(rms_dbfs),
+            'band_energy': {name: float(energy) for name, energy in zip(band_names, band_energy)}
+        }
+        if start_sample is not None:
+            details['start_sample'] = start_sample
+        return SensoryInput(
+            sense_type="hearing",
+            intensity=intensity,
+            quality=quality,
+            location="auditory field",
+            details=details,
+            timestamp=self.clock()
+        )
+    
     def get_auditory_memory(self) -> List[SensoryInput]:
         """Retrieve recent auditory memories"""
         return self.auditory_memory[-10:]  # Last 10 auditory inputs
 
+def _pcm_to_float(samples: np.ndarray) -> np.ndarray:
+    """Convert integer or float PCM (mono or interleaved channels) to mono float32"""
+    samples = np.asarray(samples)
+    if samples.ndim not in (1, 2):
+        raise ValueError(f"Expected mono or (samples, channels) PCM, got shape {samples.shape}")
+    # Scale by the integer dtype before downmixing; the mean would turn it into floats
+    if samples.dtype.kind == 'i':
+        samples = samples.astype(np.float32) / float(2 ** (8 * samples.dtype.itemsize - 1))
+    elif samples.dtype.kind == 'u':
+        scale = float(2 ** (8 * samples.dtype.itemsize - 1))
+        samples = (samples.astype(np.float32) - scale) / scale
+    else:
+        samples = samples.astype(np.float32, copy=False)
+    if samples.ndim == 2:
+        samples = samples.mean(axis=1, dtype=np.float32)
+    return samples
+
+class AudioStream:
+    """Incremental window analysis of a continuous PCM stream
+    
+    Samples that the next window still overlaps are carried over between
+    chunks, so a stream can be fed in arbitrary chunk sizes and produces the
+    same windows as analyzing it in one piece.  Windows are analyzed in
+    vectorized batches (Hann taper, real FFT, per-band energy).
+    """
+    
+    BATCH_WINDOWS = 256  # windows analyzed per vectorized batch
+    
+    def __init__(self, hearing: Hearing, sample_rate: int = 16000,
+                 window_size: int = 2048, hop_size: int = 1024):
+        if window_size < 2 or not 0 < hop_size <= window_size:
+            raise ValueError("Need window_size >= 2 and 0 < hop_size <= window_size")
+        self.hearing = hearing
+        self.sample_rate = sample_rate
+        self.window_size = window_size
+        self.hop_size = hop_size
+        self.samples_consumed = 0
+        self._pending = np.zeros(0, dtype=np.float32)
+        self._taper = np.hanning(window_size).astype(np.float32)
+        
+        # Bin-to-band membership matrix so band energy is a single matmul
+        bin_freqs = np.fft.rfftfreq(window_size, 1.0 / sample_rate)
+        self.band_names = list(hearing.frequency_bands.keys())
+        self._band_matrix = np.array(
+            [(bin_freqs >= low) & (bin_freqs < high)
+             for low, high in hearing.frequency_bands.values()], dtype=np.float32).T
+    
+    def analyze(self, samples: np.ndarray):
+        """RMS and per-band spectral energy for every full window of samples"""
+        count = 1 + (len(samples) - self.window_size) // self.hop_size
+        frames = np.lib.stride_tricks.sliding_window_view(samples, self.window_size)[::self.hop_size][:count]
+        rms = np.empty(count, dtype=np.float32)
+        band_energy = np.empty((count, len(self.band_names)), dtype=np.float32)
+        for start in range(0, count, self.BATCH_WINDOWS):
+            batch = frames[start:start + self.BATCH_WINDOWS]
+            rms[start:start + len(batch)] = np.sqrt(np.einsum('ij,ij->i', batch, batch) / self.window_size)
+            power = np.abs(np.fft.rfft(batch * self._taper, axis=1)) ** 2
+            band_energy[start:start + len(batch)] = power @ self._band_matrix
+        return rms, band_energy
+    
+    def feed(self, chunk: np.ndarray) -> List[SensoryInput]:
+        """Analyze the windows completed by a new chunk of samples"""
+        samples = _pcm_to_float(chunk)
+        buffer = np.concatenate((self._pending, samples)) if len(self._pending) else samples
+        if len(buffer) < self.window_size:
+            self._pending = buffer.copy()
+            return []
+        
+        rms, band_energy = self.analyze(buffer)
+        inputs = [
+            self.hearing._pcm_input(float(rms[i]), band_energy[i], self.band_names,
+                                    start_sample=self.samples_consumed + i * self.hop_size)
+            for i in range(len(rms))
+        ]
+        consumed = len(rms) * self.hop_size
+        self._pending = buffer[consumed:].copy()
+        self.samples_consumed += consumed
+        with self.hearing.memory_lock:
+            self.hearing.auditory_memory.extend(inputs)
+        return inputs
+
 class Touch:
     """Simulates the sense of touch"""
     
     def __init__(self):
-        self.tactile_memory = []
+        self.tactile_memory = SharedLog()
+        self.memory_lock = threading.RLock()  # the brain's lock once part of a brain
+        self.clock = time.time  # source of input timestamps
         self.textures = {
             'smooth': ['glass', 'metal', 'plastic'],
             'rough': ['sandpaper', 'bark', 'stone'],
@@ -136,28 +769,46 @@ class Touch:
             'cool': ['breeze', 'shade'],
             'cold': ['ice', 'snow', 'cold metal']
         }
+        # Numeric sensor feeds: rolling windows over the latest readings,
+        # lower bounds (deg C) for each temperature label, and the pressure
+        # (kPa) that maps to full intensity
+        self.window_size = 1000
+        self.pressure_window = RollingWindow(self.window_size)
+        self.temperature_window = RollingWindow(self.window_size)
+        self.temperature_ranges = {
+            'hot': 45.0,
+            'warm': 32.0,
+            'neutral': 20.0,
+            'cool': 10.0,
+            'cold': float('-inf')
+        }
+        self.pressure_scale = 100.0
     
-    def feel(self, touch_description: str) -> SensoryInput:
-        """Process tactile information"""
+    def feel(self, touch_description) -> SensoryInput:
+        """Process tactile information from a description or pressure readings"""
+        if _is_ndarray(touch_description):
+            return self.feel_readings(pressure=touch_description)
+        text = touch_description.lower()
+        
         # Determine texture
         texture = "neutral"
         for text_type, items in self.textures.items():
-            if any(item in touch_description.lower() for item in items):
+            if any(item in text for item in items):
                 texture = text_type
                 break
         
         # Determine temperature
         temperature = "neutral"
         for temp_type, items in self.temperatures.items():
-            if any(item in touch_description.lower() for item in items):
+            if any(item in text for item in items):
                 temperature = temp_type
                 break
         
         # Calculate intensity based on pressure and temperature
         intensity = 0.5
-        if 'pressure' in touch_description.lower():
+        if 'pressure' in text:
             intensity = 0.8
-        elif 'gentle' in touch_description.lower():
+        elif 'gentle' in text:
             intensity = 0.3
         
         quality = f"{texture} {temperature}"
@@ -166,21 +817,196 @@ class Touch:
             sense_type="touch",
             intensity=intensity,
             quality=quality,
-            location="tactile receptors"
+            location="tactile receptors",
+            timestamp=self.clock()
         )
         
-        self.tactile_memory.append(tactile_input)
+        with self.memory_lock:
+            self.tactile_memory.append(tactile_input)
         return tactile_input
     
+    def feel_readings(self, pressure: Optional[np.ndarray] = None,
+                      temperature: Optional[np.ndarray] = None) -> SensoryInput:
+        """Process a chunk of numeric pressure (kPa) and temperature (deg C) readings
+        
+        Readings extend the rolling windows kept across calls, and the input
+        describes the window ending at the latest sample.
+        """
+        if pressure is not None and len(pressure):
+            self.pressure_window.update(pressure)
+        if temperature is not None and len(temperature):
+            self.temperature_window.update(temperature)
+        
+        # Determine texture from pressure level and fluctuation
+        texture = "neutral"
+        intensity = 0.5
+        details = {}
+        if self.pressure_window.count:
+            mean, peak, variance = self.pressure_window.stats()
+            details.update(pressure_mean=mean, pressure_max=peak, pressure_variance=variance)
+            intensity = min(1.0, max(0.0, mean / self.pressure_scale))
+            if mean > 0 and np.sqrt(variance) / mean > 0.25:
+                texture = "rough"
+            elif mean < 0.2 * self.pressure_scale:
+                texture = "soft"
+            elif mean > 0.6 * self.pressure_scale:
+                texture = "hard"
+            else:
+                texture = "smooth"
+        
+        # Determine temperature from the first range the mean reaches
+        temperature_label = "neutral"
+        if self.temperature_window.count:
+            mean, peak, variance = self.temperature_window.stats()
+            details.update(temperature_mean=mean, temperature_max=peak, temperature_variance=variance)
+            temperature_label = next(label for label, lower in self.temperature_ranges.items()
+                                     if mean >= lower)
+        
+        tactile_input = SensoryInput(
+            sense_type="touch",
+            intensity=intensity,
+            quality=f"{texture} {temperature_label}",
+            location="tactile receptors",
+            details=details,
+            timestamp=self.clock()
+        )
+        
+        with self.memory_lock:
+            self.tactile_memory.append(tactile_input)
+        return tactile_input
+    
+    def feel_stream(self, chunks: Iterable) -> Iterator[SensoryInput]:
+        """Yield one tactile input per chunk of a numeric sensor feed
+        
+        Each chunk is either a pressure array or a (pressure, temperature)
+        pair, where either side may be None.
+        """
+        for chunk in chunks:
+            if isinstance(chunk, tuple):
+                yield self.feel_readings(*chunk)
+            else:
+                yield self.feel_readings(pressure=chunk)
+    
     def get_tactile_memory(self) -> List[SensoryInput]:
         """Retrieve recent tactile memories"""
         return self.tactile_memory[-10:]  # Last 10 tactile inputs
 
+class RollingWindow:
+    """Rolling mean, max and variance over the last `size` samples of a stream
+    
+    Chunks are processed in one vectorized pass.  Running sums of the
+    samples and their squares are carried between chunks and the samples
+    leaving the window are subtracted, so sums cost O(1) per sample; they
+    are recomputed from the window once every `size` samples to stop
+    rounding drift.  The maximum uses van Herk/Gil-Werman blocks of `size`
+    samples: a window's max combines the running prefix max of its last
+    block with the suffix max of the block before, and suffix maxima are
+    computed once per completed block, so the max is O(1) amortized too.
+    Only the last `size` samples are kept.  Early in a stream the windows
+    simply cover every sample seen so far.
+    """
+    
+    def __init__(self, size: int):
+        if size < 1:
+            raise ValueError("Window size must be at least 1")
+        self.size = size
+        self.count = 0
+        self._offset = None  # subtracted before summing to keep precision
+        self._ring = None    # sample p lives in slot p % size
+        self._owned = True   # False while the ring is shared with a copy
+        self._sum = 0.0
+        self._sum_sq = 0.0
+        self._since_resync = 0
+        self._block_max = float('-inf')
+        self._previous_suffix = None  # suffix maxima of the last completed block
+        self._last = (0.0, 0.0, 0.0)
+    
+    def copy(self) -> 'RollingWindow':
+        """O(1) copy; whichever side updates first copies the shared ring"""
+        duplicate = copy.copy(self)
+        self._owned = duplicate._owned = False
+        return duplicate
+    
+    def update(self, chunk) -> tuple:
+        """Add samples; return per-sample (mean, max, variance) arrays for the chunk"""
+        chunk = np.asarray(chunk, dtype=np.float64).ravel()
+        if chunk.size == 0:
+            empty = np.zeros(0)
+            return empty, empty, empty
+        size, start, n = self.size, self.count, len(chunk)
+        if self._ring is None:
+            self._offset = float(chunk[0])
+            self._ring = np.full(size, self._offset)  # shifts to zero before the stream starts
+            self._previous_suffix = np.full(size, -np.inf)
+        elif not self._owned:
+            self._ring = self._ring.copy()
+        self._owned = True
+        
+        # The sample leaving the window as sample p arrives is p - size: in
+        # the ring for the first `size` samples of the chunk, then in the chunk
+        shifted = chunk - self._offset
+        outgoing = np.empty(n)
+        from_ring = min(n, size)
+        outgoing[:from_ring] = self._ring[(start + np.arange(from_ring)) % size] - self._offset
+        outgoing[from_ring:] = shifted[:n - from_ring]
+        sums = self._sum + np.cumsum(shifted - outgoing)
+        sums_sq = self._sum_sq + np.cumsum(shifted * shifted - outgoing * outgoing)
+        counts = np.minimum(size, start + np.arange(1, n + 1))
+        shifted_mean = sums / counts
+        variance = np.maximum(0.0, sums_sq / counts - shifted_mean ** 2)
+        mean = shifted_mean + self._offset
+        
+        maximum = self._block_maxima(chunk, start)
+        
+        self._ring[(start + np.arange(max(0, n - size), n)) % size] = chunk[-size:]
+        self.count += n
+        self._sum, self._sum_sq = float(sums[-1]), float(sums_sq[-1])
+        self._since_resync += n
+        if self._since_resync >= size:
+            window = self._ring - self._offset
+            self._sum, self._sum_sq = float(window.sum()), float((window * window).sum())
+            self._since_resync = 0
+        self._last = (float(mean[-1]), float(maximum[-1]), float(variance[-1]))
+        return mean, maximum, variance
+    
+    def _block_maxima(self, chunk: np.ndarray, start: int) -> np.ndarray:
+        """Window maxima for a chunk (called before the chunk enters the ring)"""
+        size, n = self.size, len(chunk)
+        maximum = np.empty(n)
+        done = 0
+        while done < n:
+            position = (start + done) % size  # offset within the current block
+            take = min(n - done, size - position)
+            prefix = np.maximum.accumulate(chunk[done:done + take])
+            np.maximum(prefix, self._block_max, out=prefix)
+            # A window ending at block offset r starts at offset r + 1 of the previous block
+            suffix = np.full(take, -np.inf)
+            inside = min(take, size - 1 - position)
+            suffix[:inside] = self._previous_suffix[position + 1:position + 1 + inside]
+            maximum[done:done + take] = np.maximum(prefix, suffix)
+            self._block_max = prefix[-1]
+            done += take
+            if position + take == size:
+                # Block complete: its samples are the last `size` seen, partly from the ring
+                first = start + done - size
+                earlier = max(0, start - first)
+                block = np.concatenate((self._ring[(first + np.arange(earlier)) % size],
+                                        chunk[first + earlier - start:done]))
+                self._previous_suffix = np.maximum.accumulate(block[::-1])[::-1]
+                self._block_max = float('-inf')
+        return maximum
+    
+    def stats(self) -> tuple:
+        """(mean, max, variance) of the current window"""
+        return self._last
+
 class Smell:
     """Simulates the sense of smell"""
     
     def __init__(self):
-        self.olfactory_memory = []
+        self.olfactory_memory = SharedLog()
+        self.memory_lock = threading.RLock()  # the brain's lock once part of a brain
+        self.clock = time.time  # source of input timestamps
         self.scents = {
             'pleasant': ['flowers', 'baking', 'fresh air', 'coffee'],
             'unpleasant': ['rotten', 'smoke', 'chemicals', 'garbage'],
@@ -193,9 +1019,10 @@ class Smell:
         # Determine scent category and intensity
         intensity = 0.5
         quality = "neutral"
+        text = scent_description.lower()
         
         for scent_type, items in self.scents.items():
-            if any(item in scent_description.lower() for item in items):
+            if any(item in text for item in items):
                 quality = scent_type
                 if scent_type == 'strong':
                     intensity = 0.9
@@ -209,10 +1036,12 @@ class Smell:
             sense_type="smell",
             intensity=intensity,
             quality=quality,
-            location="olfactory receptors"
+            location="olfactory receptors",
+            timestamp=self.clock()
         )
         
-        self.olfactory_memory.append(olfactory_input)
+        with self.memory_lock:
+            self.olfactory_memory.append(olfactory_input)
         return olfactory_input
     
     def get_olfactory_memory(self) -> List[SensoryInput]:
@@ -223,7 +1052,9 @@ class Taste:
     """Simulates the sense of taste"""
     
     def __init__(self):
-        self.gustatory_memory = []
+        self.gustatory_memory = SharedLog()
+        self.memory_lock = threading.RLock()  # the brain's lock once part of a brain
+        self.clock = time.time  # source of input timestamps
         self.tastes = {
             'sweet': ['sugar', 'honey', 'fruit', 'chocolate'],
             'sour': ['lemon', 'vinegar', 'citrus', 'yogurt'],
@@ -237,14 +1068,15 @@ class Taste:
         # Determine taste type and intensity
         intensity = 0.5
         quality = "neutral"
+        text = taste_description.lower()
         
         for taste_type, items in self.tastes.items():
-            if any(item in taste_description.lower() for item in items):
+            if any(item in text for item in items):
                 quality = taste_type
                 # Adjust intensity based on taste strength
-                if 'strong' in taste_description.lower():
+                if 'strong' in text:
                     intensity = 0.9
-                elif 'mild' in taste_description.lower():
+                elif 'mild' in text:
                     intensity = 0.3
                 else:
                     intensity = 0.6
@@ -254,16 +1086,41 @@ class Taste:
             sense_type="taste",
             intensity=intensity,
             quality=quality,
-            location="taste buds"
+            location="taste buds",
+            timestamp=self.clock()
         )
         
-        self.gustatory_memory.append(gustatory_input)
+        with self.memory_lock:
+            self.gustatory_memory.append(gustatory_input)
         return gustatory_input
     
     def get_gustatory_memory(self) -> List[SensoryInput]:
         """Retrieve recent gustatory memories"""
         return self.gustatory_memory[-10:]  # Last 10 gustatory inputs
 
+@dataclass
+class ReleasedLog:
+    """A log whose oldest `cut` items have been consolidated, awaiting its swap"""
+    name: str
+    owner: Any
+    attribute: str
+    log: SharedLog
+    cut: int
+    retained: SharedLog = field(init=False)
+    
+    def __post_init__(self):
+        # Copied before the swap so only items appended meanwhile are copied under the lock
+        self.retained = SharedLog(self.log[self.cut:])
+
+def publish_retained(released: List[ReleasedLog]) -> Dict[str, int]:
+    """Swap each released log for its retained tail; call while holding memory_lock"""
+    consolidated = {}
+    for item in released:
+        item.retained.extend(item.log[item.cut + len(item.retained):])  # appended meanwhile
+        setattr(item.owner, item.attribute, item.retained)
+        consolidated[item.name] = item.cut
+    return consolidated
+
 class SensoryBrain:
     """Central processing unit that integrates all sensory inputs"""
     
@@ -274,34 +1131,207 @@ class SensoryBrain:
         self.smell = Smell()
         self.taste = Taste()
         
-        self.sensory_integration = []
+        self.sensory_integration = SharedLog()
         self.consciousness_level = 1.0
         self.attention_focus = "general"
+        self.feed = ChangeFeed()
+        self.clock = time.time
+        self.last_quality = "neutral"
+        self.profiler = Profiler()
         
+        # Latency-budget support: smoothed per-stage costs (seconds) and the
+        # last result per (sense, description) for reuse under pressure
+        self.stage_costs = {stage: 0.0 for stage in SENSE_PRIORITY}
+        self.stage_costs.update((mode[0], 0.0) for mode in INTEGRATION_MODES)
+        self.sense_cache = {}
+        self.sense_cache_size = 1024
+        self.cache_hits = 0
+        self.cache_misses = 0
+        
+        # Online per-sense intensity distributions (mergeable across agents)
+        self.intensity_stats = {sense: IntensityDistribution() for sense in SENSE_PRIORITY}
+        
+        # Bounded-memory keyword hit counts, off unless track_keyword_hits() is called
+        self.keyword_hits: Optional[KeywordSketch] = None
+        self._keyword_keys: Optional[Dict[str, List[Tuple[str, str]]]] = None  # per sense (key, keyword)
+        
+        # Held while consolidation swaps logs and totals, by their readers
+        # and around every append to a memory, which the senses share
+        self.memory_lock = threading.RLock()
+        self._share_memory_lock()
+        
+    def _share_memory_lock(self):
+        for sense in SENSE_MEMORIES:
+            getattr(self, sense).memory_lock = self.memory_lock
+    
+    def set_clock(self, clock):
+        """Take timestamps for inputs and experiences from a clock callable"""
+        self.clock = clock
+        for sense in (self.vision, self.hearing, self.touch, self.smell, self.taste):
+            sense.clock = clock
+    
+    def fork(self) -> 'SensoryBrain':
+        """Copy-on-write copy sharing all memories recorded so far"""
+        child = copy.copy(self)
+        for attr, memory in SENSE_MEMORIES.items():
+            sense = copy.copy(getattr(self, attr))
+            setattr(sense, memory, getattr(sense, memory).fork())
+            setattr(child, attr, sense)
+        child.touch.pressure_window = self.touch.pressure_window.copy()
+        child.touch.temperature_window = self.touch.temperature_window.copy()
+        child.sensory_integration = self.sensory_integration.fork()
+        child.profiler = Profiler(self.profiler.enabled)
+        child.stage_costs = dict(self.stage_costs)
+        child.sense_cache = dict(self.sense_cache)  # at most sense_cache_size entries
+        child.intensity_stats = {sense: stats.copy() for sense, stats in self.intensity_stats.items()}
+        if self.keyword_hits is not None:
+            child.keyword_hits = self.keyword_hits.copy()
+        child.feed = ChangeFeed()
+        child.memory_lock = threading.RLock()
+        child._share_memory_lock()
+        return child
+    
+    def lexicon(self, sense_type: str) -> Dict[str, List[str]]:
+        """Keywords the text analyzer for a sense matches, keyed by table (e.g. 'Smell.scents')"""
+        if sense_type == "vision":
+            return {'Vision.color_perception': list(self.vision.color_perception),
+                    'Vision.shapes': self.vision.shapes,
+                    'Vision.objects': self.vision.objects}
+        if sense_type == "hearing":
+            tables = {'Hearing.sounds': self.hearing.sounds,
+                      'Hearing.frequencies': self.hearing.frequencies}
+        elif sense_type == "touch":
+            tables = {'Touch.textures': self.touch.textures,
+                      'Touch.temperatures': self.touch.temperatures}
+        elif sense_type == "smell":
+            tables = {'Smell.scents': self.smell.scents}
+        elif sense_type == "taste":
+            tables = {'Taste.tastes': self.taste.tastes}
+        else:
+            raise ValueError(f"Unknown sense type: {sense_type}")
+        return {name: [item for items in table.values() for item in items]
+                for name, table in tables.items()}
+    
+    def track_keyword_hits(self, width: int = 2048, depth: int = 4, top_k: int = 50,
+                           seed: int = 0) -> KeywordSketch:
+        """Start counting which lexicon keywords fire, in a fresh sketch"""
+        self.keyword_hits = KeywordSketch(width, depth, top_k, seed)
+        self._keyword_keys = None  # picks up any lexicon changes since tracking last started
+        return self.keyword_hits
+    
+    def _count_keyword_hits(self, sense_type: str, description: str):
+        """Add one hit per lexicon entry found in a description
+        
+        Unlike the analyzers, which stop at the first matching category, every
+        entry present is counted, so rarely decisive keywords still show up.
+        """
+        if self._keyword_keys is None:
+            self._keyword_keys = {sense: [(f"{table}:{keyword}", keyword)
+                                          for table, keywords in self.lexicon(sense).items()
+                                          for keyword in keywords]
+                                  for sense in SENSE_PRIORITY}
+        text = description.lower()
+        for key, keyword in self._keyword_keys[sense_type]:
+            if keyword in text:
+                self.keyword_hits.add(key)
+    
     def process_sensory_input(self, sense_type: str, description: str) -> SensoryInput:
         """Process input from a specific sense"""
+        started = time.perf_counter() if self.profiler.timing else None
         if sense_type.lower() == "vision":
-            return self.vision.see(description)
+            sensory_input = self.vision.see(description)
         elif sense_type.lower() == "hearing":
-            return self.hearing.hear(description)
+            sensory_input = self.hearing.hear(description)
         elif sense_type.lower() == "touch":
-            return self.touch.feel(description)
+            sensory_input = self.touch.feel(description)
         elif sense_type.lower() == "smell":
-            return self.smell.smell(description)
+            sensory_input = self.smell.smell(description)
         elif sense_type.lower() == "taste":
-            return self.taste.taste(description)
+            sensory_input = self.taste.taste(description)
         else:
             raise ValueError(f"Unknown sense type: {sense_type}")
+        if started is not None:
+            self.profiler.record(sensory_input.sense_type, started, time.perf_counter(),
+                                 "process_sensory_input",
+                                 {'description': describe_for_trace(description)} if self.profiler.tracing else None)
+        self.intensity_stats[sensory_input.sense_type].record(sensory_input.intensity)
+        if self.keyword_hits is not None and isinstance(description, str):
+            self._count_keyword_hits(sensory_input.sense_type, description)
+        
+        if self.feed.active:
+            self.feed.publish(SENSORY_INPUT, sensory_input)
+        return sensory_input
     
-    def integrate_senses(self) -> Dict[str, Any]:
-        """Integrate all sensory inputs into a coherent experience"""
-        all_inputs = {
-            'vision': self.vision.get_visual_memory(),
-            'hearing': self.hearing.get_auditory_memory(),
-            'touch': self.touch.get_tactile_memory(),
-            'smell': self.smell.get_olfactory_memory(),
-            'taste': self.taste.get_gustatory_memory()
-        }
+    def consolidate(self, consolidation: MemoryConsolidation, keep: int) -> Dict[str, int]:
+        """Fold all but the `keep` newest items of each memory into summaries
+        
+        Each memory is replaced by a new log of its recent items, so the
+        released ones are freed unless a fork still shares them.  Returns the
+        number of items consolidated per memory.
+        """
+        staged = MemoryConsolidation(consolidation.window, consolidation.max_windows)
+        released = self.release_memories(keep, staged)
+        with self.memory_lock:
+            consolidation.merge(staged)
+            return publish_retained(released)
+    
+    def release_memories(self, keep: int, staged: MemoryConsolidation) -> List[ReleasedLog]:
+        """Fold all but the `keep` newest items of each memory into `staged`
+        
+        Nothing is swapped yet: the caller publishes the returned logs with
+        publish_retained() and merges `staged` while holding memory_lock,
+        so lifetime totals never count an item twice or not at all.
+        """
+        released = []
+        for sense, attr in SENSE_MEMORIES.items():
+            owner = getattr(self, sense)
+            memory = getattr(owner, attr)
+            cut = len(memory) - keep
+            if cut > 0:
+                staged.absorb_inputs(sense, memory[:cut])
+                released.append(ReleasedLog(sense, owner, attr, memory, cut))
+        memory = self.sensory_integration
+        cut = len(memory) - keep
+        if cut > 0:
+            staged.absorb_integrated(memory[:cut])
+            released.append(ReleasedLog('sensory_integration', self, 'sensory_integration', memory, cut))
+        return released
+    
+    def _memories(self) -> Dict[str, SharedLog]:
+        """Each sense's full memory, keyed by sense name"""
+        return dict(zip(SENSE_MEMORIES, _sense_memory_logs(self)))
+    
+    def record_input(self, sensory_input: SensoryInput) -> SensoryInput:
+        """Store an input that was analyzed outside this brain (e.g. by a stream producer)"""
+        if sensory_input.sense_type not in SENSE_MEMORIES:
+            raise ValueError(f"Unknown sense type: {sensory_input.sense_type}")
+        with self.memory_lock:  # streams may keep recording while consolidation swaps logs
+            self._memories()[sensory_input.sense_type].append(sensory_input)
+        self.intensity_stats[sensory_input.sense_type].record(sensory_input.intensity)
+        
+        if self.feed.active:
+            self.feed.publish(SENSORY_INPUT, sensory_input)
+        return sensory_input
+    
+    def integrate_senses(self, timestamp: Optional[float] = None, include_inputs: bool = True,
+                         assess_quality: bool = True) -> Dict[str, Any]:
+        """Integrate all sensory inputs into a coherent experience
+        
+        To shed work under a latency budget, include_inputs=False leaves out
+        the copies of recent memories and assess_quality=False reuses the
+        last known experience quality.
+        """
+        started = time.perf_counter() if self.profiler.timing else None
+        if include_inputs or assess_quality:
+            all_inputs = {
+                'vision': self.vision.get_visual_memory(),
+                'hearing': self.hearing.get_auditory_memory(),
+                'touch': self.touch.get_tactile_memory(),
+                'smell': self.smell.get_olfactory_memory(),
+                'taste': self.taste.get_gustatory_memory()
+            }
+        else:
+            all_inputs = {sense: memory[-1:] for sense, memory in self._memories().items()}
         
         # Calculate overall sensory intensity
         total_intensity = 0
@@ -325,16 +1355,27 @@ class SensoryBrain:
         
         # Create integrated experience
         integrated_experience = {
-            'timestamp': time.time(),
+            'timestamp': self.clock() if timestamp is None else timestamp,
             'consciousness_level': self.consciousness_level,
             'attention_focus': self.attention_focus,
             'overall_intensity': avg_intensity,
-            'dominant_sense': dominant_sense,
-            'sensory_inputs': all_inputs,
-            'experience_quality': self._determine_experience_quality(all_inputs)
+            'dominant_sense': dominant_sense
         }
+        if include_inputs:
+            integrated_experience['sensory_inputs'] = all_inputs
+        if assess_quality:
+            quality_started = time.perf_counter() if started is not None else None
+            self.last_quality = self._determine_experience_quality(all_inputs)
+            if started is not None:
+                self.profiler.record(STAGE_QUALITY, quality_started, time.perf_counter())
+        integrated_experience['experience_quality'] = self.last_quality
         
-        self.sensory_integration.append(integrated_experience)
+        with self.memory_lock:
+            self.sensory_integration.append(integrated_experience)
+        if started is not None:
+            self.profiler.record(STAGE_INTEGRATE, started, time.perf_counter())
+        if self.feed.active:
+            self.feed.publish(INTEGRATED_EXPERIENCE, integrated_experience)
         return integrated_experience
     
     def _determine_experience_quality(self, all_inputs: Dict[str, List[SensoryInput]]) -> str:
@@ -364,8 +1405,16 @@ class SensoryBrain:
         else:
             return "neutral"
     
-    def experience_environment(self, environment_description: Dict[str, str]) -> Dict[str, Any]:
-        """Experience a complete environment with all senses"""
+    def experience_environment(self, environment_description: Dict[str, str],
+                               budget: Optional[float] = None) -> Dict[str, Any]:
+        """Experience a complete environment with all senses
+        
+        With a latency budget (seconds) the work is shed in stages when it
+        is at risk; see _experience_within_budget.
+        """
+        if budget is not None:
+            return self._experience_within_budget(environment_description, budget)
+        
         sensory_inputs = {}
         
         # Process each sense
@@ -384,6 +1433,105 @@ class SensoryBrain:
             'integrated_experience': integrated_experience
         }
     
+    def _experience_within_budget(self, environment_description: Dict[str, str],
+                                  budget: float) -> Dict[str, Any]:
+        """Experience an environment, degrading in stages to meet a latency budget
+        
+        Stage costs are tracked as moving averages.  Whenever the remaining
+        budget cannot cover the predicted work, the brain in turn leaves the
+        memory copies out of the integrated experience, reuses the last known
+        experience quality, reuses cached or last-known results for senses,
+        and finally skips senses other than the highest-priority one.  The
+        result lists the shortcuts taken under 'degraded'.
+        """
+        deadline = time.perf_counter() + budget
+        costs = self.stage_costs
+        degraded = []
+        
+        # Visit senses in priority order so the least important are shed first
+        ordered = sorted(environment_description.items(), key=lambda item: self._sense_rank(item[0]))
+        cheapest_integration = costs[INTEGRATION_MODES[-1][0]]
+        
+        sensory_inputs = {}
+        for position, (sense, description) in enumerate(ordered):
+            pending = cheapest_integration + sum(costs.get(s.lower(), 0.0) for s, _ in ordered[position:])
+            if deadline - time.perf_counter() < pending:
+                cached = self._reuse_input(sense, description)
+                if cached is not None:
+                    sensory_inputs[sense] = cached
+                    self._flag(degraded, DEGRADED_CACHED_SENSES)
+                    continue
+                if position > 0:
+                    self._flag(degraded, DEGRADED_SKIPPED_SENSES)
+                    continue
+            
+            try:
+                started = time.perf_counter()
+                sensory_inputs[sense] = self.process_sensory_input(sense, description)
+                self._observe_cost(sense.lower(), time.perf_counter() - started)
+            except ValueError as e:
+                print(f"Warning: {e}")
+                continue
+            if isinstance(description, str):
+                self._cache_input(sense.lower(), description, sensory_inputs[sense])
+        
+        # Integrate with the richest variant that still fits
+        remaining = deadline - time.perf_counter()
+        cost_key, include_inputs, assess_quality = next(
+            (mode for mode in INTEGRATION_MODES if costs[mode[0]] <= remaining), INTEGRATION_MODES[-1])
+        if not include_inputs:
+            self._flag(degraded, DEGRADED_INPUT_COPIES)
+        if not assess_quality:
+            self._flag(degraded, DEGRADED_QUALITY)
+        started = time.perf_counter()
+        integrated_experience = self.integrate_senses(include_inputs=include_inputs,
+                                                      assess_quality=assess_quality)
+        self._observe_cost(cost_key, time.perf_counter() - started)
+        
+        return {
+            'individual_senses': sensory_inputs,
+            'integrated_experience': integrated_experience,
+            'degraded': degraded
+        }
+    
+    def _sense_rank(self, sense: str) -> int:
+        """Priority of a sense for budgeted processing (lower runs first)"""
+        sense = sense.lower()
+        if sense == ATTENTION_SENSES.get(self.attention_focus):
+            return -1
+        return SENSE_PRIORITY.index(sense) if sense in SENSE_PRIORITY else len(SENSE_PRIORITY)
+    
+    def _observe_cost(self, stage: str, seconds: float):
+        """Fold a measured stage duration into its moving average"""
+        previous = self.stage_costs.get(stage, 0.0)
+        self.stage_costs[stage] = seconds if previous == 0.0 else 0.8 * previous + 0.2 * seconds
+    
+    def _cache_input(self, sense: str, description: str, sensory_input: SensoryInput):
+        """Remember the result for a description, evicting the oldest entry when full"""
+        if len(self.sense_cache) >= self.sense_cache_size:
+            self.sense_cache.pop(next(iter(self.sense_cache)))
+        self.sense_cache[(sense, description)] = sensory_input
+    
+    def _reuse_input(self, sense: str, description) -> Optional[SensoryInput]:
+        """Re-record the cached or last-known result for a sense, if there is one"""
+        memory = self._memories().get(sense.lower())
+        if memory is None:
+            return None
+        known = self.sense_cache.get((sense.lower(), description)) if isinstance(description, str) else None
+        if known is None:
+            self.cache_misses += 1
+            known = memory[-1] if len(memory) else None
+        else:
+            self.cache_hits += 1
+        if known is None:
+            return None
+        return self.record_input(replace(known, timestamp=self.clock()))
+    
+    @staticmethod
+    def _flag(degraded: List[str], flag: str):
+        if flag not in degraded:
+            degraded.append(flag)
+    
     def get_sensory_summary(self) -> Dict[str, Any]:
         """Get a summary of all sensory experiences"""
         return {
@@ -393,6 +1541,8 @@ class SensoryBrain:
             'total_olfactory_experiences': len(self.smell.olfactory_memory),
             'total_gustatory_experiences': len(self.taste.gustatory_memory),
             'total_integrated_experiences': len(self.sensory_integration),
+            'intensity_distributions': {sense: stats.summary()
+                                        for sense, stats in self.intensity_stats.items()},
             'consciousness_level': self.consciousness_level,
             'attention_focus': self.attention_focus
         }
@@ -400,43 +1550,156 @@ class SensoryBrain:
 class SensoryAI:
     """Main AI class that experiences the world through five senses"""
     
-    def __init__(self, name: str = "SensoryAI"):
+    def __init__(self, name: str = "SensoryAI", verbose: bool = True):
         self.name = name
         self.brain = SensoryBrain()
         self.is_awake = True
-        self.experience_log = []
+        self.verbose = verbose  # print progress and experience summaries
+        self.experience_log = SharedLog()
+        self.history = HistoryIndex(self.experience_log)
+        self.timeline = IntensityTimeline()  # caught up from the log when queried
+        self._timeline_start = 0  # timeline point of the log's first entry
+        self.interned = InternTable()  # shared by forks, like the log entries themselves
+        self._similarity = None  # k-NN index over the integration log, built on first recall
+        self.situations = None  # online situation clusterer, off unless enabled
+        
+        # Sleeping folds all but the newest consolidation_keep items of each
+        # log into summaries, on a background thread
+        self.consolidation = MemoryConsolidation()
+        self.consolidation_keep = 1000
+        self._consolidating = None
+        
+        # Snapshot bookkeeping: chain id, next frame sequence and the log
+        # lengths captured by the last frame (None until a full snapshot)
+        self._snapshot_chain = 0
+        self._snapshot_sequence = 0
+        self._snapshot_marks = None
         
     def wake_up(self):
         """Wake up the AI and start experiencing"""
+        self.wait_for_consolidation()
         self.is_awake = True
-        print(f"{self.name} is now awake and experiencing the world!")
+        if self.verbose:
+            print(f"{self.name} is now awake and experiencing the world!")
     
-    def sleep(self):
-        """Put the AI to sleep"""
+    def sleep(self, consolidate: bool = True):
+        """Put the AI to sleep, consolidating old memories in the background
+        
+        Consolidation only starts when some memory holds more than
+        consolidation_keep items; wake_up() waits for it to finish.
+        """
         self.is_awake = False
-        print(f"{self.name} is now sleeping...")
+        if self.verbose:
+            print(f"{self.name} is now sleeping...")
+        if consolidate and self._consolidating is None and any(
+                len(log) > self.consolidation_keep for log in self._snapshot_logs().values()):
+            self._consolidating = threading.Thread(target=self.consolidate_memories,
+                                                   name=f"{self.name} consolidation", daemon=True)
+            self._consolidating.start()
     
-    def experience(self, environment: Dict[str, str]) -> Dict[str, Any]:
-        """Experience an environment through all senses"""
+    def wait_for_consolidation(self):
+        """Block until a background consolidation pass (if any) has finished"""
+        if self._consolidating is not None:
+            self._consolidating.join()
+            self._consolidating = None
+    
+    def consolidate_memories(self, keep: Optional[int] = None) -> Dict[str, int]:
+        """Fold all but the newest memories into summaries and release them
+        
+        The `keep` (default consolidation_keep) most recent items of every
+        sense memory, the integration log and the experience log stay
+        intact; older ones become per-window aggregates and situation
+        records in self.consolidation, which also keeps exact lifetime counts.
+        History positions then refer to the retained log, the timeline keeps
+        only level summaries of the released experiences and the next
+        snapshot is a full one.  Returns the items consolidated per log.
+        
+        Released items are summarized first, off to the side; the retained
+        logs, the new counts and the indexes over the logs are then
+        published together under the brain's memory_lock, which the stats,
+        history, timeline and recall readers take too, so totals stay exact
+        while a background pass runs.
+        """
+        keep = self.consolidation_keep if keep is None else keep
+        staged = MemoryConsolidation(self.consolidation.window, self.consolidation.max_windows)
+        released = self.brain.release_memories(keep, staged)
+        cut = len(self.experience_log) - keep
+        if cut > 0:
+            staged.absorb_entries(self.experience_log[:cut])
+            released.append(ReleasedLog('experience_log', self, 'experience_log', self.experience_log, cut))
+        if not released:
+            return {}
+        with self.brain.memory_lock:
+            self._sync_timeline()  # index the released points before they go
+            consolidated = publish_retained(released)
+            if cut > 0:
+                self._timeline_start += cut
+                self.timeline.compact(self._timeline_start)
+                self.history = HistoryIndex(self.experience_log)
+            self.consolidation.merge(staged)
+            self.consolidation.passes += 1
+            self._similarity = None  # positions moved; rebuilt from what is left
+            self._snapshot_marks = None
+        if cut > 0:
+            self.sweep_interned()
+        return consolidated
+    
+    def total_experiences(self) -> int:
+        """Experiences over the agent's lifetime, including consolidated ones"""
+        with self.brain.memory_lock:
+            return len(self.experience_log) + self.consolidation.counts.get('experience_log', 0)
+    
+    def experience(self, environment: Dict[str, str], budget: Optional[float] = None) -> Dict[str, Any]:
+        """Experience an environment through all senses
+        
+        An optional latency budget (seconds) lets the brain degrade the
+        result instead of overrunning; the shortcuts taken are listed under
+        'degraded' in the result.  With situations enabled the result also
+        carries the 'situation' the experience was clustered into.
+        """
         if not self.is_awake:
-            print(f"{self.name} is sleeping and cannot experience anything.")
+            if self.verbose:
+                print(f"{self.name} is sleeping and cannot experience anything.")
             return {}
         
-        print(f"\n{self.name} is experiencing the environment...")
+        profiler = self.brain.profiler
+        if profiler.tracer is not None:
+            profiler.begin_trace()
+        started = time.perf_counter() if profiler.timing else None
+        if self.verbose:
+            print(f"\n{self.name} is experiencing the environment...")
         
         # Process the experience
-        experience_result = self.brain.experience_environment(environment)
+        experience_result = self.brain.experience_environment(environment, budget)
+        if self.situations is not None:
+            experience_result['situation'] = self.situations.observe(
+                sensory_similarity.encode_experience(experience_result['integrated_experience']))
         
         # Log the experience
-        self.experience_log.append({
-            'timestamp': datetime.now().isoformat(),
-            'environment': environment,
+        logging_started = time.perf_counter() if started is not None else None
+        log_entry = {
+            'timestamp': datetime.fromtimestamp(self.brain.clock()).isoformat(),
+            'environment': self.interned.environment(environment),
             'experience': experience_result
-        })
+        }
+        with self.brain.memory_lock:
+            self.experience_log.append(log_entry)
+        if self.brain.feed.active:
+            self.brain.feed.publish(EXPERIENCE, log_entry)
+        if started is not None:
+            profiler.record(STAGE_LOGGING, logging_started, time.perf_counter())
         
         # Print experience summary
-        self._print_experience_summary(experience_result)
+        if self.verbose:
+            printing_started = time.perf_counter() if started is not None else None
+            self._print_experience_summary(experience_result)
+            if started is not None:
+                profiler.record(STAGE_PRINTING, printing_started, time.perf_counter())
         
+        if started is not None:
+            profiler.record(STAGE_EXPERIENCE, started, time.perf_counter(), "experience",
+                            {'agent': self.name, 'senses': list(environment)} if profiler.tracing else None)
+            profiler.end_trace()
         return experience_result
     
     def _print_experience_summary(self, experience_result: Dict[str, Any]):
@@ -454,23 +1717,335 @@ class SensoryAI:
         for sense, input_data in experience_result['individual_senses'].items():
             print(f"  {sense.capitalize()}: {input_data.quality} (intensity: {input_data.intensity:.2f})")
     
+    def subscribe(self, topics=None, maxsize: int = 1000, policy: str = DROP,
+                  block_timeout: Optional[float] = None) -> Subscription:
+        """Subscribe to new sensory inputs, integrated experiences and log entries"""
+        return self.brain.feed.subscribe(topics, maxsize, policy, block_timeout)
+    
     def get_experience_history(self) -> List[Dict[str, Any]]:
         """Get the complete history of experiences"""
         return self.experience_log
     
+    def query_history(self, page: int = 0, page_size: int = 20, since=None, until=None,
+                      dominant_sense: Optional[str] = None, newest_first: bool = True) -> HistoryPage:
+        """Get one page of experiences, optionally filtered by date range and dominant sense"""
+        with self.brain.memory_lock:
+            return self.history.query(page, page_size, since, until, dominant_sense, newest_first)
+    
+    def intensity_timeline(self, start: Optional[float] = None, end: Optional[float] = None,
+                           max_points: int = 1000, method: str = "minmax") -> TimelineSeries:
+        """Overall intensity between two epoch timestamps, downsampled for charting"""
+        with self.brain.memory_lock:
+            self._sync_timeline()
+            return self.timeline.query(start, end, max_points, method)
+    
+    def intensity_span(self) -> Optional[Tuple[float, float]]:
+        """First and last experience timestamps on the intensity timeline"""
+        with self.brain.memory_lock:
+            self._sync_timeline()
+            return self.timeline.span()
+    
+    def _sync_timeline(self):
+        indexed = len(self.timeline) - self._timeline_start
+        if indexed < len(self.experience_log):
+            self.timeline.extend(
+                (integrated['timestamp'], integrated['overall_intensity'])
+                for integrated in (entry['experience']['integrated_experience']
+                                   for entry in self.experience_log[indexed:]))
+    
+    def similar_experiences(self, integrated: Optional[Dict[str, Any]] = None,
+                            k: int = 5) -> List[sensory_similarity.SimilarExperience]:
+        """Past integrated experiences most similar to the given one (default: the latest)
+        
+        Experiences are compared by feature vector (per-sense intensity and
+        quality, dominant sense); the latest experience is left out of its
+        own results.  The index catches up with new experiences when queried.
+        """
+        with self.brain.memory_lock:
+            index = self._sync_similarity()
+            log = self.brain.sensory_integration
+            exclude = None
+            if integrated is None:
+                if not len(log):
+                    return []
+                integrated, exclude = log[-1], len(log) - 1
+            query = sensory_similarity.encode_experience(integrated)
+            return [sensory_similarity.SimilarExperience(position, distance, log[position])
+                    for position, distance in index.search(query, k, exclude)]
+    
+    def enable_situations(self, k: int = 8, batch_size: int = 32) -> sensory_similarity.SituationClusterer:
+        """Cluster experiences online into k recurring situations
+        
+        From now on every experience() result carries a 'situation' id.
+        Centroids are kept in snapshots and can be saved with to_dict().
+        """
+        self.situations = sensory_similarity.SituationClusterer(k, batch_size)
+        return self.situations
+    
+    def disable_situations(self):
+        """Stop assigning situations and drop the centroids"""
+        self.situations = None
+    
+    def _sync_similarity(self):
+        if self._similarity is None:
+            self._similarity = sensory_similarity.SimilarityIndex()
+        index = self._similarity
+        log = self.brain.sensory_integration
+        if len(index) < len(log):
+            encode = sensory_similarity.encode_experience
+            index.add(np.stack([encode(integrated) for integrated in log[len(index):]]))
+        return index
+    
     def get_sensory_stats(self) -> Dict[str, Any]:
-        """Get statistics about sensory experiences"""
-        return self.brain.get_sensory_summary()
+        """Get statistics about sensory experiences (lifetime totals)"""
+        with self.brain.memory_lock:
+            summary = self.brain.get_sensory_summary()
+            counts = self.consolidation.counts
+            if counts:
+                for key, log in SUMMARY_TOTALS.items():
+                    summary[key] += counts.get(log, 0)
+        return summary
     
     def set_consciousness_level(self, level: float):
         """Set the consciousness level (0.0 to 1.0)"""
         self.brain.consciousness_level = max(0.0, min(1.0, level))
-        print(f"Consciousness level set to: {self.brain.consciousness_level}")
+        if self.verbose:
+            print(f"Consciousness level set to: {self.brain.consciousness_level}")
     
     def set_attention_focus(self, focus: str):
         """Set the attention focus"""
         self.brain.attention_focus = focus
-        print(f"Attention focus set to: {focus}")
+        if self.verbose:
+            print(f"Attention focus set to: {focus}")
+    
+    def set_clock(self, clock):
+        """Use a clock callable (e.g. a simulation clock) for all timestamps"""
+        self.brain.set_clock(clock)
+    
+    def enable_profiling(self, enabled: bool = True):
+        """Switch per-stage latency collection on or off at runtime"""
+        self.brain.profiler.enabled = enabled
+    
+    def enable_keyword_tracking(self, width: int = 2048, depth: int = 4, top_k: int = 50,
+                                seed: int = 0) -> KeywordSketch:
+        """Count lexicon keyword hits in a count-min sketch with top-k heavy hitters
+        
+        Memory stays at width x depth counters however much traffic is seen.
+        Workers that share width, depth and seed produce mergeable sketches.
+        """
+        return self.brain.track_keyword_hits(width, depth, top_k, seed)
+    
+    def disable_keyword_tracking(self):
+        """Stop counting keyword hits and drop the sketch"""
+        self.brain.keyword_hits = None
+    
+    def get_keyword_hits(self, n: Optional[int] = None) -> List[Tuple[str, int]]:
+        """Most frequent 'Table:keyword' hits with estimated counts, highest first"""
+        if self.brain.keyword_hits is None:
+            return []
+        return self.brain.keyword_hits.heavy_hitters(n)
+    
+    def sweep_interned(self) -> int:
+        """Drop interned environments no longer in the history; returns the count dropped"""
+        return self.interned.sweep(entry['environment'] for entry in self.experience_log)
+    
+    def get_memory_sizes(self) -> Dict[str, int]:
+        """Number of items held in each memory and the experience log"""
+        return dict(zip(SNAPSHOT_LOGS, map(len, _agent_logs(self))))
+    
+    def enable_tracing(self, path: str, sample_every: int = 100) -> ChromeTracer:
+        """Write one in `sample_every` experiences to a Chrome trace file"""
+        self.disable_tracing()
+        self.brain.profiler.tracer = ChromeTracer(path, sample_every)
+        return self.brain.profiler.tracer
+    
+    def disable_tracing(self):
+        """Stop tracing and close the trace file"""
+        profiler = self.brain.profiler
+        if profiler.tracer is not None:
+            profiler.tracer.close()
+            profiler.tracer = None
+    
+    def get_stage_latencies(self) -> Dict[str, Dict[str, float]]:
+        """Latency summary (seconds) per processing stage"""
+        return self.brain.profiler.summary()
+    
+    def get_profiling_report(self) -> str:
+        """Text table of per-stage latencies"""
+        return self.brain.profiler.report(f"=== {self.name} stage latencies (us) ===")
+    
+    def fork(self, name: Optional[str] = None) -> 'SensoryAI':
+        """Branch this agent for what-if simulation
+        
+        The child shares the parent's memories and experience log up to this
+        point; afterwards each side only stores its own new experiences.
+        Logged entries are shared between branches and must not be mutated.
+        Forking costs O(1) regardless of how much history has been recorded.
+        """
+        self.wait_for_consolidation()
+        child = copy.copy(self)
+        child.name = name if name is not None else self.name
+        child.brain = self.brain.fork()
+        child.experience_log = self.experience_log.fork()
+        child.history = self.history.fork(child.experience_log)
+        child.timeline = self.timeline.fork()
+        child._snapshot_marks = None
+        child._similarity = None  # rebuilt from the shared log if the branch recalls
+        if self.situations is not None:
+            child.situations = self.situations.copy()
+        child.consolidation = self.consolidation.copy()
+        return child
+    
+    def _snapshot_logs(self) -> Dict[str, List[Any]]:
+        """Append-only logs that make up the agent's checkpointed state"""
+        return dict(zip(SNAPSHOT_LOGS, _agent_logs(self)))
+    
+    def _snapshot_scalars(self) -> Dict[str, Any]:
+        """Scalar state stored in every snapshot frame"""
+        return {
+            'name': self.name,
+            'is_awake': self.is_awake,
+            'verbose': self.verbose,
+            'consolidation_keep': self.consolidation_keep,
+            'consciousness_level': self.brain.consciousness_level,
+            'attention_focus': self.brain.attention_focus,
+            'intensity_stats': {sense: stats.to_dict()
+                                for sense, stats in self.brain.intensity_stats.items()},
+            'keyword_hits': (self.brain.keyword_hits.to_dict()
+                             if self.brain.keyword_hits is not None else None),
+            'situations': self.situations.to_dict() if self.situations is not None else None,
+            'consolidation': self.consolidation.to_dict()
+        }
+    
+    def snapshot(self, path: Optional[str] = None, incremental: bool = False,
+                 compress: bool = False) -> bytes:
+        """Checkpoint the agent state into a compact binary frame
+        
+        A full snapshot captures every memory and the experience log.  An
+        incremental snapshot only holds what was appended since the previous
+        snapshot and falls back to a full one if there is no base to extend.
+        When a path is given, full snapshots replace the file and incremental
+        ones are appended to it, so the file always restores to the latest state.
+        """
+        self.wait_for_consolidation()
+        logs = self._snapshot_logs()
+        marks = self._snapshot_marks
+        if incremental and marks is not None and all(
+                len(log) >= marks.get(name, 0) for name, log in logs.items()):
+            kind = SNAPSHOT_DELTA
+            payload_logs = {name: list(log[marks.get(name, 0):]) for name, log in logs.items()}
+        else:
+            kind = SNAPSHOT_FULL
+            self._snapshot_chain = struct.unpack('<Q', os.urandom(8))[0]
+            self._snapshot_sequence = 0
+            payload_logs = {name: list(log) for name, log in logs.items()}
+        
+        payload = pickle.dumps({'scalars': self._snapshot_scalars(), 'logs': payload_logs},
+                               protocol=pickle.HIGHEST_PROTOCOL)
+        flags = 0
+        if compress:
+            payload = zlib.compress(payload)
+            flags = _SNAPSHOT_COMPRESSED
+        frame = _SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, kind | flags,
+                                      self._snapshot_chain, self._snapshot_sequence,
+                                      len(payload)) + payload
+        
+        if path is not None:
+            with open(path, 'ab' if kind == SNAPSHOT_DELTA else 'wb') as f:
+                f.write(frame)
+        
+        self._snapshot_sequence += 1
+        self._snapshot_marks = {name: len(log) for name, log in logs.items()}
+        return frame
+    
+    @classmethod
+    def restore(cls, source) -> 'SensoryAI':
+        """Rebuild an agent from snapshot bytes or a snapshot file
+        
+        Files are memory-mapped and read in a single sequential pass over the
+        full frame and any deltas that follow it.  Snapshots are pickled, so
+        only restore files from trusted sources.
+        """
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            return cls._restore_from_buffer(source)
+        
+        with open(source, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                raise ValueError("Empty snapshot file")
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return cls._restore_from_buffer(mapped)
+    
+    @classmethod
+    def _restore_from_buffer(cls, buffer) -> 'SensoryAI':
+        """Apply the full frame and subsequent deltas held in a buffer"""
+        frames = iter_snapshot_frames(buffer)
+        try:
+            ai, logs = cls._apply_snapshot_frames(frames)
+        finally:
+            frames.close()
+        
+        if ai is None:
+            raise ValueError("Snapshot contains no frames")
+        ai._snapshot_marks = {name: len(log) for name, log in logs.items()}
+        return ai
+    
+    @classmethod
+    def _apply_snapshot_frames(cls, frames):
+        """Build an agent from decoded frames, checking that deltas chain up"""
+        ai = None
+        logs = None
+        for kind, chain_id, sequence, state in frames:
+            if ai is None:
+                if kind != SNAPSHOT_FULL:
+                    raise ValueError("Snapshot must start with a full frame")
+                ai = cls(state['scalars']['name'], verbose=state['scalars'].get('verbose', True))
+                logs = ai._snapshot_logs()
+                ai._snapshot_chain = chain_id
+            elif chain_id != ai._snapshot_chain or sequence != ai._snapshot_sequence:
+                raise ValueError("Snapshot delta does not extend the previous frame")
+            elif kind != SNAPSHOT_DELTA:
+                raise ValueError("Unexpected full frame inside snapshot chain")
+            
+            scalars = state['scalars']
+            ai.name = scalars['name']
+            ai.is_awake = scalars['is_awake']
+            if 'verbose' in scalars:
+                ai.verbose = scalars['verbose']
+            if 'consolidation_keep' in scalars:
+                ai.consolidation_keep = scalars['consolidation_keep']
+            ai.brain.consciousness_level = scalars['consciousness_level']
+            ai.brain.attention_focus = scalars['attention_focus']
+            if 'intensity_stats' in scalars:
+                ai.brain.intensity_stats = {sense: IntensityDistribution.from_dict(state)
+                                            for sense, state in scalars['intensity_stats'].items()}
+            if scalars.get('keyword_hits') is not None:
+                ai.brain.keyword_hits = KeywordSketch.from_dict(scalars['keyword_hits'])
+            if scalars.get('situations') is not None:
+                ai.situations = sensory_similarity.SituationClusterer.from_dict(scalars['situations'])
+            if 'consolidation' in scalars:
+                ai.consolidation = MemoryConsolidation.from_dict(scalars['consolidation'])
+            for name, items in state['logs'].items():
+                if name == 'experience_log':
+                    # Frames are unpickled separately, so share repeats again
+                    for entry in items:
+                        entry['environment'] = ai.interned.environment(entry['environment'])
+                logs[name].extend(items)
+            ai._snapshot_sequence = sequence + 1
+        return ai, logs
+
+def format_sensory_stats(stats: Dict[str, Any]) -> List[str]:
+    """Printable lines for get_sensory_stats(), one per total and per sense with inputs"""
+    lines = []
+    for key, value in stats.items():
+        if key != 'intensity_distributions':
+            lines.append(f"{key.replace('_', ' ').title()}: {value}")
+            continue
+        for sense, summary in value.items():
+            if summary['count']:
+                lines.append(f"{sense.capitalize()} Intensity: mean {summary['mean']:.2f}, "
+                             f"p50 {summary['p50']:.2f}, p90 {summary['p90']:.2f}, "
+                             f"p99 {summary['p99']:.2f} over {summary['count']} inputs")
+    return lines
 
 # Example usage and demonstration
 def main():
@@ -531,9 +2106,8 @@ def main():
     print("SENSORY STATISTICS")
     print("="*50)
     
-    stats = ai.get_sensory_stats()
-    for key, value in stats.items():
-        print(f"{key.replace('_', ' ').title()}: {value}")
+    for line in format_sensory_stats(ai.get_sensory_stats()):
+        print(line)
     
     # Put AI to sleep
     ai.sleep()
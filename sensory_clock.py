@@ -0,0 +1,161 @@
+"""
+Simulation clocks and a fixed-rate tick scheduler for SensoryAI agents
+Drives many agents at N Hz from one loop, in real or virtual time
+"""
+
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Optional, Union
+
+from sensory_ai import SensoryAI
+
+class SystemClock:
+    """Wall-clock time; sleeping really waits"""
+
+    def __call__(self) -> float:
+        return time.time()
+
+    def now(self) -> float:
+        return time.time()
+
+    def sleep(self, seconds: float):
+        if seconds > 0:
+            time.sleep(seconds)
+
+class VirtualClock:
+    """Manually advanced time, so simulations can run faster than real time"""
+
+    def __init__(self, start: float = 0.0):
+        self._now = start
+
+    def __call__(self) -> float:
+        return self._now
+
+    def now(self) -> float:
+        return self._now
+
+    def sleep(self, seconds: float):
+        if seconds > 0:
+            self._now += seconds
+
+    def advance(self, seconds: float):
+        """Move time forward, e.g. to simulate work taking a while"""
+        self.sleep(seconds)
+
+@dataclass
+class SchedulerStats:
+    """Timing statistics collected by TickScheduler"""
+    ticks: int = 0
+    experiences: int = 0
+    deadline_misses: int = 0
+    last_lag: float = 0.0
+    max_lag: float = 0.0
+    total_lag: float = 0.0
+
+    @property
+    def mean_lag(self) -> float:
+        return self.total_lag / self.ticks if self.ticks else 0.0
+
+# A source yields the next environment for an agent: an iterator of
+# environment dicts (the agent retires when it is exhausted) or a callable
+# taking the tick time and returning a dict, or None to skip that tick
+EnvironmentSource = Union[Iterable[Dict[str, Any]], Callable[[float], Optional[Dict[str, Any]]]]
+
+class TickScheduler:
+    """Fixed-rate scheduler that ticks all active agents from a shared clock
+
+    Each tick runs every active agent's `experience()` in one batch.  Agents
+    that fall asleep or run out of input are moved out of the active set, so a
+    tick costs O(active agents) however many are registered.  Registered
+    agents take their timestamps from the scheduler's clock; create them with
+    verbose=False to keep the per-tick work free of console output.
+    """
+
+    def __init__(self, rate_hz: float, clock=None):
+        if rate_hz <= 0:
+            raise ValueError("Tick rate must be positive")
+        self.period = 1.0 / rate_hz
+        self.clock = clock if clock is not None else SystemClock()
+        self.stats = SchedulerStats()
+        self._active = {}
+        self._dormant = {}
+        self._next_tick = None
+
+    def add(self, agent: SensoryAI, source: EnvironmentSource):
+        """Register an agent with the source of its environments"""
+        agent.set_clock(self.clock)
+        if not callable(source):
+            source = iter(source)
+        self._dormant.pop(id(agent), None)
+        self._active[id(agent)] = (agent, source)
+
+    def remove(self, agent: SensoryAI):
+        """Stop scheduling an agent"""
+        self._active.pop(id(agent), None)
+        self._dormant.pop(id(agent), None)
+
+    def activate(self, agent: SensoryAI):
+        """Resume ticking an agent that was parked while asleep"""
+        entry = self._dormant.pop(id(agent), None)
+        if entry is not None:
+            self._active[id(agent)] = entry
+
+    @property
+    def active_count(self) -> int:
+        return len(self._active)
+
+    def tick(self) -> float:
+        """Run one batch over the active agents; return the tick lag in seconds"""
+        now = self.clock.now()
+        if self._next_tick is None:
+            self._next_tick = now
+        scheduled = self._next_tick
+        lag = max(0.0, now - scheduled)
+
+        retired = []
+        for key, (agent, source) in self._active.items():
+            if not agent.is_awake:
+                retired.append((key, True))
+                continue
+            if callable(source):
+                environment = source(scheduled)
+            else:
+                environment = next(source, None)
+                if environment is None:
+                    retired.append((key, False))
+                    continue
+            if environment is not None:
+                agent.experience(environment)
+                self.stats.experiences += 1
+        for key, dormant in retired:
+            entry = self._active.pop(key)
+            if dormant:
+                self._dormant[key] = entry
+
+        self._next_tick = scheduled + self.period
+        if self.clock.now() > self._next_tick:
+            self.stats.deadline_misses += 1
+        self.stats.ticks += 1
+        self.stats.last_lag = lag
+        self.stats.max_lag = max(self.stats.max_lag, lag)
+        self.stats.total_lag += lag
+        return lag
+
+    def run(self, ticks: Optional[int] = None, duration: Optional[float] = None):
+        """Tick at the fixed rate for a number of ticks and/or a duration
+
+        Without limits, runs until no agents are active.
+        """
+        start = self.clock.now()
+        count = 0
+        while self._active:
+            if ticks is not None and count >= ticks:
+                break
+            if duration is not None and self._next_tick is not None \
+                    and self._next_tick - start >= duration:
+                break
+            if self._next_tick is not None:
+                self.clock.sleep(self._next_tick - self.clock.now())
+            self.tick()
+            count += 1
+        return self.stats
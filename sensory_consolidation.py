@@ -0,0 +1,213 @@
+"""
+Memory consolidation for SensoryAI
+Compact summaries that stand in for old memories once they are released
+"""
+
+import copy
+import math
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, Iterable, List
+
+@dataclass
+class WindowSummary:
+    """Aggregate of the memories recorded in one time window"""
+    start: float
+    count: int = 0
+    intensity_total: float = 0.0
+    intensity_min: float = math.inf
+    intensity_max: float = -math.inf
+    qualities: Dict[str, int] = field(default_factory=dict)  # repeats collapse to counts
+    dominant: Dict[str, int] = field(default_factory=dict)   # integrated experiences only
+
+    @property
+    def mean_intensity(self) -> float:
+        return self.intensity_total / self.count if self.count else 0.0
+
+    def add(self, intensity: float, quality: str, dominant: str = None):
+        self.count += 1
+        self.intensity_total += intensity
+        self.intensity_min = min(self.intensity_min, intensity)
+        self.intensity_max = max(self.intensity_max, intensity)
+        self.qualities[quality] = self.qualities.get(quality, 0) + 1
+        if dominant is not None:
+            self.dominant[dominant] = self.dominant.get(dominant, 0) + 1
+
+    def merge(self, other: 'WindowSummary'):
+        self.count += other.count
+        self.intensity_total += other.intensity_total
+        self.intensity_min = min(self.intensity_min, other.intensity_min)
+        self.intensity_max = max(self.intensity_max, other.intensity_max)
+        for counts, more in ((self.qualities, other.qualities), (self.dominant, other.dominant)):
+            for key, count in more.items():
+                counts[key] = counts.get(key, 0) + count
+
+@dataclass
+class SituationRecord:
+    """Lifetime aggregate of the consolidated experiences in one situation"""
+    count: int = 0
+    intensity_total: float = 0.0
+    first: float = math.inf
+    last: float = -math.inf
+
+    @property
+    def mean_intensity(self) -> float:
+        return self.intensity_total / self.count if self.count else 0.0
+
+    def merge(self, other: 'SituationRecord'):
+        self.count += other.count
+        self.intensity_total += other.intensity_total
+        self.first = min(self.first, other.first)
+        self.last = max(self.last, other.last)
+
+class MemoryConsolidation:
+    """Summaries and exact counts of everything consolidated out of an agent's logs
+
+    Each log's released items are folded into per-window aggregates
+    (`window` seconds wide) with repeated qualities collapsed to counts.
+    Released experiences are also folded into one record per situation:
+    the clustered situation id when situations are enabled, otherwise the
+    dominant sense and experience quality.  A window that straddles two
+    passes keeps accumulating, so the summaries don't depend on when the
+    agent happened to sleep.  A log keeps at most `max_windows` summaries:
+    past that, its oldest one rolls up everything before the rest.
+    """
+
+    def __init__(self, window: float = 3600.0, max_windows: int = 720):
+        if window <= 0:
+            raise ValueError("Consolidation window must be positive")
+        if max_windows < 1:
+            raise ValueError("max_windows must be at least 1")
+        self.window = window
+        self.max_windows = max_windows
+        self.counts: Dict[str, int] = {}  # items released per log
+        self.windows: Dict[str, Dict[int, WindowSummary]] = {}
+        self.situations: Dict[str, SituationRecord] = {}
+        self.passes = 0
+        self._owned = True  # False while the summaries are shared with a copy
+
+    def _own(self):
+        """Take private copies of summaries shared with a copy, before changing them"""
+        if not self._owned:
+            self.counts = dict(self.counts)
+            self.windows = {log: {slot: WindowSummary(**asdict(summary))
+                                  for slot, summary in windows.items()}
+                            for log, windows in self.windows.items()}
+            self.situations = {key: SituationRecord(**asdict(record))
+                               for key, record in self.situations.items()}
+            self._owned = True
+
+    def _window(self, log: str, timestamp: float) -> WindowSummary:
+        slot = int(timestamp // self.window)
+        windows = self.windows.setdefault(log, {})
+        summary = windows.get(slot)
+        if summary is None:
+            summary = windows[slot] = WindowSummary(slot * self.window)
+        return summary
+
+    def _count(self, log: str, count: int):
+        self.counts[log] = self.counts.get(log, 0) + count
+
+    def _cap(self, log: str):
+        """Fold a log's oldest windows into its first until max_windows remain"""
+        windows = self.windows.get(log, {})
+        if len(windows) > self.max_windows:
+            slots = sorted(windows)
+            rollup = windows[slots[0]]
+            for slot in slots[1:len(slots) - self.max_windows + 1]:
+                rollup.merge(windows.pop(slot))
+
+    def absorb_inputs(self, log: str, inputs: Iterable[Any]):
+        """Fold released sensory inputs into a sense's windows"""
+        self._own()
+        count = 0
+        for sensory_input in inputs:
+            self._window(log, sensory_input.timestamp).add(sensory_input.intensity,
+                                                           sensory_input.quality)
+            count += 1
+        self._count(log, count)
+        self._cap(log)
+
+    def absorb_integrated(self, experiences: Iterable[Dict[str, Any]],
+                          log: str = 'sensory_integration'):
+        """Fold released integrated experiences into windows"""
+        self._own()
+        count = 0
+        for integrated in experiences:
+            self._window(log, integrated['timestamp']).add(
+                integrated['overall_intensity'], integrated['experience_quality'],
+                integrated['dominant_sense'])
+            count += 1
+        self._count(log, count)
+        self._cap(log)
+
+    def absorb_entries(self, entries: Iterable[Dict[str, Any]], log: str = 'experience_log'):
+        """Fold released experience log entries into situation records"""
+        self._own()
+        count = 0
+        for entry in entries:
+            experience = entry['experience']
+            integrated = experience['integrated_experience']
+            if 'situation' in experience:
+                key = f"situation {experience['situation']}"
+            else:
+                key = f"{integrated['dominant_sense']}/{integrated['experience_quality']}"
+            record = self.situations.setdefault(key, SituationRecord())
+            record.count += 1
+            record.intensity_total += integrated['overall_intensity']
+            record.first = min(record.first, integrated['timestamp'])
+            record.last = max(record.last, integrated['timestamp'])
+            count += 1
+        self._count(log, count)
+
+    def merge(self, other: 'MemoryConsolidation'):
+        """Add another consolidation's summaries and counts (same window width) to this one"""
+        if other.window != self.window:
+            raise ValueError("Cannot merge consolidations with different windows")
+        self._own()
+        for log, count in other.counts.items():
+            self._count(log, count)
+        for log, windows in other.windows.items():
+            for slot, summary in windows.items():
+                mine = self.windows.setdefault(log, {})
+                if slot in mine:
+                    mine[slot].merge(summary)
+                else:
+                    mine[slot] = WindowSummary(**asdict(summary))
+            self._cap(log)
+        for key, record in other.situations.items():
+            self.situations.setdefault(key, SituationRecord()).merge(record)
+
+    def summaries(self, log: str) -> List[WindowSummary]:
+        """A log's window aggregates, oldest first"""
+        windows = self.windows.get(log, {})
+        return [windows[slot] for slot in sorted(windows)]
+
+    def copy(self) -> 'MemoryConsolidation':
+        """O(1) copy; whichever side changes first copies the shared summaries"""
+        duplicate = copy.copy(self)
+        self._owned = duplicate._owned = False
+        return duplicate
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain-data state for snapshots"""
+        return {
+            'window': self.window,
+            'max_windows': self.max_windows,
+            'counts': dict(self.counts),
+            'windows': {log: {slot: asdict(summary) for slot, summary in windows.items()}
+                        for log, windows in self.windows.items()},
+            'situations': {key: asdict(record) for key, record in self.situations.items()},
+            'passes': self.passes
+        }
+
+    @classmethod
+    def from_dict(cls, state: Dict[str, Any]) -> 'MemoryConsolidation':
+        consolidation = cls(state['window'], state.get('max_windows', 720))
+        consolidation.counts = dict(state['counts'])
+        consolidation.windows = {log: {int(slot): WindowSummary(**summary)
+                                       for slot, summary in windows.items()}
+                                 for log, windows in state['windows'].items()}
+        consolidation.situations = {key: SituationRecord(**record)
+                                    for key, record in state['situations'].items()}
+        consolidation.passes = state['passes']
+        return consolidation
@@ -0,0 +1,149 @@
+"""
+Preset and synthetic environments for SensoryAI
+Seeded, reproducible environment streams for demos, benchmarks and load tests
+"""
+
+import itertools
+import random
+from collections import deque
+from dataclasses import dataclass, field, replace
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+from sensory_ai import SensoryBrain
+
+SENSES = ('vision', 'hearing', 'touch', 'smell', 'taste')
+
+# Hand-written environments shared by the demos
+PRESETS = {
+    "Peaceful Sunrise": {
+        "vision": "Golden sunrise over calm ocean, pink clouds, seagulls flying",
+        "hearing": "Gentle ocean waves, distant seagull calls, soft wind",
+        "touch": "Warm morning sun, cool ocean breeze, soft sand",
+        "smell": "Fresh ocean air, salty breeze, morning dew",
+        "taste": "Clean, fresh morning air"
+    },
+    "Busy City Street": {
+        "vision": "Tall skyscrapers, bright neon lights, busy traffic, people walking",
+        "hearing": "Loud traffic, car horns, people talking, sirens",
+        "touch": "Hard concrete sidewalk, warm city air, vibration from traffic",
+        "smell": "Car exhaust, street food, city air",
+        "taste": "Polluted air, street food aromas"
+    },
+    "Forest Adventure": {
+        "vision": "Tall green trees, dappled sunlight, moss-covered rocks, wildlife",
+        "hearing": "Rustling leaves, bird songs, flowing stream, animal sounds",
+        "touch": "Rough tree bark, soft moss, cool shade, fresh air",
+        "smell": "Pine trees, earth, fresh air, wildflowers",
+        "taste": "Clean forest air, natural freshness"
+    },
+    "Cozy Home": {
+        "vision": "Warm lighting, comfortable furniture, family photos, fireplace",
+        "hearing": "Soft music, gentle conversation, crackling fire, quiet comfort",
+        "touch": "Soft cushions, warm temperature, comfortable fabrics",
+        "smell": "Home cooking, comfort, warmth, family",
+        "taste": "Warm tea, home-cooked meal, comfort"
+    },
+    "Concert Hall": {
+        "vision": "Bright stage lights, musicians, audience, elegant hall",
+        "hearing": "Beautiful music, applause, instruments, acoustics",
+        "touch": "Vibrating bass, warm crowd, excitement, elegant seating",
+        "smell": "Perfume, excitement, venue air, anticipation",
+        "taste": "Excitement, anticipation, elegant atmosphere"
+    }
+}
+
+# Padding words; any that contain a lexicon keyword are filtered out per sense
+FILLER_WORDS = ('the', 'a', 'with', 'and', 'of', 'in', 'on', 'by', 'very', 'some', 'many',
+                'old', 'new', 'big', 'small', 'left', 'right', 'up', 'down', 'near', 'far',
+                'quite', 'bright', 'dim', 'just', 'over', 'under', 'around', 'before', 'after')
+
+def sense_lexicon(sense: str) -> List[str]:
+    """Every keyword the analyzer for one sense matches"""
+    return [keyword for keywords in SensoryBrain().lexicon(sense).values() for keyword in keywords]
+
+# A fixed value or an inclusive (low, high) range sampled uniformly per description
+Spread = Union[float, Tuple[float, float]]
+
+@dataclass
+class CorpusConfig:
+    """Distributions an EnvironmentGenerator draws from"""
+    words: Spread = (6, 18)              # description length (a multi-word keyword counts once)
+    keyword_density: Spread = 0.25       # share of words that are lexicon hits
+    repeat_rate: float = 0.0             # chance of re-emitting a recent environment
+    sense_coverage: Union[float, Dict[str, float]] = 1.0  # chance each sense is present
+    repeat_pool: int = 1000              # how many recent environments repeats draw from
+    seed: int = 0
+    senses: Tuple[str, ...] = field(default=SENSES)
+
+class EnvironmentGenerator:
+    """Seeded generator of synthetic environment dicts
+
+    Descriptions mix keywords from each sense's lexicon with filler words,
+    so their length and hit density are controlled exactly.  Environments
+    are produced lazily, one at a time, and the same seed always yields the
+    same stream, so corpora of any size need no storage.
+    """
+
+    def __init__(self, config: Optional[CorpusConfig] = None, **overrides):
+        self.config = config if config is not None else CorpusConfig()
+        if overrides:
+            self.config = replace(self.config, **overrides)
+        if not 0.0 <= self.config.repeat_rate <= 1.0:
+            raise ValueError("Repeat rate must be between 0 and 1")
+        self.lexicons = {sense: sense_lexicon(sense) for sense in self.config.senses}
+        self.fillers = {sense: [word for word in FILLER_WORDS
+                                if not any(keyword in word for keyword in lexicon)]
+                        for sense, lexicon in self.lexicons.items()}
+        coverage = self.config.sense_coverage
+        self.coverage = coverage if isinstance(coverage, dict) else \
+            {sense: coverage for sense in self.config.senses}
+        self.reset()
+
+    def reset(self):
+        """Restart the stream from the beginning"""
+        self.rng = random.Random(self.config.seed)
+        self._recent = deque(maxlen=self.config.repeat_pool)
+        self.generated = 0
+        self.repeats = 0
+
+    def _draw(self, spread: Spread) -> float:
+        if isinstance(spread, tuple):
+            return self.rng.uniform(*spread)
+        return spread
+
+    def description(self, sense: str) -> str:
+        """One synthetic description for a sense"""
+        rng = self.rng
+        lexicon, fillers = self.lexicons[sense], self.fillers[sense]
+        words = max(1, round(self._draw(self.config.words)))
+        density = self._draw(self.config.keyword_density)
+        return " ".join(rng.choice(lexicon) if rng.random() < density else rng.choice(fillers)
+                        for _ in range(words))
+
+    def environment(self) -> Dict[str, str]:
+        """The next environment in the stream"""
+        self.generated += 1
+        if self._recent and self.rng.random() < self.config.repeat_rate:
+            self.repeats += 1
+            return dict(self.rng.choice(self._recent))
+
+        senses = [sense for sense in self.config.senses
+                  if self.rng.random() < self.coverage.get(sense, 0.0)]
+        if not senses:
+            senses = [self.rng.choice(self.config.senses)]
+        environment = {sense: self.description(sense) for sense in senses}
+        if self.config.repeat_rate:
+            self._recent.append(environment)
+        return dict(environment)
+
+    def __iter__(self) -> Iterator[Dict[str, str]]:
+        while True:
+            yield self.environment()
+
+    def take(self, count: int) -> Iterator[Dict[str, str]]:
+        """Lazily yield the next `count` environments"""
+        return itertools.islice(self, count)
+
+def generate_environments(count: int, **config) -> Iterator[Dict[str, str]]:
+    """Lazily yield `count` environments from a fresh generator"""
+    return EnvironmentGenerator(**config).take(count)
@@ -0,0 +1,191 @@
+"""
+Change feed for the SensoryAI system
+Pushes new sensory inputs and experiences to subscribers as they happen
+"""
+
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Iterable, Optional
+
+if TYPE_CHECKING:
+    import asyncio
+
+# Topics published by SensoryBrain and SensoryAI
+SENSORY_INPUT = "sensory_input"
+INTEGRATED_EXPERIENCE = "integrated_experience"
+EXPERIENCE = "experience"
+TOPICS = (SENSORY_INPUT, INTEGRATED_EXPERIENCE, EXPERIENCE)
+
+# Overflow policies for full subscriber queues
+DROP = "drop"    # discard the oldest queued event to make room
+BLOCK = "block"  # make the publisher wait until the subscriber catches up
+
+class FeedClosed(Exception):
+    """Raised when reading from a closed, drained subscription"""
+
+class FeedTimeout(Exception):
+    """Raised when no event arrives before a read timeout"""
+
+@dataclass
+class FeedEvent:
+    """A single change published on the feed"""
+    topic: str
+    data: Any
+    timestamp: float
+
+class Subscription:
+    """Bounded queue of feed events for one consumer
+
+    Iterate it from a thread, or with ``async for`` from asyncio code.  The
+    BLOCK policy is meant for thread consumers: an asyncio consumer running on
+    the publisher's own thread should use DROP so it can never deadlock.
+    """
+
+    def __init__(self, feed: 'ChangeFeed', topics: Iterable[str], maxsize: int,
+                 policy: str, block_timeout: Optional[float]):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        if policy not in (DROP, BLOCK):
+            raise ValueError(f"Unknown overflow policy: {policy}")
+        self.topics = frozenset(topics)
+        unknown = self.topics.difference(TOPICS)
+        if unknown:
+            raise ValueError(f"Unknown feed topics: {sorted(unknown)}")
+        self.maxsize = maxsize
+        self.policy = policy
+        self.block_timeout = block_timeout
+        self.dropped = 0
+        self.closed = False
+        self._feed = feed
+        self._queue = deque()
+        self._cond = threading.Condition()
+        self._async_waiters = []
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    def _put(self, event: FeedEvent):
+        """Queue an event, applying the overflow policy (publisher side)"""
+        with self._cond:
+            if self.closed:
+                return
+            if len(self._queue) >= self.maxsize:
+                if self.policy == BLOCK:
+                    self._cond.wait_for(lambda: len(self._queue) < self.maxsize or self.closed,
+                                        timeout=self.block_timeout)
+                    if self.closed:
+                        return
+                if len(self._queue) >= self.maxsize:
+                    self._queue.popleft()
+                    self.dropped += 1
+            self._queue.append(event)
+            self._cond.notify_all()
+            self._wake_async_waiters()
+
+    def _wake_async_waiters(self):
+        """Resolve pending ``async for`` waits (caller holds the condition)"""
+        for loop, future in self._async_waiters:
+            loop.call_soon_threadsafe(_resolve, future)
+        self._async_waiters.clear()
+
+    def get(self, timeout: Optional[float] = None) -> FeedEvent:
+        """Wait for the next event"""
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._queue or self.closed, timeout=timeout):
+                raise FeedTimeout("No feed event before timeout")
+            if not self._queue:
+                raise FeedClosed("Subscription is closed")
+            event = self._queue.popleft()
+            self._cond.notify_all()
+            return event
+
+    def get_nowait(self) -> Optional[FeedEvent]:
+        """Return the next queued event, or None if there is none"""
+        with self._cond:
+            if not self._queue:
+                return None
+            event = self._queue.popleft()
+            self._cond.notify_all()
+            return event
+
+    def close(self):
+        """Stop receiving events; queued events can still be drained"""
+        self._feed.unsubscribe(self)
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+            self._wake_async_waiters()
+
+    def __enter__(self) -> 'Subscription':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __iter__(self):
+        while True:
+            try:
+                yield self.get()
+            except FeedClosed:
+                return
+
+    def __aiter__(self) -> 'Subscription':
+        return self
+
+    async def __anext__(self) -> FeedEvent:
+        while True:
+            with self._cond:
+                if self._queue:
+                    event = self._queue.popleft()
+                    self._cond.notify_all()
+                    return event
+                if self.closed:
+                    raise StopAsyncIteration
+                import asyncio  # already loaded by the running event loop
+                loop = asyncio.get_running_loop()
+                future = loop.create_future()
+                self._async_waiters.append((loop, future))
+            await future
+
+def _resolve(future: 'asyncio.Future'):
+    if not future.done():
+        future.set_result(None)
+
+class ChangeFeed:
+    """Publish/subscribe hub for new sensory inputs and experiences"""
+
+    def __init__(self):
+        # Replaced wholesale on (un)subscribe so publishers can iterate
+        # without taking a lock
+        self._subscribers = ()
+        self._lock = threading.Lock()
+
+    @property
+    def active(self) -> bool:
+        """Whether anyone is listening; publishers skip all work otherwise"""
+        return bool(self._subscribers)
+
+    def subscribe(self, topics: Optional[Iterable[str]] = None, maxsize: int = 1000,
+                  policy: str = DROP, block_timeout: Optional[float] = None) -> Subscription:
+        """Create a subscription to some or all topics"""
+        subscription = Subscription(self, TOPICS if topics is None else topics,
+                                    maxsize, policy, block_timeout)
+        with self._lock:
+            self._subscribers = self._subscribers + (subscription,)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        """Remove a subscription from the feed"""
+        with self._lock:
+            self._subscribers = tuple(s for s in self._subscribers if s is not subscription)
+
+    def publish(self, topic: str, data: Any):
+        """Deliver an event to every subscriber of the topic"""
+        event = None
+        for subscription in self._subscribers:
+            if topic in subscription.topics:
+                if event is None:
+                    event = FeedEvent(topic, data, time.time())
+                subscription._put(event)
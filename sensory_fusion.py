@@ -0,0 +1,116 @@
+"""
+Timestamp-aligned fusion of independent sensory streams
+Merges per-sense inputs by time and integrates them at a fixed cadence
+"""
+
+import heapq
+import itertools
+import math
+import threading
+from operator import attrgetter
+from typing import Any, Dict, Iterable, Iterator, List
+
+from sensory_ai import SensoryBrain, SensoryInput
+
+# What to do with inputs older than an already emitted window
+LATE_NEXT = "next"  # fold them into the next window
+LATE_DROP = "drop"  # discard them
+
+class SensoryFusion:
+    """Event-time fusion stage in front of SensoryBrain.integrate_senses
+
+    Inputs are buffered in a timestamp heap and grouped into windows of
+    `interval` seconds.  A window is integrated once the watermark (newest
+    timestamp seen minus `allowed_lateness`) has passed its end, so senses
+    produced at different rates by separate producers line up without a
+    global barrier.  The buffer is bounded: when it holds more than
+    `max_buffer` inputs the oldest window is integrated early.
+    """
+
+    def __init__(self, brain: SensoryBrain, interval: float = 0.1,
+                 allowed_lateness: float = 0.0, max_buffer: int = 10000,
+                 late_policy: str = LATE_NEXT):
+        if interval <= 0:
+            raise ValueError("Fusion interval must be positive")
+        if late_policy not in (LATE_NEXT, LATE_DROP):
+            raise ValueError(f"Unknown late-data policy: {late_policy}")
+        self.brain = brain
+        self.interval = interval
+        self.allowed_lateness = allowed_lateness
+        self.max_buffer = max_buffer
+        self.late_policy = late_policy
+
+        self.late_inputs = 0
+        self.dropped_inputs = 0
+        self.forced_windows = 0
+        self._heap = []
+        self._sequence = itertools.count()
+        self._next_start = None
+        self._newest = -math.inf
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def push(self, sensory_input: SensoryInput) -> List[Dict[str, Any]]:
+        """Add one input (from any producer thread); return windows it completed"""
+        with self._lock:
+            key = sensory_input.timestamp
+            if self._next_start is not None and key < self._next_start:
+                self.late_inputs += 1
+                if self.late_policy == LATE_DROP:
+                    self.dropped_inputs += 1
+                    return []
+                key = self._next_start
+            elif self._next_start is None:
+                self._next_start = math.floor(key / self.interval) * self.interval
+
+            heapq.heappush(self._heap, (key, next(self._sequence), sensory_input))
+            self._newest = max(self._newest, key)
+            return self._emit_ready(self._newest - self.allowed_lateness)
+
+    def flush(self) -> List[Dict[str, Any]]:
+        """Integrate every buffered window regardless of the watermark"""
+        with self._lock:
+            return self._emit_ready(math.inf)
+
+    def fuse(self, streams: Iterable[Iterable[SensoryInput]]) -> Iterator[Dict[str, Any]]:
+        """K-way merge timestamp-sorted streams and yield fused windows
+
+        `streams` may also be a dict mapping sense names to streams.
+        """
+        if isinstance(streams, dict):
+            streams = streams.values()
+        for sensory_input in heapq.merge(*streams, key=attrgetter('timestamp')):
+            yield from self.push(sensory_input)
+        yield from self.flush()
+
+    def _emit_ready(self, watermark: float) -> List[Dict[str, Any]]:
+        """Integrate windows that closed before the watermark (caller holds the lock)"""
+        results = []
+        while self._heap:
+            start = max(self._next_start,
+                        math.floor(self._heap[0][0] / self.interval) * self.interval)
+            end = start + self.interval
+            if end > watermark:
+                if len(self._heap) <= self.max_buffer:
+                    break
+                self.forced_windows += 1
+            results.append(self._emit_window(start, end))
+        return results
+
+    def _emit_window(self, start: float, end: float) -> Dict[str, Any]:
+        """Record one window's inputs in time order and integrate them"""
+        inputs = []
+        while self._heap and self._heap[0][0] < end:
+            inputs.append(heapq.heappop(self._heap)[2])
+        for sensory_input in inputs:
+            self.brain.record_input(sensory_input)
+        self._next_start = end
+
+        return {
+            'window': (start, end),
+            'individual_senses': {i.sense_type: i for i in inputs},
+            'input_count': len(inputs),
+            'integrated_experience': self.brain.integrate_senses(timestamp=end)
+        }
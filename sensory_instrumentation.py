@@ -0,0 +1,405 @@
+"""
+Runtime instrumentation for the SensoryAI system
+Per-stage latency histograms, a Prometheus metrics exporter and
+sampled Chrome trace export
+"""
+
+import bisect
+import math
+import numbers
+import os
+import threading
+import time
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional
+
+if TYPE_CHECKING:
+    from http.server import ThreadingHTTPServer
+
+# Stage names recorded by SensoryBrain and SensoryAI
+STAGE_EXPERIENCE = "experience"
+STAGE_INTEGRATE = "integrate_senses"
+STAGE_QUALITY = "experience_quality"
+STAGE_LOGGING = "logging"
+STAGE_PRINTING = "printing"
+
+def _bucket_bounds(lowest: float, highest: float, per_octave: int) -> List[float]:
+    """Geometric bucket upper bounds, `per_octave` buckets per doubling"""
+    count = int(math.ceil(math.log2(highest / lowest) * per_octave))
+    return [lowest * 2 ** (i / per_octave) for i in range(count + 1)]
+
+class LatencyHistogram:
+    """Fixed-layout log-bucket latency histogram (HDR-style)
+
+    Buckets grow geometrically from 100 ns to about 100 s with four buckets
+    per doubling, so any recorded latency is reported within ~19% and
+    histograms with the same layout can be merged by adding counts.
+    """
+
+    BOUNDS = _bucket_bounds(1e-7, 100.0, 4)
+
+    def __init__(self):
+        self.counts = [0] * (len(self.BOUNDS) + 1)  # last bucket is overflow
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def record(self, seconds: float):
+        """Add one observation"""
+        self.counts[bisect.bisect_left(self.BOUNDS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds < self.min:
+            self.min = seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def merge(self, other: 'LatencyHistogram'):
+        """Add another histogram's observations into this one"""
+        for i, count in enumerate(other.counts):
+            self.counts[i] += count
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, p: float) -> float:
+        """Upper bound of the bucket holding the p-th percentile (0-100)"""
+        if not self.count:
+            return 0.0
+        rank = max(1, int(math.ceil(p / 100.0 * self.count)))
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                bound = self.BOUNDS[i] if i < len(self.BOUNDS) else self.max
+                return min(bound, self.max)
+        return self.max
+
+    def summary(self) -> Dict[str, float]:
+        """Count, mean, percentiles and extremes in seconds"""
+        return {
+            'count': self.count,
+            'mean': self.mean,
+            'p50': self.percentile(50),
+            'p90': self.percentile(90),
+            'p99': self.percentile(99),
+            'min': self.min if self.count else 0.0,
+            'max': self.max
+        }
+
+class Profiler:
+    """Collects per-stage latencies while enabled, and trace spans while tracing
+
+    Call sites check `timing` before reading the clock, so with histograms
+    off and no sampled trace in progress each stage costs one attribute
+    lookup.  Stage timings use the monotonic perf_counter clock.
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.histograms: Dict[str, LatencyHistogram] = {}
+        self.tracer: Optional['ChromeTracer'] = None
+        self.tracing = False
+        self.timing = enabled
+        self._enabled = enabled
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self._enabled
+
+    @enabled.setter
+    def enabled(self, value: bool):
+        self._enabled = value
+        self.timing = value or self.tracing
+
+    def begin_trace(self) -> bool:
+        """Decide whether the experience starting now is traced"""
+        self.tracing = self.tracer is not None and self.tracer.sample()
+        self.timing = self._enabled or self.tracing
+        return self.tracing
+
+    def end_trace(self):
+        """Write out the spans of the current trace, if any"""
+        if self.tracing:
+            self.tracer.flush()
+            self.tracing = False
+            self.timing = self._enabled
+
+    def record(self, stage: str, started: float, finished: float,
+               category: str = "sensory", args: Optional[Dict] = None):
+        """Record one stage that ran from `started` to `finished` (perf_counter)"""
+        if self._enabled:
+            histogram = self.histograms.get(stage)
+            if histogram is None:
+                with self._lock:
+                    histogram = self.histograms.setdefault(stage, LatencyHistogram())
+            histogram.record(finished - started)
+        if self.tracing:
+            self.tracer.add_span(stage, category, started, finished, args)
+
+    def reset(self):
+        """Drop all recorded latencies"""
+        with self._lock:
+            self.histograms = {}
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Latency summary for every stage seen so far"""
+        return {stage: histogram.summary() for stage, histogram in sorted(self.histograms.items())}
+
+    def report(self, title: Optional[str] = None) -> str:
+        """Fixed-width text table of stage latencies in microseconds"""
+        lines = []
+        if title:
+            lines.append(title)
+        lines.append(f"{'stage':<22}{'count':>9}{'mean':>11}{'p50':>11}{'p90':>11}{'p99':>11}{'max':>11}")
+        for stage, stats in self.summary().items():
+            lines.append(f"{stage:<22}{stats['count']:>9}" + "".join(
+                f"{stats[key] * 1e6:>11.1f}" for key in ('mean', 'p50', 'p90', 'p99', 'max')))
+        return "\n".join(lines)
+
+def _escape(value) -> str:
+    """Escape a Prometheus label value"""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _sample_value(value) -> str:
+    """A sample value at full precision: integers exactly, floats round-trip"""
+    if isinstance(value, numbers.Integral):
+        return str(int(value))  # bools too, as 0 or 1
+    value = float(value)
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(value)
+
+def _labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+class MetricsExporter:
+    """Prometheus text-format exporter for one or more SensoryAI agents
+
+    Almost every metric is read from state the agents already keep (memory
+    lengths, cache counters, profiler histograms, feed queues) when a scrape
+    happens, so the experience hot path does no extra work and takes no
+    locks.  Values are read without locking and may be a scrape behind.
+    """
+
+    SENSE_STATS = {
+        'vision': 'total_visual_experiences',
+        'hearing': 'total_auditory_experiences',
+        'touch': 'total_tactile_experiences',
+        'smell': 'total_olfactory_experiences',
+        'taste': 'total_gustatory_experiences'
+    }
+
+    def __init__(self, *agents, prefix: str = "sensory"):
+        self.agents = list(agents)
+        self.prefix = prefix
+        self._gauges = []
+        self._last_counts = {}
+        self._lock = threading.Lock()
+
+    def add_agent(self, agent):
+        self.agents.append(agent)
+
+    def register_gauge(self, name: str, help_text: str, read: Callable[[], float],
+                       labels: Optional[Dict[str, str]] = None):
+        """Export an extra gauge such as a fusion buffer or scheduler lag"""
+        self._gauges.append((name, help_text, read, labels or {}))
+
+    def collect(self) -> str:
+        """Render all metrics in Prometheus exposition format"""
+        families = {}
+
+        def add(name, kind, help_text, value, **labels):
+            family = families.setdefault(f"{self.prefix}_{name}", (kind, help_text, []))
+            family[2].append((labels, value))
+
+        now = time.monotonic()
+        with self._lock:
+            for agent in self.agents:
+                brain = agent.brain
+                stats = agent.get_sensory_stats()
+                experiences = agent.total_experiences()
+                add("experiences_total", "counter", "Experiences processed", experiences, agent=agent.name)
+
+                # Throughput since the previous scrape of this agent
+                previous = self._last_counts.get(id(agent))
+                rate = 0.0
+                if previous is not None and now > previous[0]:
+                    rate = max(0, experiences - previous[1]) / (now - previous[0])
+                self._last_counts[id(agent)] = (now, experiences)
+                add("experiences_per_second", "gauge", "Experience rate since the previous scrape",
+                    rate, agent=agent.name)
+
+                for sense, key in self.SENSE_STATS.items():
+                    add("inputs_total", "counter", "Inputs processed per sense",
+                        stats[key], agent=agent.name, sense=sense)
+                add("integrated_experiences_total", "counter", "Integrated experiences produced",
+                    stats['total_integrated_experiences'], agent=agent.name)
+                for log, size in agent.get_memory_sizes().items():
+                    add("memory_items", "gauge", "Items held per memory log", size,
+                        agent=agent.name, log=log)
+
+                add("awake", "gauge", "Whether the agent is awake", int(agent.is_awake), agent=agent.name)
+                add("consciousness_level", "gauge", "Current consciousness level",
+                    brain.consciousness_level, agent=agent.name)
+
+                lookups = brain.cache_hits + brain.cache_misses
+                add("sense_cache_hits_total", "counter", "Degraded-mode sense cache hits",
+                    brain.cache_hits, agent=agent.name)
+                add("sense_cache_misses_total", "counter", "Degraded-mode sense cache misses",
+                    brain.cache_misses, agent=agent.name)
+                add("sense_cache_hit_ratio", "gauge", "Sense cache hit ratio",
+                    brain.cache_hits / lookups if lookups else 0.0, agent=agent.name)
+                add("sense_cache_entries", "gauge", "Entries in the sense cache",
+                    len(brain.sense_cache), agent=agent.name)
+
+                for index, subscription in enumerate(brain.feed._subscribers):
+                    add("feed_queue_depth", "gauge", "Events waiting per feed subscription",
+                        len(subscription), agent=agent.name, subscription=index)
+                    add("feed_dropped_total", "counter", "Events dropped per feed subscription",
+                        subscription.dropped, agent=agent.name, subscription=index)
+
+                for stage, histogram in list(brain.profiler.histograms.items()):
+                    for quantile in (0.5, 0.9, 0.99):
+                        add("stage_latency_seconds", "summary", "Stage latency while profiling is on",
+                            histogram.percentile(quantile * 100), agent=agent.name, stage=stage,
+                            quantile=quantile)
+                    add("stage_latency_seconds_sum", None, None, histogram.total,
+                        agent=agent.name, stage=stage)
+                    add("stage_latency_seconds_count", None, None, histogram.count,
+                        agent=agent.name, stage=stage)
+
+                for sense, distribution in brain.intensity_stats.items():
+                    for quantile, value in zip((0.5, 0.9, 0.99),
+                                               distribution.percentiles((50, 90, 99))):
+                        add("input_intensity", "summary", "Input intensity per sense", value,
+                            agent=agent.name, sense=sense, quantile=quantile)
+                    add("input_intensity_sum", None, None, distribution.mean * distribution.count,
+                        agent=agent.name, sense=sense)
+                    add("input_intensity_count", None, None, distribution.count,
+                        agent=agent.name, sense=sense)
+
+                if brain.keyword_hits is not None:
+                    for key, hits in brain.keyword_hits.heavy_hitters():
+                        table, keyword = key.split(":", 1)
+                        add("keyword_hits_total", "counter", "Estimated lexicon keyword hits (top-k)",
+                            hits, agent=agent.name, table=table, keyword=keyword)
+
+            for name, help_text, read, labels in self._gauges:
+                add(name, "gauge", help_text, read(), **labels)
+
+        lines = []
+        for name, (kind, help_text, samples) in families.items():
+            if kind is not None:
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+            for labels, value in samples:
+                lines.append(f"{name}{_labels(labels)} {_sample_value(value)}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: str):
+        """Atomically write the metrics to a file (textfile-collector style)"""
+        temporary = f"{path}.tmp"
+        with open(temporary, 'w') as f:
+            f.write(self.collect())
+        os.replace(temporary, path)
+
+    def serve(self, port: int = 9108, host: str = "127.0.0.1") -> 'ThreadingHTTPServer':
+        """Serve /metrics from a daemon thread; call shutdown() on the result to stop"""
+        # Imported here: agents that never serve metrics skip loading http.server
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        exporter = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] not in ('/', '/metrics'):
+                    self.send_error(404)
+                    return
+                body = exporter.collect().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), MetricsHandler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, name="sensory-metrics", daemon=True).start()
+        return server
+
+class ChromeTracer:
+    """Writes sampled experience traces as Chrome Trace Event JSON
+
+    One experience in `sample_every` is traced.  Its spans are buffered and
+    appended to the file as complete ("X") events when the experience ends,
+    using the unterminated JSON array form that trace viewers accept, so the
+    file can be opened at any time while it grows.
+    """
+
+    def __init__(self, path: str, sample_every: int = 100):
+        if sample_every < 1:
+            raise ValueError("sample_every must be at least 1")
+        self.path = path
+        self.sample_every = sample_every
+        self.traces = 0
+        self._seen = 0
+        self._pending = []
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+        self._file = open(path, 'w')
+        self._file.write("[\n")
+
+    def sample(self) -> bool:
+        """Count an experience and report whether it is the one in N to trace"""
+        self._seen += 1
+        return (self._seen - 1) % self.sample_every == 0
+
+    def add_span(self, name: str, category: str, started: float, finished: float,
+                 args: Optional[Dict] = None):
+        event = {
+            'name': name,
+            'cat': category,
+            'ph': 'X',
+            'ts': started * 1e6,
+            'dur': (finished - started) * 1e6,
+            'pid': self._pid,
+            'tid': threading.get_ident()
+        }
+        if args:
+            event['args'] = args
+        self._pending.append(event)
+
+    def flush(self):
+        """Append the buffered spans of a finished trace to the file"""
+        import json
+        events, self._pending = self._pending, []
+        with self._lock:
+            if self._file.closed:
+                return
+            self._file.write("".join(json.dumps(event) + ",\n" for event in events))
+            self._file.flush()
+            self.traces += 1
+
+    def close(self):
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+def describe_for_trace(description) -> str:
+    """Short, JSON-safe rendering of a sense description for span args"""
+    if isinstance(description, str):
+        return description if len(description) <= 200 else description[:197] + "..."
+    shape = getattr(description, 'shape', None)
+    return f"array{tuple(shape)}" if shape is not None else type(description).__name__
@@ -0,0 +1,328 @@
+"""
+Similarity search over integrated experiences for SensoryAI
+Fixed-length feature vectors, a k-nearest-neighbour index over them and
+online clustering into recurring situations
+"""
+
+from array import array
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+SENSES = ('vision', 'hearing', 'touch', 'smell', 'taste')
+
+# Quality labels per sense; a label is on when it equals the input's quality
+# or is one of its words (touch qualities read "<texture> <temperature>")
+QUALITY_LABELS = {
+    'vision': ('simple scene', 'moderate detail', 'complex scene'),
+    'hearing': ('low frequency', 'medium frequency', 'high frequency'),
+    'touch': ('smooth', 'rough', 'soft', 'hard', 'hot', 'warm', 'cool', 'cold'),
+    'smell': ('pleasant', 'unpleasant', 'neutral', 'strong'),
+    'taste': ('sweet', 'sour', 'salty', 'bitter', 'umami', 'neutral')
+}
+
+def _layout() -> Dict[Tuple[str, str], int]:
+    columns = {}
+    for sense in SENSES:
+        columns[('intensity', sense)] = len(columns)
+    for sense in SENSES:
+        for label in QUALITY_LABELS[sense]:
+            columns[(sense, label)] = len(columns)
+    for sense in SENSES:
+        columns[('dominant', sense)] = len(columns)
+    columns[('overall', 'intensity')] = len(columns)
+    return columns
+
+# Feature name -> column, and the resulting vector length
+FEATURES = _layout()
+DIMENSIONS = len(FEATURES)
+
+@dataclass
+class SimilarExperience:
+    """One search hit: an integrated experience and its distance from the query"""
+    position: int             # position in the brain's integration log
+    distance: float           # Euclidean distance between feature vectors
+    experience: Dict[str, Any]
+
+def encode_experience(integrated: Dict[str, Any]) -> np.ndarray:
+    """Feature vector of an integrated experience
+
+    Per-sense intensity and one-hot quality come from each sense's latest
+    input; experiences integrated without their inputs (under a latency
+    budget) only carry the dominant sense and overall intensity.
+    """
+    vector = np.zeros(DIMENSIONS, dtype=np.float32)
+    for sense, inputs in integrated.get('sensory_inputs', {}).items():
+        if not inputs or sense not in QUALITY_LABELS:
+            continue
+        latest = inputs[-1]
+        vector[FEATURES[('intensity', sense)]] = latest.intensity
+        words = latest.quality.split()
+        for label in QUALITY_LABELS[sense]:
+            if label == latest.quality or label in words:
+                vector[FEATURES[(sense, label)]] = 1.0
+    column = FEATURES.get(('dominant', integrated.get('dominant_sense')))
+    if column is not None:
+        vector[column] = 1.0
+    vector[FEATURES[('overall', 'intensity')]] = integrated.get('overall_intensity', 0.0)
+    return vector
+
+class SimilarityIndex:
+    """Exact k-NN by vectorized brute force, switching to an IVF index when large
+
+    Vectors live in one growable float32 matrix with their squared norms,
+    so a brute-force query is a single matrix-vector product.  Once the
+    index holds ivf_threshold vectors it trains k-means centroids on a
+    sample and files every vector under its nearest centroid; a query then
+    only scans the lists of the nprobe centroids nearest to it, trading a
+    little recall for cost proportional to N / lists.  Centroids are
+    retrained whenever the index has doubled since the last training.
+    """
+
+    def __init__(self, dimensions: int = DIMENSIONS, ivf_threshold: int = 50_000,
+                 nprobe: int = 8, seed: int = 0):
+        self.dimensions = dimensions
+        self.ivf_threshold = ivf_threshold
+        self.nprobe = nprobe
+        self.seed = seed
+        self._vectors = np.empty((1024, dimensions), dtype=np.float32)
+        self._norms = np.empty(1024, dtype=np.float32)
+        self.count = 0
+        self.centroids: Optional[np.ndarray] = None
+        self._lists: List[array] = []  # per centroid: positions filed under it
+        self._trained_at = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    @property
+    def vectors(self) -> np.ndarray:
+        return self._vectors[:self.count]
+
+    def add(self, vectors: np.ndarray):
+        """Append a batch of vectors (one per row)"""
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(-1, self.dimensions)
+        start, stop = self.count, self.count + len(vectors)
+        if stop > len(self._vectors):
+            capacity = max(stop, 2 * len(self._vectors))
+            grown = np.empty((capacity, self.dimensions), dtype=np.float32)
+            grown[:start] = self._vectors[:start]
+            self._vectors = grown
+            norms = np.empty(capacity, dtype=np.float32)
+            norms[:start] = self._norms[:start]
+            self._norms = norms
+        self._vectors[start:stop] = vectors
+        self._norms[start:stop] = np.einsum('ij,ij->i', vectors, vectors)
+        self.count = stop
+
+        if stop >= self.ivf_threshold and stop >= 2 * self._trained_at:
+            self._train()
+        elif self.centroids is not None:
+            self._file(np.arange(start, stop))
+
+    def _train(self, iterations: int = 10):
+        """Fit k-means centroids on a sample and refile every vector"""
+        rng = np.random.default_rng(self.seed)
+        lists = max(1, int(np.sqrt(self.count)))
+        sample = self.vectors[rng.choice(self.count, min(self.count, 32 * lists), replace=False)]
+        centroids = sample[rng.choice(len(sample), lists, replace=False)].copy()
+        for _ in range(iterations):
+            labels = self._nearest(sample, centroids)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, sample)
+            counts = np.bincount(labels, minlength=lists)
+            filled = counts > 0  # empty clusters keep their previous centroid
+            centroids[filled] = sums[filled] / counts[filled, None]
+        self.centroids = centroids
+        self._lists = [array('q') for _ in range(lists)]
+        self._trained_at = self.count
+        self._file(np.arange(self.count))
+
+    @staticmethod
+    def _nearest(vectors: np.ndarray, centroids: np.ndarray, chunk: int = 65536) -> np.ndarray:
+        """Index of the nearest centroid for each vector, in bounded-memory chunks"""
+        centroid_norms = np.einsum('ij,ij->i', centroids, centroids)
+        labels = np.empty(len(vectors), dtype=np.int64)
+        for begin in range(0, len(vectors), chunk):
+            block = vectors[begin:begin + chunk]
+            labels[begin:begin + chunk] = np.argmin(centroid_norms - 2.0 * block @ centroids.T, axis=1)
+        return labels
+
+    def _file(self, positions: np.ndarray):
+        labels = self._nearest(self._vectors[positions], self.centroids)
+        order = np.argsort(labels, kind='stable')
+        labels, positions = labels[order], positions[order]
+        bounds = np.flatnonzero(np.diff(labels)) + 1
+        for group in np.split(np.arange(len(labels)), bounds):
+            if len(group):
+                self._lists[labels[group[0]]].frombytes(positions[group].astype(np.int64).tobytes())
+
+    def _candidates(self, query: np.ndarray) -> Optional[np.ndarray]:
+        """Positions worth scanning for a query: all, or the nearest IVF lists"""
+        if self.centroids is None:
+            return None
+        distances = np.einsum('ij,ij->i', self.centroids, self.centroids) - 2.0 * self.centroids @ query
+        probe = np.argsort(distances)[:self.nprobe]
+        return np.concatenate([np.frombuffer(self._lists[c], dtype=np.int64) for c in probe])
+
+    def search(self, query: np.ndarray, k: int = 5,
+               exclude: Optional[int] = None) -> List[Tuple[int, float]]:
+        """The k nearest stored vectors as (position, distance), nearest first"""
+        query = np.asarray(query, dtype=np.float32).reshape(self.dimensions)
+        candidates = self._candidates(query)
+        if candidates is None:
+            vectors, norms = self.vectors, self._norms[:self.count]
+        else:
+            vectors, norms = self._vectors[candidates], self._norms[candidates]
+        squared = norms - 2.0 * (vectors @ query) + float(query @ query)
+        if exclude is not None:
+            mask = (np.arange(self.count) if candidates is None else candidates) == exclude
+            squared[mask] = np.inf
+        wanted = min(k, len(squared))
+        if wanted <= 0:
+            return []
+        nearest = np.argpartition(squared, wanted - 1)[:wanted]
+        nearest = nearest[np.argsort(squared[nearest], kind='stable')]
+        nearest = nearest[np.isfinite(squared[nearest])]
+        positions = nearest if candidates is None else candidates[nearest]
+        # Recompute the few winners directly, free of the norm expansion's rounding
+        distances = np.linalg.norm(self._vectors[positions] - query, axis=1)
+        return [(int(position), float(distance)) for position, distance in zip(positions, distances)]
+
+class SituationClusterer:
+    """Online mini-batch k-means that groups experiences into recurring situations
+
+    Each vector is assigned to its nearest centroid at once (O(k*d)) and
+    buffered; every batch_size vectors the centroids move to the running
+    mean of everything assigned to them (Sculley's mini-batch k-means with
+    per-centroid learning rate 1/count), so no update ever rescans the
+    history.  The first batch initializes the centroids by k-means++ and a
+    few Lloyd iterations; until then distinct vectors seed provisional
+    situations, so the ids handed out for that first batch may not match
+    the clusters that follow.  While there are fewer than k situations,
+    new distinct vectors keep seeding them, and a situation left empty
+    after a flush is reseeded from the batch vector farthest from every
+    centroid, so a monotonous start doesn't cap the number of situations.
+    """
+
+    def __init__(self, k: int = 8, batch_size: int = 32, dimensions: int = DIMENSIONS,
+                 seed: int = 0):
+        if k < 1 or batch_size < k:
+            raise ValueError("k must be positive and batch_size at least k")
+        self.k = k
+        self.batch_size = batch_size
+        self.dimensions = dimensions
+        self.seed = seed
+        self.centroids = np.empty((0, dimensions), dtype=np.float64)
+        self.counts = np.empty(0, dtype=np.int64)  # vectors folded into each centroid
+        self.initialized = False
+        self._batch = np.empty((batch_size, dimensions), dtype=np.float64)
+        self._labels = np.empty(batch_size, dtype=np.int64)
+        self._pending = 0
+
+    def __len__(self) -> int:
+        return len(self.centroids)
+
+    def assign(self, vector: np.ndarray) -> int:
+        """Nearest situation for a vector, without learning from it"""
+        if not len(self.centroids):
+            raise ValueError("No situations learned yet")
+        return int(np.argmin(((self.centroids - vector) ** 2).sum(axis=1)))
+
+    def observe(self, vector: np.ndarray) -> int:
+        """Assign a vector to a situation and learn from it"""
+        vector = np.asarray(vector, dtype=np.float64).reshape(self.dimensions)
+        distances = ((self.centroids - vector) ** 2).sum(axis=1)
+        if len(self.centroids) < self.k and (not len(distances) or distances.min() > 1e-12):
+            self.centroids = np.vstack([self.centroids, vector])
+            self.counts = np.append(self.counts, 0)
+            label = len(self.centroids) - 1
+        else:
+            label = int(np.argmin(distances))
+        self._batch[self._pending] = vector
+        self._labels[self._pending] = label
+        self._pending += 1
+        if self._pending == self.batch_size:
+            self.flush()
+        return label
+
+    def flush(self):
+        """Fold the buffered vectors into the centroids"""
+        if not self._pending:
+            return
+        labels, batch = self._labels[:self._pending], self._batch[:self._pending]
+        if not self.initialized:
+            self._initialize(batch)
+        else:
+            sums = np.zeros_like(self.centroids)
+            np.add.at(sums, labels, batch)
+            added = np.bincount(labels, minlength=len(self.centroids))
+            moved = added > 0
+            total = self.counts[moved] + added[moved]
+            self.centroids[moved] = (self.centroids[moved] * self.counts[moved, None]
+                                     + sums[moved]) / total[:, None]
+            self.counts[moved] = total
+        self._reseed(batch)
+        self._pending = 0
+
+    def _reseed(self, batch: np.ndarray):
+        """Move empty situations onto the batch vectors farthest from every centroid"""
+        empty = np.flatnonzero(self.counts == 0)
+        if not len(empty):
+            return
+        spread = ((batch[:, None, :] - self.centroids[None]) ** 2).sum(axis=2).min(axis=1)
+        for cluster, farthest in zip(empty, np.argsort(spread)[::-1]):
+            if spread[farthest] <= 1e-12:
+                break
+            self.centroids[cluster] = batch[farthest]
+            spread = np.minimum(spread, ((batch - batch[farthest]) ** 2).sum(axis=1))
+
+    def _initialize(self, batch: np.ndarray, iterations: int = 10):
+        """k-means++ seeding and Lloyd iterations on the first batch"""
+        rng = np.random.default_rng(self.seed)
+        centroids = [batch[rng.integers(len(batch))]]
+        for _ in range(len(self.centroids) - 1):  # as many as there are distinct vectors
+            distances = np.min([((batch - c) ** 2).sum(axis=1) for c in centroids], axis=0)
+            if not distances.sum():
+                break
+            centroids.append(batch[rng.choice(len(batch), p=distances / distances.sum())])
+        centroids = np.array(centroids)
+        for _ in range(iterations):
+            labels = np.argmin(((batch[:, None, :] - centroids[None]) ** 2).sum(axis=2), axis=1)
+            counts = np.bincount(labels, minlength=len(centroids))
+            for cluster in np.flatnonzero(counts):
+                centroids[cluster] = batch[labels == cluster].mean(axis=0)
+        self.centroids, self.counts = centroids, counts.astype(np.int64)
+        self.initialized = True
+
+    def copy(self) -> 'SituationClusterer':
+        return SituationClusterer.from_dict(self.to_dict())
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-safe centroids, counts and the vectors still buffered for the next flush"""
+        return {
+            'k': self.k,
+            'batch_size': self.batch_size,
+            'dimensions': self.dimensions,
+            'seed': self.seed,
+            'centroids': self.centroids.tolist(),
+            'counts': self.counts.tolist(),
+            'initialized': self.initialized,
+            'pending': self._batch[:self._pending].tolist(),
+            'labels': self._labels[:self._pending].tolist()
+        }
+
+    @classmethod
+    def from_dict(cls, state: Dict[str, Any]) -> 'SituationClusterer':
+        clusterer = cls(state['k'], state['batch_size'], state['dimensions'], state['seed'])
+        if state['centroids']:
+            clusterer.centroids = np.asarray(state['centroids'], dtype=np.float64)
+            clusterer.counts = np.asarray(state['counts'], dtype=np.int64)
+        clusterer.initialized = state.get('initialized', bool(state['centroids']))
+        pending = state.get('pending', [])
+        clusterer._pending = len(pending)
+        if pending:
+            clusterer._batch[:len(pending)] = pending
+            clusterer._labels[:len(pending)] = state['labels']
+        return clusterer
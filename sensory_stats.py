@@ -0,0 +1,245 @@
+"""
+Mergeable streaming statistics for the SensoryAI system
+Per-sense intensity distributions and keyword hit sketches that combine
+across agents and processes
+"""
+
+import hashlib
+import math
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+class IntensityDistribution:
+    """Fixed-bin histogram of intensities in [0, 1] with running moments
+
+    Values are rounded to the nearest of BINS + 1 evenly spaced bins, so
+    percentiles are reported within half a bin (0.0005) and two
+    distributions merge exactly by adding bin counts.  Mean and variance
+    are kept with Welford's update and combined with Chan's parallel
+    formula, so distributions from many agents or worker processes fold
+    into one fleet-wide view without any raw values.
+    """
+
+    BINS = 1000
+
+    def __init__(self):
+        self.bins: Dict[int, int] = {}  # sparse: bin index -> count
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self._summary = None  # (count, summary) of the last summary() call
+
+    def record(self, value: float):
+        """Add one observation"""
+        index = min(self.BINS, max(0, int(value * self.BINS + 0.5)))
+        self.bins[index] = self.bins.get(index, 0) + 1
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other: 'IntensityDistribution'):
+        """Add another distribution's observations into this one"""
+        if not other.count:
+            return
+        for index, count in other.bins.items():
+            self.bins[index] = self.bins.get(index, 0) + count
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self._m2 += other._m2 + delta * delta * self.count * other.count / total
+        self.mean += delta * other.count / total
+        self.count = total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def copy(self) -> 'IntensityDistribution':
+        duplicate = IntensityDistribution()
+        duplicate.merge(self)
+        return duplicate
+
+    @property
+    def variance(self) -> float:
+        return self._m2 / self.count if self.count else 0.0
+
+    def percentile(self, p: float) -> float:
+        """Value of the p-th percentile (0-100), to within half a bin"""
+        return self.percentiles((p,))[0]
+
+    def percentiles(self, ps: Iterable[float]) -> List[float]:
+        """Several percentiles (ascending) in one pass over the bins"""
+        ps = list(ps)
+        if not self.count:
+            return [0.0] * len(ps)
+        results = []
+        ranks = iter(max(1, int(math.ceil(p / 100.0 * self.count))) for p in ps)
+        rank = next(ranks, None)
+        seen = 0
+        for index in sorted(self.bins):
+            seen += self.bins[index]
+            while rank is not None and seen >= rank:
+                results.append(min(self.max, max(self.min, index / self.BINS)))
+                rank = next(ranks, None)
+            if rank is None:
+                break
+        return results + [self.max] * (len(ps) - len(results))
+
+    def summary(self) -> Dict[str, float]:
+        """Count, mean, variance, percentiles and extremes"""
+        if self._summary is not None and self._summary[0] == self.count:
+            return dict(self._summary[1])
+        p50, p90, p99 = self.percentiles((50, 90, 99))
+        summary = {
+            'count': self.count,
+            'mean': self.mean,
+            'variance': self.variance,
+            'p50': p50,
+            'p90': p90,
+            'p99': p99,
+            'min': self.min if self.count else 0.0,
+            'max': self.max if self.count else 0.0
+        }
+        self._summary = (self.count, summary)
+        return dict(summary)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-safe state, for shipping distributions between processes"""
+        return {
+            'bins': sorted(self.bins.items()),
+            'count': self.count,
+            'mean': self.mean,
+            'm2': self._m2,
+            'min': self.min if self.count else None,
+            'max': self.max if self.count else None
+        }
+
+    @classmethod
+    def from_dict(cls, state: Dict[str, Any]) -> 'IntensityDistribution':
+        distribution = cls()
+        distribution.bins = {int(index): count for index, count in state['bins']}
+        distribution.count = state['count']
+        distribution.mean = state['mean']
+        distribution._m2 = state['m2']
+        if distribution.count:
+            distribution.min = state['min']
+            distribution.max = state['max']
+        return distribution
+
+def merge_intensity_stats(stats: Iterable[Dict[str, IntensityDistribution]]) -> Dict[str, IntensityDistribution]:
+    """Combine per-sense distributions from several agents into new ones"""
+    merged: Dict[str, IntensityDistribution] = {}
+    for per_sense in stats:
+        for sense, distribution in per_sense.items():
+            merged.setdefault(sense, IntensityDistribution()).merge(distribution)
+    return merged
+
+class KeywordSketch:
+    """Count-min sketch of keyword hits with top-k heavy-hitter tracking
+
+    Memory is fixed at depth x width counters plus top_k candidates however
+    many distinct keys are seen.  Estimates never undercount and overcount
+    by at most about e/width of the total hits with probability 1 - e^-depth.
+    Hashing is seeded and process-independent, so sketches built by
+    different workers with the same shape merge by adding their tables.
+    """
+
+    def __init__(self, width: int = 2048, depth: int = 4, top_k: int = 50, seed: int = 0):
+        if width < 1 or depth < 1 or top_k < 1:
+            raise ValueError("Sketch width, depth and top_k must be positive")
+        self.width = width
+        self.depth = depth
+        self.top_k = top_k
+        self.seed = seed
+        self.table = [[0] * width for _ in range(depth)]
+        self.total = 0
+        self.top: Dict[str, int] = {}  # heavy-hitter candidates -> estimated count
+        self._columns: Dict[str, List[int]] = {}  # bounded cache of hashed columns
+
+    def _columns_for(self, key: str) -> List[int]:
+        columns = self._columns.get(key)
+        if columns is None:
+            digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16,
+                                     salt=self.seed.to_bytes(8, 'little')).digest()
+            first = int.from_bytes(digest[:8], 'little')
+            second = int.from_bytes(digest[8:], 'little') | 1
+            # Kirsch-Mitzenmacher: derive every row's hash from two
+            columns = [(first + row * second) % self.width for row in range(self.depth)]
+            if len(self._columns) >= 4096:
+                self._columns.clear()
+            self._columns[key] = columns
+        return columns
+
+    def add(self, key: str, count: int = 1):
+        """Count hits for a key and update the heavy hitters"""
+        estimate = None
+        for row, column in zip(self.table, self._columns_for(key)):
+            row[column] += count
+            if estimate is None or row[column] < estimate:
+                estimate = row[column]
+        self.total += count
+        self._offer(key, estimate)
+
+    def _offer(self, key: str, estimate: int):
+        top = self.top
+        if key in top or len(top) < self.top_k:
+            top[key] = estimate
+            return
+        smallest = min(top, key=top.get)
+        if estimate > top[smallest]:
+            del top[smallest]
+            top[key] = estimate
+
+    def estimate(self, key: str) -> int:
+        """Upper-bound estimate of a key's hit count"""
+        return min(row[column] for row, column in zip(self.table, self._columns_for(key)))
+
+    def heavy_hitters(self, n: Optional[int] = None) -> List[Tuple[str, int]]:
+        """Most frequent keys with their estimated counts, highest first"""
+        ranked = sorted(((key, self.estimate(key)) for key in self.top),
+                        key=lambda item: (-item[1], item[0]))
+        return ranked[:n] if n is not None else ranked
+
+    def merge(self, other: 'KeywordSketch'):
+        """Add another sketch's hits into this one (shapes and seeds must match)"""
+        if (other.width, other.depth, other.seed) != (self.width, self.depth, self.seed):
+            raise ValueError("Only sketches with the same width, depth and seed can be merged")
+        for row, other_row in zip(self.table, other.table):
+            for column, count in enumerate(other_row):
+                if count:
+                    row[column] += count
+        self.total += other.total
+        candidates = set(self.top) | set(other.top)
+        self.top = {}
+        for key in candidates:
+            self._offer(key, self.estimate(key))
+
+    def copy(self) -> 'KeywordSketch':
+        return KeywordSketch.from_dict(self.to_dict())
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-safe state, for exporting or shipping sketches between workers"""
+        return {
+            'width': self.width,
+            'depth': self.depth,
+            'top_k': self.top_k,
+            'seed': self.seed,
+            'total': self.total,
+            # Sparse rows: a keyword vocabulary fills only a few columns
+            'table': [[[column, count] for column, count in enumerate(row) if count]
+                      for row in self.table],
+            'top': dict(self.top)
+        }
+
+    @classmethod
+    def from_dict(cls, state: Dict[str, Any]) -> 'KeywordSketch':
+        sketch = cls(state['width'], state['depth'], state['top_k'], state['seed'])
+        for row, counts in zip(sketch.table, state['table']):
+            for column, count in counts:
+                row[column] = count
+        sketch.total = state['total']
+        sketch.top = dict(state['top'])
+        return sketch
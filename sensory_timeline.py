@@ -0,0 +1,311 @@
+"""
+Multi-resolution intensity timeline for SensoryAI
+Downsampled views of overall intensity over long experience histories
+"""
+
+import bisect
+from array import array
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+
+# Each level's buckets summarise FANOUT buckets of the level below
+FANOUT = 8
+
+@dataclass
+class TimelineSeries:
+    """A downsampled stretch of the timeline, one row per bucket or point"""
+    time: List[float]
+    low: List[float]
+    high: List[float]
+    mean: List[float]
+    bucket_size: int  # raw points per row (1 means raw data)
+    points: int       # raw points in the requested range
+
+class _Level:
+    """Min/max/mean buckets of a fixed number of raw points"""
+
+    def __init__(self, size: int):
+        self.size = size
+        self.start = array('d')
+        self.low = array('d')
+        self.high = array('d')
+        self.total = array('d')
+        self.count = array('L')
+
+    @classmethod
+    def from_points(cls, times: Sequence[float], values: Sequence[float], size: int) -> '_Level':
+        level = cls(size)
+        for begin in range(0, len(times), size):
+            chunk = values[begin:begin + size]
+            level.start.append(times[begin])
+            level.low.append(min(chunk))
+            level.high.append(max(chunk))
+            level.total.append(sum(chunk))
+            level.count.append(len(chunk))
+        return level
+
+    def add(self, index: int, timestamp: float, value: float):
+        """Fold in raw point number `index`"""
+        if index % self.size == 0:
+            self.start.append(timestamp)
+            self.low.append(value)
+            self.high.append(value)
+            self.total.append(value)
+            self.count.append(1)
+        else:
+            if value < self.low[-1]:
+                self.low[-1] = value
+            if value > self.high[-1]:
+                self.high[-1] = value
+            self.total[-1] += value
+            self.count[-1] += 1
+
+    @classmethod
+    def from_level(cls, finer: '_Level', size: int) -> '_Level':
+        """Buckets of `size` points built from the complete level below"""
+        level = cls(size)
+        for begin in range(0, len(finer.start), FANOUT):
+            level.start.append(finer.start[begin])
+            level.low.append(min(finer.low[begin:begin + FANOUT]))
+            level.high.append(max(finer.high[begin:begin + FANOUT]))
+            level.total.append(sum(finer.total[begin:begin + FANOUT]))
+            level.count.append(sum(finer.count[begin:begin + FANOUT]))
+        return level
+
+    def copy(self) -> '_Level':
+        level = _Level(self.size)
+        for name in ('start', 'low', 'high', 'total', 'count'):
+            setattr(level, name, getattr(self, name)[:])
+        return level
+
+    def head(self, length: int, finer: Optional['_Level'],
+             recent: Sequence[float]) -> '_Level':
+        """Copy of the buckets covering the first `length` raw points
+
+        The last bucket may have taken in points past `length` since, so it
+        is rebuilt from the level below (already cut to `length`), or for
+        the finest level from the `recent` raw values it covers.
+        """
+        buckets = (length - 1) // self.size + 1
+        level = _Level(self.size)
+        for name in ('start', 'low', 'high', 'total', 'count'):
+            setattr(level, name, getattr(self, name)[:buckets])
+        if finer is None:
+            level.low[-1], level.high[-1] = min(recent), max(recent)
+            level.total[-1], level.count[-1] = sum(recent), len(recent)
+        else:
+            first = (buckets - 1) * FANOUT
+            level.low[-1], level.high[-1] = min(finer.low[first:]), max(finer.high[first:])
+            level.total[-1], level.count[-1] = sum(finer.total[first:]), sum(finer.count[first:])
+        return level
+
+class IntensityTimeline:
+    """Overall intensity over time with precomputed coarser levels
+
+    Raw points are kept in compact arrays; level k summarises FANOUT**k
+    points per bucket and is updated as each point arrives, costing
+    O(levels) per point.  A query picks the finest level that fits the
+    requested number of rows for the visible range, so zooming into a
+    narrow range returns detail and a wide range stays cheap to draw.
+    Timestamps are assumed not to go backwards; earlier ones are clamped.
+
+    compact() drops old raw points once their buckets are complete; the
+    levels keep summarising them, so queries reaching into the compacted
+    stretch are answered in whole buckets of at least FANOUT points.
+
+    fork() is O(1): the child only remembers how many of the source's
+    points it has, plus the few raw points of its last finest bucket, and
+    copies the rest on its first append or query.  The source keeps
+    appending and compacting, which never changes buckets the child needs.
+    """
+
+    def __init__(self):
+        self.times = array('d')   # raw points from number _dropped on
+        self.values = array('d')
+        self.levels = []
+        self._dropped = 0  # raw points folded into the levels only
+        self._source: Optional['IntensityTimeline'] = None  # set on forks until first use
+        self._length = 0
+        self._recent = None  # a fork's raw (times, values) in its last finest bucket
+
+    def __len__(self) -> int:
+        return self._length if self._source is not None else self._dropped + len(self.times)
+
+    def _materialize(self):
+        source, length, recent = self._source, self._length, self._recent
+        self._source = self._recent = None
+        if source._dropped <= length - len(recent[0]):
+            self._dropped = source._dropped
+            self.times = source.times[:length - source._dropped]
+            self.values = source.values[:length - source._dropped]
+        else:
+            self._dropped = length - len(recent[0])
+            self.times, self.values = array('d', recent[0]), array('d', recent[1])
+        # Level k exists once there are more than its bucket size of points
+        self.levels = []
+        finer = None
+        for level in source.levels:
+            if level.size >= length:
+                break
+            finer = level.head(length, finer, recent[1])
+            self.levels.append(finer)
+
+    def append(self, timestamp: float, value: float):
+        if self._source is not None:
+            self._materialize()
+        if self.times and timestamp < self.times[-1]:
+            timestamp = self.times[-1]
+        index = len(self)
+        self.times.append(timestamp)
+        self.values.append(value)
+        for level in self.levels:
+            level.add(index, timestamp, value)
+        size = FANOUT ** (len(self.levels) + 1)
+        if index + 1 > size:
+            self.levels.append(_Level.from_level(self.levels[-1], size) if self.levels
+                               else _Level.from_points(self.times, self.values, size))
+
+    def extend(self, points):
+        for timestamp, value in points:
+            self.append(timestamp, value)
+
+    def fork(self) -> 'IntensityTimeline':
+        """O(1) copy that takes this timeline's points when first used"""
+        timeline = IntensityTimeline()
+        if self._source is not None:
+            timeline._source, timeline._length = self._source, self._length
+            timeline._recent = self._recent
+        else:
+            length = len(self)
+            recent = (length - 1) // FANOUT * FANOUT - self._dropped if length else 0
+            timeline._source, timeline._length = self, length
+            timeline._recent = (self.times[recent:].tolist(), self.values[recent:].tolist())
+        return timeline
+
+    def copy(self) -> 'IntensityTimeline':
+        if self._source is not None:
+            self._materialize()
+        timeline = IntensityTimeline()
+        timeline.times = self.times[:]
+        timeline.values = self.values[:]
+        timeline.levels = [level.copy() for level in self.levels]
+        timeline._dropped = self._dropped
+        return timeline
+
+    def compact(self, before: int):
+        """Drop the raw points numbered below `before`, keeping them in the levels
+
+        Only whole finest buckets go, and the last point always stays.
+        """
+        if self._source is not None:
+            self._materialize()
+        if not self.levels:
+            return
+        drop = min(before, len(self) - 1) // FANOUT * FANOUT - self._dropped
+        if drop > 0:
+            self.times = self.times[drop:]  # new arrays; unmaterialized forks read the old
+            self.values = self.values[drop:]
+            self._dropped += drop
+
+    def span(self) -> Optional[Tuple[float, float]]:
+        """First and last timestamps, or None when empty"""
+        if self._source is not None:
+            self._materialize()
+        if not self.times:
+            return None
+        return (self.levels[0].start[0] if self._dropped else self.times[0], self.times[-1])
+
+    def query(self, start: Optional[float] = None, end: Optional[float] = None,
+              max_points: int = 1000, method: str = "minmax") -> TimelineSeries:
+        """Points between start and end (inclusive), downsampled to max_points rows
+
+        "minmax" returns per-bucket low/high/mean, which keeps every spike
+        visible; "lttb" returns max_points representative points chosen by
+        Largest-Triangle-Three-Buckets from the next finer level.
+        """
+        if max_points < 3:
+            raise ValueError("max_points must be at least 3")
+        if method not in ("minmax", "lttb"):
+            raise ValueError(f"Unknown downsampling method: {method}")
+        if self._source is not None:
+            self._materialize()
+        first = self._index(start, bisect.bisect_left, 0)
+        last = self._index(end, bisect.bisect_right, len(self))
+        points = max(0, last - first)
+        if not points:
+            return TimelineSeries([], [], [], [], 1, 0)
+        raw = first >= self._dropped
+        if raw and (points <= max_points or not self.levels):
+            times = self.times[first - self._dropped:last - self._dropped].tolist()
+            values = self.values[first - self._dropped:last - self._dropped].tolist()
+            return TimelineSeries(times, values, values, values, 1, points)
+
+        # LTTB picks from finer rows than it returns, but far fewer than raw points
+        rows_wanted = max_points * FANOUT if method == "lttb" else max_points
+        if raw and method == "lttb" and points <= rows_wanted:
+            times, values = lttb(self.times[first - self._dropped:last - self._dropped],
+                                 self.values[first - self._dropped:last - self._dropped],
+                                 max_points)
+            return TimelineSeries(times, values, values, values, 1, points)
+        chosen = self.levels[-1]
+        for level in self.levels:
+            if (last - 1) // level.size - first // level.size + 1 <= rows_wanted:
+                chosen = level
+                break
+        begin, stop = first // chosen.size, (last - 1) // chosen.size + 1
+        times = chosen.start[begin:stop].tolist()
+        low = chosen.low[begin:stop].tolist()
+        high = chosen.high[begin:stop].tolist()
+        mean = [total / count for total, count in
+                zip(chosen.total[begin:stop], chosen.count[begin:stop])]
+        if method == "lttb":
+            times, mean = lttb(times, mean, max_points)
+            return TimelineSeries(times, mean, mean, mean, chosen.size, points)
+        return TimelineSeries(times, low, high, mean, chosen.size, points)
+
+    def _index(self, timestamp: Optional[float], search, default: int) -> int:
+        """Number of the raw point a range bound falls on; whole buckets once compacted"""
+        if timestamp is None:
+            return default
+        if self._dropped and timestamp < self.times[0]:
+            return min(search(self.levels[0].start, timestamp) * FANOUT, self._dropped)
+        return self._dropped + search(self.times, timestamp)
+
+def lttb(times: Sequence[float], values: Sequence[float],
+         threshold: int) -> Tuple[List[float], List[float]]:
+    """Largest-Triangle-Three-Buckets downsampling to `threshold` points
+
+    Keeps the first and last points and, from each bucket in between, the
+    point forming the largest triangle with the previous pick and the
+    next bucket's average, which preserves the visual shape of the line.
+    """
+    n = len(times)
+    if threshold >= n or threshold < 3:
+        return list(times), list(values)
+    sampled_times, sampled_values = [times[0]], [values[0]]
+    every = (n - 2) / (threshold - 2)
+    previous = 0
+    for bucket in range(threshold - 2):
+        begin = int(bucket * every) + 1
+        stop = int((bucket + 1) * every) + 1
+        # Average of the next bucket (or the last point for the final bucket)
+        next_begin, next_stop = stop, min(int((bucket + 2) * every) + 1, n)
+        if next_begin >= next_stop:
+            next_begin, next_stop = n - 1, n
+        count = next_stop - next_begin
+        average_time = sum(times[next_begin:next_stop]) / count
+        average_value = sum(values[next_begin:next_stop]) / count
+
+        previous_time, previous_value = times[previous], values[previous]
+        best, best_area = begin, -1.0
+        for index in range(begin, stop):
+            area = abs((previous_time - average_time) * (values[index] - previous_value)
+                       - (previous_time - times[index]) * (average_value - previous_value))
+            if area > best_area:
+                best, best_area = index, area
+        sampled_times.append(times[best])
+        sampled_values.append(values[best])
+        previous = best
+    sampled_times.append(times[-1])
+    sampled_values.append(values[-1])
+    return sampled_times, sampled_values
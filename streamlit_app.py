@@ -1,10 +1,9 @@
+import os
+import threading
+from datetime import date, datetime, time, timedelta
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from datetime import datetime
-import json
 from sensory_ai import SensoryAI
+from sensory_corpus import PRESETS
 
 # Page configuration
 st.set_page_config(
@@ -51,12 +50,65 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+# Shared mode (SENSORY_SHARED_AGENT=1): every browser session talks to one
+# agent instead of getting its own, and the statistics and history panels
+# refresh on their own every few seconds to show other viewers' experiences
+SHARED_AGENT = os.environ.get("SENSORY_SHARED_AGENT") == "1"
+PANEL_REFRESH_SECONDS = float(os.environ.get("SENSORY_PANEL_REFRESH", "5"))
+
+@st.cache_resource
+def get_shared_agent():
+    """One agent and the lock guarding it, shared by all sessions"""
+    ai = SensoryAI("StreamlitAI", verbose=False)
+    ai.wake_up()
+    return ai, threading.RLock()
+
+def get_agent():
+    """The agent this session uses and the lock to hold while using it"""
+    if SHARED_AGENT:
+        return get_shared_agent()
+    return st.session_state.ai, st.session_state.ai_lock
+
+def fragment(run_every=None):
+    """Rerun a panel on its own (Streamlit 1.37+); a plain function on older versions"""
+    decorator = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None)
+    if decorator is None:
+        return lambda func: func
+    return decorator(run_every=run_every)
+
 # Initialize session state
-if 'ai' not in st.session_state:
-    st.session_state.ai = SensoryAI("StreamlitAI")
-    st.session_state.ai.wake_up()
+if 'experience_history' not in st.session_state:
+    if not SHARED_AGENT:
+        st.session_state.ai = SensoryAI("StreamlitAI")
+        st.session_state.ai.wake_up()
+        st.session_state.ai_lock = threading.RLock()
     st.session_state.experience_history = []
 
+@st.cache_data
+def preset_catalogue():
+    """Preset names with their per-sense descriptions rendered as markdown"""
+    return {name: [f"**{sense.title()}**: {description}" for sense, description in environment.items()]
+            for name, environment in PRESETS.items()}
+
+@st.cache_data
+def preview_preset(name):
+    """What a fresh agent senses in a preset; the analysis is deterministic"""
+    result = SensoryAI("Preview", verbose=False).experience(PRESETS[name])
+    return {
+        'dominant_sense': result['integrated_experience']['dominant_sense'],
+        'experience_quality': result['integrated_experience']['experience_quality'],
+        'senses': [{'Sense': sense.title(), 'Quality': i.quality, 'Intensity': round(i.intensity, 2)}
+                   for sense, i in result['individual_senses'].items()]
+    }
+
+def run_experience(environment):
+    """Have the agent experience an environment and remember it for this session"""
+    ai, lock = get_agent()
+    with lock:
+        result = ai.experience(environment)
+    st.session_state.experience_history.append(result)
+    return result
+
 def create_sensory_input_form():
     """Create form for sensory input"""
     st.markdown("### 🎭 Create Your Environment")
@@ -130,6 +182,10 @@ def display_experience_result(result):
             'Location': input_data.location
         })
     
+    # Charting libraries are imported on first use so pages without charts load fast
+    import pandas as pd
+    import plotly.express as px
+    
     df = pd.DataFrame(sensory_data)
     
     # Create a bar chart for intensity
@@ -153,43 +209,7 @@ def display_experience_result(result):
 
 def display_preset_environments():
     """Display preset environment options"""
-    presets = {
-        "Peaceful Sunrise": {
-            "vision": "Golden sunrise over calm ocean, pink clouds, seagulls flying",
-            "hearing": "Gentle ocean waves, distant seagull calls, soft wind",
-            "touch": "Warm morning sun, cool ocean breeze, soft sand",
-            "smell": "Fresh ocean air, salty breeze, morning dew",
-            "taste": "Clean, fresh morning air"
-        },
-        "Busy City Street": {
-            "vision": "Tall skyscrapers, bright neon lights, busy traffic, people walking",
-            "hearing": "Loud traffic, car horns, people talking, sirens",
-            "touch": "Hard concrete sidewalk, warm city air, vibration from traffic",
-            "smell": "Car exhaust, street food, city air",
-            "taste": "Polluted air, street food aromas"
-        },
-        "Forest Adventure": {
-            "vision": "Tall green trees, dappled sunlight, moss-covered rocks, wildlife",
-            "hearing": "Rustling leaves, bird songs, flowing stream, animal sounds",
-            "touch": "Rough tree bark, soft moss, cool shade, fresh air",
-            "smell": "Pine trees, earth, fresh air, wildflowers",
-            "taste": "Clean forest air, natural freshness"
-        },
-        "Cozy Home": {
-            "vision": "Warm lighting, comfortable furniture, family photos, fireplace",
-            "hearing": "Soft music, gentle conversation, crackling fire, quiet comfort",
-            "touch": "Soft cushions, warm temperature, comfortable fabrics",
-            "smell": "Home cooking, comfort, warmth, family",
-            "taste": "Warm tea, home-cooked meal, comfort"
-        },
-        "Concert Hall": {
-            "vision": "Bright stage lights, musicians, audience, elegant hall",
-            "hearing": "Beautiful music, applause, instruments, acoustics",
-            "touch": "Vibrating bass, warm crowd, excitement, elegant seating",
-            "smell": "Perfume, excitement, venue air, anticipation",
-            "taste": "Excitement, anticipation, elegant atmosphere"
-        }
-    }
+    presets = preset_catalogue()
     
     st.markdown("### 🎯 Preset Environments")
     
@@ -199,21 +219,24 @@ def display_preset_environments():
     )
     
     if selected_preset:
-        preset_data = presets[selected_preset]
-        
         # Display the preset description
         st.markdown(f"**{selected_preset}**")
-        for sense, description in preset_data.items():
-            st.markdown(f"**{sense.title()}**: {description}")
+        st.markdown("  \n".join(presets[selected_preset]))
+        
+        preview = preview_preset(selected_preset)
+        st.caption(f"Expected: {preview['experience_quality']} experience, "
+                   f"dominated by {preview['dominant_sense']}")
+        st.dataframe(preview['senses'], hide_index=True)
         
         if st.button(f"Experience {selected_preset}"):
-            return preset_data
+            return PRESETS[selected_preset]
     
     return None
 
 def display_ai_controls():
     """Display AI control options"""
     st.markdown("### 🧠 AI Controls")
+    ai, lock = get_agent()
     
     col1, col2 = st.columns(2)
     
@@ -222,44 +245,51 @@ def display_ai_controls():
             "Consciousness Level",
             min_value=0.0,
             max_value=1.0,
-            value=st.session_state.ai.brain.consciousness_level,
+            value=ai.brain.consciousness_level,
             step=0.1,
             help="How aware the AI is of its surroundings"
         )
         
         if st.button("Set Consciousness Level"):
-            st.session_state.ai.set_consciousness_level(consciousness)
+            with lock:
+                ai.set_consciousness_level(consciousness)
             st.success(f"Consciousness level set to {consciousness}")
     
     with col2:
         attention_focus = st.selectbox(
             "Attention Focus",
             ["general", "visual", "auditory", "tactile", "olfactory", "gustatory"],
-            index=0 if st.session_state.ai.brain.attention_focus == "general" else 
-                  ["visual", "auditory", "tactile", "olfactory", "gustatory"].index(st.session_state.ai.brain.attention_focus) + 1
+            index=0 if ai.brain.attention_focus == "general" else 
+                  ["visual", "auditory", "tactile", "olfactory", "gustatory"].index(ai.brain.attention_focus) + 1
         )
         
         if st.button("Set Attention Focus"):
-            st.session_state.ai.set_attention_focus(attention_focus)
+            with lock:
+                ai.set_attention_focus(attention_focus)
             st.success(f"Attention focus set to {attention_focus}")
     
     # AI Status
     col1, col2 = st.columns(2)
     with col1:
         if st.button("Wake Up AI"):
-            st.session_state.ai.wake_up()
+            with lock:
+                ai.wake_up()
             st.success("AI is now awake!")
     
     with col2:
         if st.button("Put AI to Sleep"):
-            st.session_state.ai.sleep()
+            with lock:
+                ai.sleep()
             st.success("AI is now sleeping!")
 
+@fragment(run_every=PANEL_REFRESH_SECONDS if SHARED_AGENT else None)
 def display_statistics():
     """Display AI statistics"""
     st.markdown("### 📊 AI Statistics")
     
-    stats = st.session_state.ai.get_sensory_stats()
+    ai, lock = get_agent()
+    with lock:
+        stats = ai.get_sensory_stats()
     
     # Create metrics display
     col1, col2, col3, col4 = st.columns(4)
@@ -285,6 +315,7 @@ def display_statistics():
         'Taste': stats['total_gustatory_experiences']
     }
     
+    import plotly.express as px
     fig_pie = px.pie(
         values=list(experience_data.values()),
         names=list(experience_data.keys()),
@@ -292,32 +323,61 @@ def display_statistics():
     )
     st.plotly_chart(fig_pie, use_container_width=True)
 
+@fragment(run_every=PANEL_REFRESH_SECONDS if SHARED_AGENT else None)
 def display_experience_history():
     """Display experience history"""
     st.markdown("### 📚 Experience History")
     
-    history = st.session_state.ai.get_experience_history()
+    ai, lock = get_agent()
+    with lock:
+        if not ai.get_experience_history():
+            st.info("No experiences recorded yet. Create your first experience!")
+            return
+        senses = ai.history.senses()
     
-    if not history:
-        st.info("No experiences recorded yet. Create your first experience!")
+    # Filters and paging; only the requested page is read from the history
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        sense = st.selectbox("Dominant sense", ["All"] + senses)
+    with col2:
+        page_size = st.selectbox("Experiences per page", [10, 25, 50, 100])
+    with col3:
+        days = st.date_input("Date range", value=(date.today(), date.today())) \
+            if st.checkbox("Filter by date") else ()
+    since = until = None
+    if len(days) == 2:
+        since = datetime.combine(days[0], time.min)
+        until = datetime.combine(days[1] + timedelta(days=1), time.min)
+    
+    page_number = st.session_state.get('history_page', 1)
+    with lock:
+        page = ai.query_history(page_number - 1, page_size, since, until,
+                                None if sense == "All" else sense)
+    if page.total == 0:
+        st.info("No experiences match these filters.")
         return
-    
-    # Create a timeline of experiences
+    if page_number > page.pages:
+        st.session_state.history_page = page.pages
+        with lock:
+            page = ai.query_history(page.pages - 1, page_size, since, until,
+                                    None if sense == "All" else sense)
+    st.number_input(f"Page (of {page.pages}, {page.total} experiences, newest first)",
+                    min_value=1, max_value=page.pages, key='history_page')
+    
+    # Create a timeline of the experiences on this page
     timeline_data = []
-    for i, exp in enumerate(history):
+    for position, exp in zip(page.positions, page.entries):
         integrated = exp['experience']['integrated_experience']
         timeline_data.append({
-            'Experience': f"Experience {i+1}",
+            'Experience': f"Experience {position + 1}",
             'Timestamp': exp['timestamp'],
             'Quality': integrated['experience_quality'],
             'Intensity': integrated['overall_intensity'],
             'Dominant Sense': integrated['dominant_sense']
         })
     
-    df_timeline = pd.DataFrame(timeline_data)
-    
     # Display timeline
-    for _, row in df_timeline.iterrows():
+    for row in timeline_data:
         with st.expander(f"{row['Experience']} - {row['Quality'].title()}"):
             col1, col2, col3 = st.columns(3)
             with col1:
@@ -328,6 +388,48 @@ def display_experience_history():
                 st.metric("Dominant Sense", row['Dominant Sense'].title())
             st.caption(f"Timestamp: {row['Timestamp']}")
 
+@fragment(run_every=PANEL_REFRESH_SECONDS if SHARED_AGENT else None)
+def display_intensity_timeline():
+    """Display overall intensity over time, downsampled to the visible range"""
+    st.markdown("### 📈 Intensity Over Time")
+    
+    ai, lock = get_agent()
+    with lock:
+        span = ai.intensity_span()
+    if span is None:
+        st.info("No experiences recorded yet. Create your first experience!")
+        return
+    
+    first, last = datetime.fromtimestamp(span[0]), datetime.fromtimestamp(span[1])
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        if last > first:
+            visible = st.slider("Visible range", min_value=first, max_value=last,
+                                value=(first, last), format="YYYY-MM-DD HH:mm:ss")
+        else:
+            visible = (first, last)
+    with col2:
+        method = st.radio("Downsampling", ["Min/max", "LTTB"], horizontal=True)
+    
+    # Only the visible range is fetched, at a resolution that fits the chart
+    with lock:
+        series = ai.intensity_timeline(visible[0].timestamp(), visible[1].timestamp(),
+                                       max_points=800, method="lttb" if method == "LTTB" else "minmax")
+    times = [datetime.fromtimestamp(t) for t in series.time]
+    
+    import plotly.graph_objects as go
+    fig = go.Figure()
+    if series.bucket_size > 1 and method == "Min/max":
+        fig.add_trace(go.Scatter(x=times, y=series.high, mode='lines', line=dict(width=0),
+                                 showlegend=False, hoverinfo='skip'))
+        fig.add_trace(go.Scatter(x=times, y=series.low, mode='lines', line=dict(width=0),
+                                 fill='tonexty', name='Min/max range'))
+    fig.add_trace(go.Scatter(x=times, y=series.mean, mode='lines', name='Intensity'))
+    fig.update_layout(yaxis_range=[0, 1], yaxis_title="Overall intensity", height=400)
+    st.plotly_chart(fig, use_container_width=True)
+    st.caption(f"{series.points} experiences in range, "
+               f"{'raw points' if series.bucket_size == 1 else f'{series.bucket_size} per point'}")
+
 def main():
     """Main Streamlit app"""
     
@@ -339,15 +441,18 @@ def main():
     st.sidebar.markdown("## 🎛️ Navigation")
     page = st.sidebar.selectbox(
         "Choose a page:",
-        ["🏠 Create Experience", "🎯 Preset Environments", "🧠 AI Controls", "📊 Statistics", "📚 History"]
+        ["🏠 Create Experience", "🎯 Preset Environments", "🧠 AI Controls", "📊 Statistics", "📈 Timeline", "📚 History"]
     )
     
     # AI Status in sidebar
+    ai, _ = get_agent()
     st.sidebar.markdown("## 🤖 AI Status")
-    status = "🟢 Awake" if st.session_state.ai.is_awake else "🔴 Sleeping"
+    status = "🟢 Awake" if ai.is_awake else "🔴 Sleeping"
     st.sidebar.markdown(f"**Status**: {status}")
-    st.sidebar.markdown(f"**Consciousness**: {st.session_state.ai.brain.consciousness_level:.2f}")
-    st.sidebar.markdown(f"**Attention**: {st.session_state.ai.brain.attention_focus}")
+    st.sidebar.markdown(f"**Consciousness**: {ai.brain.consciousness_level:.2f}")
+    st.sidebar.markdown(f"**Attention**: {ai.brain.attention_focus}")
+    if SHARED_AGENT:
+        st.sidebar.caption("Shared agent: all viewers see the same AI")
     
     # Page routing
     if page == "🏠 Create Experience":
@@ -363,8 +468,7 @@ def main():
             
             if filtered_env:
                 with st.spinner("Processing sensory experience..."):
-                    result = st.session_state.ai.experience(filtered_env)
-                    st.session_state.experience_history.append(result)
+                    result = run_experience(filtered_env)
                 
                 display_experience_result(result)
             else:
@@ -376,8 +480,7 @@ def main():
         preset_result = display_preset_environments()
         if preset_result:
             with st.spinner("Processing preset environment..."):
-                result = st.session_state.ai.experience(preset_result)
-                st.session_state.experience_history.append(result)
+                result = run_experience(preset_result)
             
             display_experience_result(result)
     
@@ -389,6 +492,10 @@ def main():
         st.markdown("## 📊 Statistics")
         display_statistics()
     
+    elif page == "📈 Timeline":
+        st.markdown("## 📈 Intensity Timeline")
+        display_intensity_timeline()
+    
     elif page == "📚 History":
         st.markdown("## 📚 Experience History")
         display_experience_history()
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Performance regression tests for the SensoryAI system
+Checks throughput and allocation budgets against a stored baseline
+
+Timings are normalised by a fixed pure-Python calibration workload so the
+baseline carries across machines.  Set SENSORY_PERF_UPDATE=1 to rewrite the
+baseline after an intended change, SENSORY_PERF_TOLERANCE to loosen the
+allowed slowdown on noisy machines, or SENSORY_PERF_SKIP=1 to skip the module.
+"""
+
+import json
+import os
+import statistics
+import time
+import tracemalloc
+import unittest
+from sensory_ai import SensoryAI, Vision, Hearing, Touch, Smell, Taste
+from sensory_corpus import EnvironmentGenerator, generate_environments
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'performance_baseline.json')
+UPDATE_BASELINE = os.environ.get('SENSORY_PERF_UPDATE') == '1'
+# Allowed ratio of measured to baseline cost before a test fails
+TIME_TOLERANCE = float(os.environ.get('SENSORY_PERF_TOLERANCE', '1.5'))
+ALLOCATION_TOLERANCE = 1.25
+
+def measure(run, repeats: int = 9) -> float:
+    """Median run time in seconds after rejecting outliers
+
+    Runs slower than three median absolute deviations above the median are
+    discarded first, so a single GC pause or context switch can't fail a test.
+    """
+    run()  # warm-up
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start)
+    median = statistics.median(times)
+    spread = statistics.median(abs(t - median) for t in times)
+    return statistics.median([t for t in times if t <= median + 3 * spread])
+
+def calibration_workload():
+    """Fixed pure-Python work resembling the analyzers (substring scans, dicts)"""
+    table = {f"key{i}": [f"word{i}{j}" for j in range(4)] for i in range(40)}
+    text = " ".join(f"token{i}" for i in range(30)) + " word393 word71"
+    hits = 0
+    for _ in range(200):
+        for items in table.values():
+            hits += sum(1 for item in items if item in text)
+    return hits
+
+def allocations(run) -> tuple:
+    """Bytes still allocated after `run` and peak bytes during it"""
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        run()
+        after, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return after - before, peak - before
+
+@unittest.skipIf(os.environ.get('SENSORY_PERF_SKIP') == '1', "performance tests disabled")
+class TestPerformance(unittest.TestCase):
+    """Throughput and allocation budgets for the hot paths"""
+
+    @classmethod
+    def setUpClass(cls):
+        if os.path.exists(BASELINE_PATH) and not UPDATE_BASELINE:
+            with open(BASELINE_PATH) as f:
+                cls.baseline = json.load(f)
+        else:
+            cls.baseline = {}
+        cls.measured = {}
+        cls.calibration = measure(calibration_workload)
+        cls.environments = list(generate_environments(500, words=12, seed=0))
+
+    @classmethod
+    def tearDownClass(cls):
+        if UPDATE_BASELINE:
+            with open(BASELINE_PATH, 'w') as f:
+                json.dump(dict(sorted(cls.measured.items())), f, indent=2)
+                f.write("\n")
+
+    def check_time(self, name: str, seconds: float, calls: int):
+        """Compare calibrated cost per call with the baseline"""
+        cost = seconds / calls / self.calibration
+        self.measured[name] = cost
+        if name in self.baseline:
+            limit = self.baseline[name] * TIME_TOLERANCE
+            self.assertLessEqual(cost, limit, f"{name} is {cost / self.baseline[name]:.2f}x "
+                                              f"slower than the baseline")
+
+    def check_bytes(self, name: str, total: int, calls: int):
+        """Compare bytes per call with the baseline (with a small absolute slack)"""
+        per_call = total / calls
+        self.measured[name] = per_call
+        if name in self.baseline:
+            limit = self.baseline[name] * ALLOCATION_TOLERANCE + 64
+            self.assertLessEqual(per_call, limit, f"{name} uses {per_call:.0f} bytes per call, "
+                                                  f"baseline {self.baseline[name]:.0f}")
+
+    def experience_all(self):
+        ai = SensoryAI("Perf", verbose=False)
+        for environment in self.environments:
+            ai.experience(environment)
+        return ai
+
+    def test_experience_throughput(self):
+        """Test the cost of a full experience() call"""
+        self.check_time('experience_time', measure(self.experience_all, repeats=5),
+                        len(self.environments))
+
+    def test_experience_allocations(self):
+        """Test memory retained and peak allocation per experience"""
+        ai = SensoryAI("Perf", verbose=False)
+        def run():
+            for environment in self.environments:
+                ai.experience(environment)
+        retained, peak = allocations(run)
+        self.check_bytes('experience_retained_bytes', retained, len(self.environments))
+        self.check_bytes('experience_peak_bytes', peak, len(self.environments))
+
+    def test_sense_analysis(self):
+        """Test the cost of each text analyzer"""
+        generator = EnvironmentGenerator(words=12, seed=1)
+        analyzers = {
+            'vision': lambda: Vision().see,
+            'hearing': lambda: Hearing().hear,
+            'touch': lambda: Touch().feel,
+            'smell': lambda: Smell().smell,
+            'taste': lambda: Taste().taste
+        }
+        for sense, analyzer in analyzers.items():
+            descriptions = [generator.description(sense) for _ in range(500)]
+            def run():
+                analyze = analyzer()
+                for description in descriptions:
+                    analyze(description)
+            with self.subTest(sense=sense):
+                self.check_time(f'{sense}_time', measure(run), len(descriptions))
+
+    def test_history_queries(self):
+        """Test the cost of history and statistics queries on a long history"""
+        ai = SensoryAI("Perf", verbose=False)
+        for _ in range(10):
+            for environment in self.environments:
+                ai.experience(environment)
+        def run():
+            for _ in range(100):
+                recent = ai.get_experience_history()[-50:]
+                ai.get_sensory_stats()
+                ai.get_memory_sizes()
+            return recent
+        self.check_time('history_query_time', measure(run), 100)
+
+if __name__ == "__main__":
+    unittest.main()
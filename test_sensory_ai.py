@@ -4,8 +4,13 @@ Test suite for the SensoryAI system
 Verifies all core functionality
 """
 
+import os
+import subprocess
+import sys
+import tempfile
 import unittest
-from sensory_ai import SensoryAI, SensoryInput, Vision, Hearing, Touch, Smell, Taste
+import numpy as np
+from sensory_ai import SensoryAI, SensoryInput, SharedLog, RollingWindow, Vision, Hearing, Touch, Smell, Taste
 
 class TestSensoryAI(unittest.TestCase):
     """Test cases for the SensoryAI system"""
@@ -50,6 +55,36 @@ class TestSensoryAI(unittest.TestCase):
         self.assertGreater(visual_input.intensity, 0)
         self.assertIsInstance(visual_input.quality, str)
     
+    def test_vision_image_analysis(self):
+        """Test dominant colors and intensity from RGB arrays"""
+        vision = Vision()
+        
+        plain = np.zeros((40, 60, 3), dtype=np.uint8)
+        plain[..., 0] = 250
+        visual_input = vision.see(plain)
+        self.assertEqual(visual_input.details['dominant_colors'], ['red'])
+        self.assertEqual(visual_input.quality, "simple scene")
+        self.assertAlmostEqual(visual_input.intensity, 0.0)
+        
+        split = np.zeros((40, 60, 3), dtype=np.uint8)
+        split[:, 30:] = 255
+        visual_input = vision.see_image(split)
+        self.assertEqual(set(visual_input.details['dominant_colors']), {'black', 'white'})
+        self.assertAlmostEqual(visual_input.details['contrast'], 1.0)
+        self.assertGreater(visual_input.intensity, 0.5)
+        self.assertEqual(len(vision.visual_memory), 2)
+    
+    def test_vision_image_downsampling(self):
+        """Test that large frames are sampled within the pixel budget"""
+        vision = Vision()
+        frame = np.full((1080, 1920, 3), (0, 0, 255), dtype=np.uint8)
+        visual_input = vision.see_image(frame, max_pixels=10_000, chunk_pixels=1_000)
+        self.assertGreaterEqual(visual_input.details['sample_stride'], 15)
+        self.assertEqual(visual_input.details['color_shares'], {'blue': 1.0})
+        
+        with self.assertRaises(ValueError):
+            vision.see_image(np.zeros((10, 10), dtype=np.uint8))
+    
     def test_hearing_system(self):
         """Test hearing system functionality"""
         hearing = Hearing()
@@ -70,6 +105,45 @@ class TestSensoryAI(unittest.TestCase):
         self.assertGreater(auditory_input.intensity, 0)
         self.assertIsInstance(auditory_input.quality, str)
     
+    def test_hearing_pcm_analysis(self):
+        """Test loudness and frequency band from raw PCM samples"""
+        hearing = Hearing()
+        t = np.arange(16000) / 16000
+        
+        bass = (0.9 * np.sin(2 * np.pi * 100 * t) * 32767).astype(np.int16)
+        auditory_input = hearing.hear(bass)
+        self.assertEqual(auditory_input.quality, "low frequency")
+        self.assertGreater(auditory_input.intensity, 0.9)
+        
+        # Interleaved int16 stereo is scaled before the channels are averaged
+        quiet = (0.007 * np.sin(2 * np.pi * 100 * t) * 32767).astype(np.int16)
+        stereo = hearing.hear(np.stack([quiet, quiet], axis=1))
+        mono = hearing.hear(quiet)
+        self.assertAlmostEqual(stereo.intensity, mono.intensity, places=5)
+        self.assertLess(stereo.intensity, 0.5)
+        
+        whistle = 0.01 * np.sin(2 * np.pi * 5000 * t).astype(np.float32)
+        auditory_input = hearing.hear_pcm(whistle)
+        self.assertEqual(auditory_input.quality, "high frequency")
+        self.assertLess(auditory_input.intensity, 0.5)
+    
+    def test_hearing_stream_matches_whole_buffer(self):
+        """Test that chunked streaming yields the same windows as one pass"""
+        hearing = Hearing()
+        t = np.arange(8000) / 16000
+        signal = (0.5 * np.sin(2 * np.pi * 1000 * t)).astype(np.float32)
+        
+        whole = list(hearing.listen([signal], window_size=512, hop_size=256))
+        chunked = list(hearing.listen(np.array_split(signal, 37), window_size=512, hop_size=256))
+        
+        self.assertEqual(len(whole), 1 + (8000 - 512) // 256)
+        self.assertEqual([i.details['start_sample'] for i in chunked],
+                         [i.details['start_sample'] for i in whole])
+        for a, b in zip(whole, chunked):
+            self.assertAlmostEqual(a.intensity, b.intensity, places=5)
+            self.assertEqual(a.quality, "medium frequency")
+        self.assertEqual(len(hearing.auditory_memory), 2 * len(whole))
+    
     def test_touch_system(self):
         """Test touch system functionality"""
         touch = Touch()
@@ -92,6 +166,51 @@ class TestSensoryAI(unittest.TestCase):
         self.assertGreater(tactile_input.intensity, 0)
         self.assertIsInstance(tactile_input.quality, str)
     
+    def test_rolling_window_matches_naive(self):
+        """Test chunked rolling statistics against a direct computation"""
+        rng = np.random.default_rng(1)
+        samples = rng.normal(50.0, 5.0, size=500)
+        window = RollingWindow(32)
+        
+        means, maxima, variances = [], [], []
+        for chunk in np.array_split(samples, [7, 8, 100, 333]):
+            mean, peak, variance = window.update(chunk)
+            means.extend(mean)
+            maxima.extend(peak)
+            variances.extend(variance)
+        
+        for i in range(500):
+            expected = samples[max(0, i - 31):i + 1]
+            self.assertAlmostEqual(means[i], expected.mean())
+            self.assertEqual(maxima[i], expected.max())
+            self.assertAlmostEqual(variances[i], expected.var())
+        self.assertEqual(window.count, 500)
+        
+        # One sample at a time, on a copy that must not disturb the original
+        branch = window.copy()
+        for i, sample in enumerate(samples[::-1]):
+            mean, peak, variance = branch.update([sample])
+            expected = np.concatenate((samples, samples[::-1][:i + 1]))[-32:]
+            self.assertAlmostEqual(mean[0], expected.mean())
+            self.assertEqual(peak[0], expected.max())
+            self.assertAlmostEqual(variance[0], expected.var())
+        self.assertEqual(window.update(samples[:1])[1][0], max(samples[-31:].max(), samples[0]))
+    
+    def test_touch_sensor_readings(self):
+        """Test mapping numeric pressure and temperature feeds to qualities"""
+        touch = Touch()
+        firm = np.full(2000, 80.0)
+        tactile_input = touch.feel_readings(pressure=firm, temperature=np.full(2000, 50.0))
+        self.assertEqual(tactile_input.quality, "hard hot")
+        self.assertAlmostEqual(tactile_input.intensity, 0.8)
+        
+        rng = np.random.default_rng(2)
+        chunks = [(rng.uniform(10, 90, 500), np.full(500, 5.0)) for _ in range(4)]
+        inputs = list(touch.feel_stream(chunks))
+        self.assertEqual(inputs[-1].quality, "rough cold")
+        self.assertEqual(touch.feel(np.full(1000, 10.0)).quality, "soft cold")
+        self.assertEqual(len(touch.tactile_memory), 6)
+    
     def test_smell_system(self):
         """Test smell system functionality"""
         smell = Smell()
@@ -250,6 +369,191 @@ class TestSensoryAI(unittest.TestCase):
         self.assertEqual(input_data.location, "test location")
         self.assertIsNotNone(input_data.timestamp)
 
+    def test_experience_within_generous_budget(self):
+        """Test that a comfortable latency budget changes nothing"""
+        result = self.ai.experience({"vision": "Red car", "smell": "Fresh flowers"}, budget=10.0)
+        self.assertEqual(result['degraded'], [])
+        self.assertIn('sensory_inputs', result['integrated_experience'])
+        self.assertGreater(self.ai.brain.stage_costs['vision'], 0.0)
+        
+        # Forks learn their own costs and cache their own senses
+        branch = self.ai.fork()
+        branch.experience({"hearing": "Loud thunder"}, budget=10.0)
+        self.assertEqual(self.ai.brain.stage_costs['hearing'], 0.0)
+        self.assertNotIn(('hearing', "Loud thunder"), self.ai.brain.sense_cache)
+        self.assertIn(('vision', "Red car"), branch.brain.sense_cache)
+    
+    def test_experience_degrades_when_budget_exhausted(self):
+        """Test staged degradation with an exhausted latency budget"""
+        env = {"vision": "Red car", "smell": "Rotten garbage", "taste": "Sweet honey"}
+        self.ai.experience(env)
+        
+        result = self.ai.experience(env, budget=0.0)
+        integrated = result['integrated_experience']
+        self.assertEqual(result['degraded'], ['cached_senses', 'skipped_sensory_inputs', 'stale_quality'])
+        self.assertNotIn('sensory_inputs', integrated)
+        self.assertEqual(integrated['experience_quality'],
+                         self.ai.brain.sensory_integration[0]['experience_quality'])
+        self.assertEqual(result['individual_senses']['smell'].quality, "unpleasant")
+        self.assertEqual(len(self.ai.brain.smell.olfactory_memory), 2)
+        
+        # Nothing cached yet: only the sense under attention is analyzed
+        fresh = SensoryAI("Fresh", verbose=False)
+        fresh.set_attention_focus("olfactory")
+        result = fresh.experience(env, budget=0.0)
+        self.assertEqual(list(result['individual_senses']), ['smell'])
+        self.assertIn('skipped_senses', result['degraded'])
+    
+    def test_snapshot_round_trip(self):
+        """Test full snapshot and restore of agent state"""
+        self.ai.experience({"vision": "Red car", "smell": "Fresh flowers"})
+        self.ai.set_consciousness_level(0.7)
+        self.ai.set_attention_focus("visual")
+        
+        restored = SensoryAI.restore(self.ai.snapshot(compress=True))
+        
+        self.assertEqual(restored.name, "TestAI")
+        self.assertEqual(restored.brain.consciousness_level, 0.7)
+        self.assertEqual(restored.brain.attention_focus, "visual")
+        self.assertEqual(restored.brain.vision.visual_memory, self.ai.brain.vision.visual_memory)
+        self.assertEqual(len(restored.experience_log), 1)
+        self.assertEqual(restored.get_sensory_stats(), self.ai.get_sensory_stats())
+    
+    def test_incremental_snapshot_file(self):
+        """Test that deltas appended to a snapshot file restore the latest state"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "agent.snap")
+            for _ in range(20):
+                self.ai.experience({"vision": "Red car"})
+            full = self.ai.snapshot(path)
+            
+            self.ai.experience({"hearing": "Loud thunder"})
+            delta = self.ai.snapshot(path, incremental=True)
+            self.assertLess(len(delta), len(full))
+            
+            restored = SensoryAI.restore(path)
+            self.assertEqual(len(restored.experience_log), 21)
+            self.assertEqual(restored.brain.hearing.auditory_memory, self.ai.brain.hearing.auditory_memory)
+            
+            # A restored agent keeps extending the same checkpoint chain
+            restored.experience({"taste": "Sweet honey"})
+            restored.snapshot(path, incremental=True)
+            self.assertEqual(len(SensoryAI.restore(path).experience_log), 22)
+    
+    def test_snapshot_rejects_bad_data(self):
+        """Test that corrupt or out-of-order snapshots are rejected"""
+        self.ai.snapshot()
+        self.ai.experience({"vision": "Red car"})
+        delta = self.ai.snapshot(incremental=True)
+        
+        with self.assertRaises(ValueError):
+            SensoryAI.restore(b"not a snapshot at all, definitely")
+        with self.assertRaises(ValueError):
+            SensoryAI.restore(delta)
+
+    def test_shared_log_fork(self):
+        """Test that forked logs share their prefix and diverge afterwards"""
+        log = SharedLog(range(5))
+        child = log.fork()
+        log.append(5)
+        child.extend([50, 51])
+        grandchild = child.fork()
+        grandchild.append(60)
+        
+        self.assertEqual(list(log), [0, 1, 2, 3, 4, 5])
+        self.assertEqual(list(child), [0, 1, 2, 3, 4, 50, 51])
+        self.assertEqual(list(grandchild), [0, 1, 2, 3, 4, 50, 51, 60])
+        self.assertEqual(grandchild[3:7], [3, 4, 50, 51])
+        self.assertEqual(grandchild[-2:], [51, 60])
+        self.assertEqual(grandchild[2], 2)
+        self.assertEqual(grandchild[::3], [0, 3, 51])
+        with self.assertRaises(IndexError):
+            grandchild[8]
+    
+    def test_fork_branches_independently(self):
+        """Test what-if branching from a common agent state"""
+        self.ai.experience({"vision": "Red car", "smell": "Fresh flowers"})
+        branch = self.ai.fork("Branch")
+        branch.experience({"smell": "Thick smoke"})
+        branch.set_attention_focus("olfactory")
+        
+        self.assertEqual(len(self.ai.experience_log), 1)
+        self.assertEqual(len(branch.experience_log), 2)
+        self.assertEqual(self.ai.brain.attention_focus, "general")
+        self.assertEqual(len(self.ai.brain.smell.olfactory_memory), 1)
+        self.assertEqual(branch.brain.smell.olfactory_memory[-1].quality, "unpleasant")
+        self.assertIs(branch.experience_log[0], self.ai.experience_log[0])
+        
+        restored = SensoryAI.restore(branch.snapshot())
+        self.assertEqual(restored.get_sensory_stats(), branch.get_sensory_stats())
+    
+    def test_history_query_pages_and_filters(self):
+        """Test paged history queries with date range and dominant sense filters"""
+        now = [1_700_000_000.0]
+        self.ai.set_clock(lambda: now[0])
+        for i in range(30):
+            now[0] += 60.0
+            environment = {"hearing": "whisper", "smell": "Strong perfume"} if i % 3 == 0 \
+                else {"hearing": "thunder", "smell": "paper"}
+            self.ai.experience(environment)
+        
+        page = self.ai.query_history(page_size=7)
+        self.assertEqual((page.total, page.pages, page.positions), (30, 5, list(range(29, 22, -1))))
+        self.assertEqual(page.entries, self.ai.experience_log[23:30][::-1])
+        last = self.ai.query_history(page=4, page_size=7, newest_first=False)
+        self.assertEqual(last.positions, [28, 29])
+        
+        smells = self.ai.query_history(page_size=4, dominant_sense="smell")
+        self.assertEqual((smells.total, smells.positions), (10, [27, 24, 21, 18]))
+        self.assertEqual(self.ai.history.senses(), ["hearing", "smell"])
+        oldest = self.ai.query_history(page=1, page_size=4, dominant_sense="smell", newest_first=False)
+        self.assertEqual(oldest.positions, [12, 15, 18, 21])
+        self.assertEqual(oldest.entries, [self.ai.experience_log[p] for p in oldest.positions])
+        self.assertEqual(self.ai.query_history(page=2, page_size=4, dominant_sense="smell").positions, [3, 0])
+        
+        window = self.ai.query_history(since=1_700_000_000.0 + 60 * 10,
+                                       until=1_700_000_000.0 + 60 * 20, dominant_sense="smell")
+        self.assertEqual(window.positions, [18, 15, 12, 9])
+        
+        branch = self.ai.fork()
+        branch.experience({"hearing": "whisper", "smell": "Strong perfume"})
+        self.assertEqual(branch.query_history(dominant_sense="smell").total, 11)
+        self.assertEqual(self.ai.query_history(dominant_sense="smell").total, 10)
+    
+    def test_history_interns_repeated_environments(self):
+        """Test that equal environments share one stored copy and are swept when gone"""
+        city = {"vision": "red car", "hearing": "traffic"}
+        for _ in range(3):
+            self.ai.experience(dict(city))
+        self.ai.experience({"vision": "red car", "hearing": "whisper"})
+        first, second, _, other = (entry['environment'] for entry in self.ai.experience_log)
+        self.assertIs(first, second)
+        self.assertIs(first['vision'], other['vision'])
+        self.assertEqual((len(self.ai.interned), self.ai.interned.hits), (2, 2))
+        
+        # The caller's dict is copied, so mutating it leaves history alone
+        city["vision"] = "blue sky"
+        self.ai.experience(city)
+        self.assertEqual(first["vision"], "red car")
+        
+        restored = SensoryAI.restore(self.ai.snapshot())
+        entries = restored.experience_log
+        self.assertIs(entries[0]['environment'], entries[2]['environment'])
+        
+        self.ai.experience_log = SharedLog(self.ai.experience_log[3:])
+        self.assertEqual(self.ai.sweep_interned(), 1)
+        self.assertEqual(len(self.ai.interned), 2)
+        self.assertEqual(sorted(self.ai.interned.descriptions), ["blue sky", "red car", "traffic", "whisper"])
+    
+    def test_text_experience_skips_heavy_imports(self):
+        """Test that importing and text-only use don't load numpy or pickle"""
+        probe = ("import sys, sensory_ai\n"
+                 "sensory_ai.SensoryAI('Probe', verbose=False).experience({'vision': 'red car'})\n"
+                 "print(sorted(m for m in ('numpy', 'pickle', 'asyncio') if m in sys.modules))")
+        output = subprocess.run([sys.executable, '-c', probe], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout
+        self.assertEqual(output.strip(), "[]")
+
 def run_tests():
     """Run all tests"""
     print("Running SensoryAI Test Suite...")
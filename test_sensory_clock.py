@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Test suite for simulation clocks and the tick scheduler
+"""
+
+import itertools
+import unittest
+from sensory_ai import SensoryAI
+from sensory_clock import TickScheduler, VirtualClock
+
+class TestTickScheduler(unittest.TestCase):
+    """Test cases for TickScheduler"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.clock = VirtualClock(start=1000.0)
+        self.scheduler = TickScheduler(rate_hz=10, clock=self.clock)
+
+    def test_virtual_time_drives_timestamps(self):
+        """Test that agents are ticked at the rate and stamped by the clock"""
+        agents = [SensoryAI(f"Agent{i}", verbose=False) for i in range(3)]
+        for agent in agents:
+            self.scheduler.add(agent, itertools.repeat({"vision": "Red car"}))
+
+        stats = self.scheduler.run(duration=1.0)
+
+        self.assertEqual(stats.ticks, 10)
+        self.assertEqual(stats.experiences, 30)
+        self.assertEqual(stats.deadline_misses, 0)
+        memory = agents[0].brain.vision.visual_memory
+        self.assertEqual(memory[0].timestamp, 1000.0)
+        self.assertAlmostEqual(memory[-1].timestamp, 1000.9)
+        self.assertAlmostEqual(agents[0].brain.sensory_integration[-1]['timestamp'], 1000.9)
+
+    def test_inactive_agents_leave_the_batch(self):
+        """Test that exhausted and sleeping agents stop costing tick work"""
+        finite = SensoryAI("Finite", verbose=False)
+        sleepy = SensoryAI("Sleepy", verbose=False)
+        self.scheduler.add(finite, [{"smell": "Coffee"}] * 2)
+        self.scheduler.add(sleepy, lambda now: {"taste": "Sweet honey"})
+
+        self.scheduler.run(ticks=1)
+        sleepy.sleep()
+        self.scheduler.run(ticks=3)
+        self.assertEqual(self.scheduler.active_count, 0)
+        self.assertEqual(len(finite.experience_log), 2)
+        self.assertEqual(len(sleepy.experience_log), 1)
+
+        sleepy.wake_up()
+        self.scheduler.activate(sleepy)
+        self.scheduler.run(ticks=2)
+        self.assertEqual(len(sleepy.experience_log), 3)
+
+    def test_deadline_misses_and_lag(self):
+        """Test that slow ticks are counted as misses and the next tick lags"""
+        agent = SensoryAI("Slow", verbose=False)
+
+        def slow_source(now):
+            self.clock.advance(0.25)
+            return {"hearing": "Loud thunder"}
+
+        self.scheduler.add(agent, slow_source)
+        stats = self.scheduler.run(ticks=2)
+
+        self.assertEqual(stats.deadline_misses, 2)
+        self.assertAlmostEqual(stats.max_lag, 0.15)
+
+if __name__ == "__main__":
+    unittest.main()
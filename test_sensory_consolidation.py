@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Test suite for memory consolidation during sleep
+"""
+
+import gc
+import unittest
+import weakref
+from unittest import mock
+from sensory_ai import SensoryAI
+from sensory_consolidation import MemoryConsolidation
+
+class TestMemoryConsolidation(unittest.TestCase):
+    """Test cases for consolidating memories on sleep"""
+
+    def setUp(self):
+        """Set up test fixtures: an hour of one experience a minute"""
+        self.now = [1_700_000_000.0]
+        self.ai = SensoryAI("Sleeper", verbose=False)
+        self.ai.set_clock(lambda: self.now[0])
+        self.ai.consolidation_keep = 20
+        for i in range(60):
+            self.now[0] += 60.0
+            self.ai.experience({"hearing": "thunder" if i % 3 else "whisper", "smell": "coffee"})
+
+    def test_consolidate_keeps_recent_and_counts(self):
+        """Test that old items become summaries, recent ones stay and totals stay exact"""
+        before = self.ai.get_sensory_stats()
+        recent = self.ai.experience_log[-20:]
+        oldest = weakref.ref(self.ai.brain.hearing.auditory_memory[0])
+
+        consolidated = self.ai.consolidate_memories()
+        self.assertEqual(consolidated, {'hearing': 40, 'smell': 40, 'sensory_integration': 40,
+                                        'experience_log': 40})
+        self.assertEqual(list(self.ai.experience_log), recent)
+        self.assertEqual(self.ai.get_memory_sizes()['hearing'], 20)
+        after = self.ai.get_sensory_stats()
+        for key in ('total_auditory_experiences', 'total_olfactory_experiences',
+                    'total_integrated_experiences'):
+            self.assertEqual(after[key], before[key])
+        self.assertEqual(self.ai.total_experiences(), 60)
+        gc.collect()
+        self.assertIsNone(oldest())
+
+        consolidation = self.ai.consolidation
+        windows = consolidation.summaries('hearing')
+        self.assertEqual(sum(window.count for window in windows), 40)
+        self.assertEqual(sum(sum(window.qualities.values()) for window in windows), 40)
+        self.assertEqual(consolidation.situations['hearing/neutral'].count, 26)
+        self.assertEqual(consolidation.situations['smell/neutral'].count, 14)
+
+        # Queries see the retained log; the timeline keeps raw points for it
+        # and summarises the rest
+        self.assertEqual(self.ai.query_history(page_size=5).total, 20)
+        self.assertEqual(len(self.ai.timeline.times), 20)
+        self.ai.experience({"hearing": "whisper"})
+        self.assertEqual(self.ai.intensity_timeline().points, 61)
+        self.assertEqual(len(self.ai.similar_experiences(k=3)), 3)
+        self.assertEqual(self.ai.consolidate_memories(), {'hearing': 1, 'sensory_integration': 1,
+                                                          'experience_log': 1})
+        self.assertEqual(consolidation.passes, 2)
+
+    def test_totals_exact_mid_pass(self):
+        """Test that readers see the full logs and totals until a pass publishes"""
+        seen = []
+        absorb_entries = MemoryConsolidation.absorb_entries
+        def observe(consolidation, entries, log='experience_log'):
+            absorb_entries(consolidation, entries, log)
+            seen.append((self.ai.total_experiences(),
+                         self.ai.get_sensory_stats()['total_auditory_experiences'],
+                         self.ai.query_history(page_size=1).total,
+                         self.ai.similar_experiences(k=1)[0].experience['timestamp']))
+        expected = (60, 60, 60, self.ai.similar_experiences(k=1)[0].experience['timestamp'])
+        with mock.patch.object(MemoryConsolidation, 'absorb_entries', observe):
+            self.ai.consolidate_memories()
+        self.assertEqual(seen, [expected])
+        self.assertEqual(self.ai.total_experiences(), 60)
+        self.assertEqual(self.ai.query_history(page_size=1).total, 20)
+
+        merged = MemoryConsolidation()
+        merged.merge(self.ai.consolidation)
+        merged.merge(MemoryConsolidation())
+        self.assertEqual(merged.counts, self.ai.consolidation.counts)
+        self.assertEqual(merged.summaries('hearing'), self.ai.consolidation.summaries('hearing'))
+        with self.assertRaises(ValueError):
+            merged.merge(MemoryConsolidation(window=60.0))
+
+    def test_stream_appends_share_memory_lock(self):
+        """Test that senses append under the brain's lock and mid-pass appends survive"""
+        brain = self.ai.brain
+        branch = self.ai.fork()
+        for agent in (self.ai, branch):
+            for sense in ('vision', 'hearing', 'touch', 'smell', 'taste'):
+                self.assertIs(getattr(agent.brain, sense).memory_lock, agent.brain.memory_lock)
+        self.assertIsNot(branch.brain.memory_lock, brain.memory_lock)
+
+        late = []
+        absorb_entries = MemoryConsolidation.absorb_entries
+        def observe(consolidation, entries, log='experience_log'):
+            absorb_entries(consolidation, entries, log)
+            if not late:
+                late.append(brain.hearing.hear("late whisper"))
+                brain.integrate_senses()
+        with mock.patch.object(MemoryConsolidation, 'absorb_entries', observe):
+            self.ai.consolidate_memories()
+        self.assertIs(brain.hearing.auditory_memory[-1], late[0])
+        self.assertEqual(self.ai.get_memory_sizes()['hearing'], 21)
+        self.assertEqual(self.ai.get_sensory_stats()['total_auditory_experiences'], 61)
+
+    def test_sleep_consolidates_in_background(self):
+        """Test sleep, wake-up, forks and snapshots around a background pass"""
+        branch = self.ai.fork()
+        self.ai.sleep()
+        self.ai.wake_up()
+        self.assertIsNone(self.ai._consolidating)
+        self.assertEqual(len(self.ai.experience_log), 20)
+        self.assertEqual(len(branch.experience_log), 60)
+        self.assertEqual(branch.consolidation.counts, {})
+
+        # Forks share the summaries until one side consolidates again
+        twig = self.ai.fork()
+        self.assertIs(twig.consolidation.windows, self.ai.consolidation.windows)
+        for i in range(5):
+            twig.experience({"hearing": "rain"})
+        twig.consolidate_memories()
+        self.assertEqual(twig.consolidation.counts['experience_log'], 45)
+        self.assertEqual(self.ai.consolidation.counts['experience_log'], 40)
+        self.assertEqual(sum(window.count for window in self.ai.consolidation.summaries('hearing')), 40)
+
+        restored = SensoryAI.restore(self.ai.snapshot())
+        self.assertFalse(restored.verbose)
+        self.assertEqual(restored.consolidation_keep, 20)
+        self.assertEqual(restored.total_experiences(), 60)
+        self.assertEqual(restored.get_sensory_stats()['total_auditory_experiences'], 60)
+        restored.experience({"hearing": "thunder"})
+        self.assertEqual(restored.intensity_timeline().points, 21)
+
+        # Small agents have nothing to consolidate and start no thread
+        small = SensoryAI("Small", verbose=False)
+        small.experience({"vision": "red car"})
+        small.sleep()
+        self.assertIsNone(small._consolidating)
+
+    def test_round_trip(self):
+        """Test that consolidation state survives to_dict and from_dict"""
+        self.ai.consolidate_memories()
+        state = self.ai.consolidation.to_dict()
+        copy = MemoryConsolidation.from_dict(state)
+        self.assertEqual(copy.to_dict(), state)
+        self.assertEqual(copy.summaries('smell'), self.ai.consolidation.summaries('smell'))
+
+    def test_windows_are_capped(self):
+        """Test that old windows roll up into a log's first one past max_windows"""
+        consolidation = MemoryConsolidation(window=600.0, max_windows=3)
+        self.ai.consolidation = consolidation
+        self.ai.consolidate_memories()
+        windows = consolidation.summaries('hearing')
+        self.assertEqual(len(windows), 3)
+        self.assertEqual(sum(window.count for window in windows), 40)
+        self.assertEqual(windows[0].start, (1_700_000_060.0 // 600) * 600)
+        self.assertEqual([window.count for window in windows], [26, 10, 4])
+
+        merged = MemoryConsolidation(window=600.0, max_windows=2)
+        merged.merge(consolidation)
+        self.assertEqual([window.count for window in merged.summaries('hearing')], [36, 4])
+        self.assertEqual(MemoryConsolidation.from_dict(merged.to_dict()).max_windows, 2)
+        with self.assertRaises(ValueError):
+            MemoryConsolidation(max_windows=0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Test suite for the synthetic environment corpus
+"""
+
+import unittest
+from sensory_ai import SensoryAI
+from sensory_corpus import EnvironmentGenerator, PRESETS, generate_environments, sense_lexicon
+
+class TestEnvironmentGenerator(unittest.TestCase):
+    """Test cases for EnvironmentGenerator"""
+
+    def test_seeded_and_lazy(self):
+        """Test that the same seed reproduces the stream and generation is lazy"""
+        first = list(generate_environments(50, seed=7))
+        self.assertEqual(first, list(generate_environments(50, seed=7)))
+        self.assertNotEqual(first, list(generate_environments(50, seed=8)))
+
+        generator = EnvironmentGenerator(seed=7)
+        stream = generator.take(10 ** 9)
+        self.assertEqual(next(stream), first[0])
+        self.assertEqual(generator.generated, 1)
+
+    def test_length_and_keyword_density(self):
+        """Test that descriptions follow the configured length and hit density"""
+        generator = EnvironmentGenerator(words=20, keyword_density=0.5, seed=1)
+        lexicon = set(sense_lexicon('vision'))
+        words = [word for _ in range(200) for word in generator.description('vision').split()]
+        self.assertEqual(len(words), 4000)
+        self.assertAlmostEqual(sum(word in lexicon for word in words) / len(words), 0.5, delta=0.05)
+
+        # Filler words never trigger the analyzers
+        empty = EnvironmentGenerator(keyword_density=0.0, seed=1)
+        ai = SensoryAI("Corpus", verbose=False)
+        environment = empty.environment()
+        result = ai.experience(environment)['individual_senses']
+        baseline = ai.experience({sense: "" for sense in environment})['individual_senses']
+        self.assertEqual({sense: i.quality for sense, i in result.items()},
+                         {sense: i.quality for sense, i in baseline.items()})
+
+    def test_repeats_and_coverage(self):
+        """Test repeat rate and per-sense coverage"""
+        generator = EnvironmentGenerator(repeat_rate=0.3, seed=2,
+                                         sense_coverage={'vision': 1.0, 'taste': 0.5})
+        environments = list(generator.take(2000))
+        self.assertAlmostEqual(generator.repeats / 2000, 0.3, delta=0.05)
+        self.assertTrue(all(set(env) <= {'vision', 'taste'} and 'vision' in env
+                            for env in environments))
+        self.assertAlmostEqual(sum('taste' in env for env in environments) / 2000, 0.5, delta=0.05)
+
+    def test_presets(self):
+        """Test that every preset covers the five senses"""
+        for environment in PRESETS.values():
+            self.assertEqual(set(environment), {'vision', 'hearing', 'touch', 'smell', 'taste'})
+
+if __name__ == "__main__":
+    unittest.main()
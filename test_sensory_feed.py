@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Test suite for the SensoryAI change feed
+"""
+
+import asyncio
+import threading
+import unittest
+from sensory_ai import SensoryAI, SensoryInput
+from sensory_feed import (ChangeFeed, FeedClosed, FeedTimeout, BLOCK, SENSORY_INPUT,
+                          INTEGRATED_EXPERIENCE, EXPERIENCE)
+
+class TestChangeFeed(unittest.TestCase):
+    """Test cases for feed subscriptions"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.ai = SensoryAI("FeedAI")
+
+    def test_experience_events_in_order(self):
+        """Test that one experience publishes inputs, integration and log entry"""
+        with self.ai.subscribe() as subscription:
+            self.ai.experience({"vision": "Red car", "smell": "Fresh flowers"})
+            topics = [subscription.get(timeout=1).topic for _ in range(4)]
+
+        self.assertEqual(topics, [SENSORY_INPUT, SENSORY_INPUT, INTEGRATED_EXPERIENCE, EXPERIENCE])
+        self.assertFalse(self.ai.brain.feed.active)
+
+    def test_topic_filter_and_drop_policy(self):
+        """Test that full queues keep only the newest events"""
+        subscription = self.ai.subscribe(topics=[INTEGRATED_EXPERIENCE], maxsize=2)
+        for description in ["Red car", "Blue sky", "Green tree"]:
+            self.ai.experience({"vision": description})
+
+        self.assertEqual(len(subscription), 2)
+        self.assertEqual(subscription.dropped, 1)
+        latest = [subscription.get_nowait().data for _ in range(2)]
+        self.assertEqual(latest[-1], self.ai.brain.sensory_integration[-1])
+        self.assertIsNone(subscription.get_nowait())
+        with self.assertRaises(FeedTimeout):
+            subscription.get(timeout=0.01)
+        subscription.close()
+        with self.assertRaises(FeedClosed):
+            subscription.get()
+
+    def test_block_policy_waits_for_consumer(self):
+        """Test that a blocking subscription applies back-pressure"""
+        feed = ChangeFeed()
+        subscription = feed.subscribe(maxsize=1, policy=BLOCK)
+        feed.publish(EXPERIENCE, 1)
+
+        publisher = threading.Thread(target=feed.publish, args=(EXPERIENCE, 2))
+        publisher.start()
+        publisher.join(0.05)
+        self.assertTrue(publisher.is_alive())
+
+        self.assertEqual(subscription.get(timeout=1).data, 1)
+        publisher.join(1)
+        self.assertFalse(publisher.is_alive())
+        self.assertEqual(subscription.get(timeout=1).data, 2)
+        self.assertEqual(subscription.dropped, 0)
+
+    def test_async_iteration(self):
+        """Test consuming the feed from asyncio"""
+        feed = ChangeFeed()
+        subscription = feed.subscribe(topics=[SENSORY_INPUT])
+
+        async def consume():
+            received = []
+            async for event in subscription:
+                received.append(event.data.intensity)
+            return received
+
+        async def run():
+            consumer = asyncio.ensure_future(consume())
+            await asyncio.sleep(0)
+            for intensity in (0.1, 0.2):
+                feed.publish(SENSORY_INPUT, SensoryInput("vision", intensity, "simple scene"))
+                await asyncio.sleep(0)
+            subscription.close()
+            return await asyncio.wait_for(consumer, 1)
+
+        self.assertEqual(asyncio.run(run()), [0.1, 0.2])
+
+if __name__ == "__main__":
+    unittest.main()
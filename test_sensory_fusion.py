@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Test suite for timestamp-aligned sensory fusion
+"""
+
+import unittest
+from sensory_ai import SensoryBrain, SensoryInput
+from sensory_fusion import SensoryFusion, LATE_DROP
+
+def stream(sense_type, timestamps, intensity=0.5):
+    """Build a timestamp-sorted stream of inputs for one sense"""
+    return [SensoryInput(sense_type, intensity, "test", timestamp=t) for t in timestamps]
+
+class TestSensoryFusion(unittest.TestCase):
+    """Test cases for SensoryFusion"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.brain = SensoryBrain()
+
+    def test_merge_streams_into_windows(self):
+        """Test that streams at different rates are aligned into cadence windows"""
+        fusion = SensoryFusion(self.brain, interval=0.5)
+        windows = list(fusion.fuse({
+            'vision': stream('vision', [10.0, 10.25, 10.5, 10.75, 11.0], 0.9),
+            'hearing': stream('hearing', [10.1, 11.2], 0.2)
+        }))
+
+        self.assertEqual([w['window'] for w in windows], [(10.0, 10.5), (10.5, 11.0), (11.0, 11.5)])
+        self.assertEqual([w['input_count'] for w in windows], [3, 2, 2])
+        self.assertEqual(windows[0]['integrated_experience']['timestamp'], 10.5)
+        self.assertEqual(windows[0]['integrated_experience']['dominant_sense'], 'vision')
+        self.assertEqual(len(self.brain.vision.visual_memory), 5)
+        self.assertEqual(len(self.brain.sensory_integration), 3)
+        self.assertEqual(len(fusion), 0)
+
+    def test_watermark_and_late_data(self):
+        """Test that windows wait for allowed lateness and late inputs are handled"""
+        fusion = SensoryFusion(self.brain, interval=1.0, allowed_lateness=0.5)
+        self.assertEqual(fusion.push(SensoryInput('smell', 0.6, 'test', timestamp=0.2)), [])
+        self.assertEqual(fusion.push(SensoryInput('taste', 0.6, 'test', timestamp=1.2)), [])
+        emitted = fusion.push(SensoryInput('touch', 0.6, 'test', timestamp=1.6))
+        self.assertEqual([w['window'] for w in emitted], [(0.0, 1.0)])
+
+        # Older than the emitted window: folded into the next one
+        fusion.push(SensoryInput('smell', 0.9, 'test', timestamp=0.4))
+        self.assertEqual(fusion.late_inputs, 1)
+        self.assertEqual(fusion.flush()[0]['input_count'], 3)
+
+        dropping = SensoryFusion(SensoryBrain(), interval=1.0, late_policy=LATE_DROP)
+        dropping.push(SensoryInput('smell', 0.6, 'test', timestamp=2.5))
+        dropping.push(SensoryInput('smell', 0.6, 'test', timestamp=3.5))
+        self.assertEqual(dropping.push(SensoryInput('smell', 0.6, 'test', timestamp=2.9)), [])
+        self.assertEqual(dropping.dropped_inputs, 1)
+
+    def test_bounded_buffer(self):
+        """Test that a full buffer integrates the oldest window early"""
+        fusion = SensoryFusion(self.brain, interval=1.0, allowed_lateness=100.0, max_buffer=3)
+        emitted = []
+        for t in [0.5, 1.5, 2.5, 3.5, 4.5]:
+            emitted.extend(fusion.push(SensoryInput('vision', 0.5, 'test', timestamp=t)))
+
+        self.assertEqual(len(fusion), 3)
+        self.assertEqual(fusion.forced_windows, 2)
+        self.assertEqual([w['window'] for w in emitted], [(0.0, 1.0), (1.0, 2.0)])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Test suite for SensoryAI instrumentation
+"""
+
+import json
+import os
+import tempfile
+import unittest
+import urllib.request
+from sensory_ai import SensoryAI
+from sensory_instrumentation import LatencyHistogram, MetricsExporter
+
+class TestLatencyHistogram(unittest.TestCase):
+    """Test cases for LatencyHistogram"""
+
+    def test_percentiles_within_bucket_resolution(self):
+        """Test that percentiles land within one bucket of the true value"""
+        histogram = LatencyHistogram()
+        for i in range(1, 1001):
+            histogram.record(i * 1e-6)
+
+        self.assertEqual(histogram.count, 1000)
+        self.assertAlmostEqual(histogram.mean, 500.5e-6)
+        for p, expected in ((50, 500e-6), (90, 900e-6), (99, 990e-6)):
+            self.assertGreaterEqual(histogram.percentile(p), expected)
+            self.assertLessEqual(histogram.percentile(p), expected * 1.19)
+        self.assertEqual(histogram.percentile(100), 1000e-6)
+
+    def test_merge(self):
+        """Test that merged histograms match recording everything in one"""
+        left, right, combined = LatencyHistogram(), LatencyHistogram(), LatencyHistogram()
+        for i, value in enumerate([1e-6, 5e-5, 3e-3, 2e-2, 7e-1, 500.0]):
+            (left if i % 2 else right).record(value)
+            combined.record(value)
+        left.merge(right)
+        self.assertEqual(left.counts, combined.counts)
+        self.assertEqual(left.summary(), combined.summary())
+
+class TestProfiling(unittest.TestCase):
+    """Test cases for per-stage profiling of experiences"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.ai = SensoryAI("ProfiledAI")
+        self.env = {"vision": "Red car", "hearing": "Loud thunder"}
+
+    def test_disabled_by_default(self):
+        """Test that nothing is recorded until profiling is switched on"""
+        self.ai.experience(self.env)
+        self.assertEqual(self.ai.get_stage_latencies(), {})
+
+    def test_stage_latencies(self):
+        """Test that each stage is timed while profiling is on"""
+        self.ai.enable_profiling()
+        self.ai.experience(self.env)
+        self.ai.experience(self.env)
+        self.ai.enable_profiling(False)
+        self.ai.experience(self.env)
+
+        latencies = self.ai.get_stage_latencies()
+        self.assertEqual(set(latencies), {'vision', 'hearing', 'integrate_senses', 'experience_quality',
+                                          'logging', 'printing', 'experience'})
+        self.assertEqual(latencies['experience']['count'], 2)
+        self.assertGreaterEqual(latencies['experience']['max'], latencies['integrate_senses']['max'])
+
+        report = self.ai.get_profiling_report()
+        self.assertIn("integrate_senses", report)
+        self.assertIn("p99", report)
+
+    def test_fork_profiles_separately(self):
+        """Test that a fork keeps the profiling switch but records its own latencies"""
+        self.ai.enable_profiling()
+        self.ai.experience(self.env)
+        branch = self.ai.fork()
+        branch.verbose = False
+        branch.experience(self.env)
+        self.assertEqual(self.ai.get_stage_latencies()['experience']['count'], 1)
+        self.assertEqual(branch.get_stage_latencies()['experience']['count'], 1)
+
+class TestChromeTracing(unittest.TestCase):
+    """Test cases for sampled Chrome trace export"""
+
+    def test_sampled_experience_spans(self):
+        """Test that one in N experiences is written with nested spans"""
+        ai = SensoryAI("TracedAI", verbose=False)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "trace.json")
+            tracer = ai.enable_tracing(path, sample_every=2)
+            for _ in range(4):
+                ai.experience({"vision": "Red car", "hearing": "Loud thunder"})
+            ai.disable_tracing()
+
+            with open(path) as f:
+                events = json.loads(f.read().rstrip().rstrip(",") + "]")
+
+        self.assertEqual(tracer.traces, 2)
+        self.assertEqual(ai.get_stage_latencies(), {})
+        roots = [e for e in events if e['name'] == 'experience']
+        self.assertEqual(len(roots), 2)
+        self.assertEqual(roots[0]['args']['agent'], "TracedAI")
+        self.assertEqual(len(events), 2 * 6)
+
+        vision = next(e for e in events if e['name'] == 'vision')
+        self.assertEqual(vision['cat'], 'process_sensory_input')
+        self.assertEqual(vision['args']['description'], "Red car")
+        root = roots[0]
+        for event in events[:6]:
+            self.assertGreaterEqual(event['ts'], root['ts'])
+            self.assertLessEqual(event['ts'] + event['dur'], root['ts'] + root['dur'])
+
+class TestMetricsExporter(unittest.TestCase):
+    """Test cases for the Prometheus exporter"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.ai = SensoryAI("Metrics AI", verbose=False)
+        self.exporter = MetricsExporter(self.ai)
+
+    def test_exposition_format(self):
+        """Test counters, gauges and stage summaries in the text output"""
+        self.ai.enable_profiling()
+        self.ai.subscribe(maxsize=10)
+        self.ai.experience({"vision": "Red car", "smell": "Coffee"})
+        self.exporter.register_gauge("fusion_buffer", "Buffered fusion inputs", lambda: 7)
+
+        text = self.exporter.collect()
+        self.assertIn('# TYPE sensory_experiences_total counter', text)
+        self.assertIn('sensory_experiences_total{agent="Metrics AI"} 1', text)
+        self.assertIn('sensory_inputs_total{agent="Metrics AI",sense="smell"} 1', text)
+        self.assertIn('sensory_memory_items{agent="Metrics AI",log="experience_log"} 1', text)
+        self.assertIn('sensory_feed_queue_depth{agent="Metrics AI",subscription="0"} 4', text)
+        self.assertIn('sensory_stage_latency_seconds_count{agent="Metrics AI",stage="experience"} 1', text)
+        self.assertIn('quantile="0.99"', text)
+        self.assertIn('sensory_fusion_buffer 7', text)
+
+    def test_large_values_keep_full_precision(self):
+        """Test that counters past a million and fractional gauges are exported exactly"""
+        self.exporter.register_gauge("big_counter", "Large count", lambda: 1_234_567)
+        self.exporter.register_gauge("ratio", "Fraction", lambda: 1 / 3)
+        self.exporter.register_gauge("numpy_like", "Float count", lambda: 12345678.0)
+        text = self.exporter.collect()
+        self.assertIn('sensory_big_counter 1234567\n', text)
+        self.assertIn(f'sensory_ratio {1 / 3!r}\n', text)
+        self.assertIn('sensory_numpy_like 12345678.0\n', text)
+
+    def test_file_and_http_export(self):
+        """Test writing a metrics file and scraping the HTTP endpoint"""
+        self.ai.experience({"taste": "Sweet honey"})
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "sensory.prom")
+            self.exporter.write(path)
+            with open(path) as f:
+                self.assertIn("sensory_awake", f.read())
+
+        server = self.exporter.serve(port=0)
+        try:
+            url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+            with urllib.request.urlopen(url, timeout=5) as response:
+                body = response.read().decode()
+        finally:
+            server.shutdown()
+            server.server_close()
+        self.assertIn('sensory_inputs_total{agent="Metrics AI",sense="taste"} 1', body)
+
+if __name__ == "__main__":
+    unittest.main()
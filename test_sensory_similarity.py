@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Test suite for similarity search and situation clustering over experiences
+"""
+
+import json
+import unittest
+import numpy as np
+from sensory_ai import SensoryAI
+from sensory_similarity import DIMENSIONS, FEATURES, SimilarityIndex, SituationClusterer, encode_experience
+
+class TestSimilarityIndex(unittest.TestCase):
+    """Test cases for experience encoding and SimilarityIndex"""
+
+    def setUp(self):
+        """Set up test fixtures: clustered vectors like discrete sense features"""
+        rng = np.random.default_rng(2)
+        centers = rng.random((50, DIMENSIONS)).astype(np.float32)
+        self.vectors = centers[rng.integers(0, 50, 20000)] + \
+            rng.normal(0, 0.05, (20000, DIMENSIONS)).astype(np.float32)
+        self.queries = self.vectors[rng.integers(0, 20000, 50)] + \
+            rng.normal(0, 0.05, (50, DIMENSIONS)).astype(np.float32)
+
+    def exact(self, query, k):
+        distances = np.linalg.norm(self.vectors - query, axis=1)
+        return list(np.argsort(distances, kind='stable')[:k])
+
+    def test_encoding(self):
+        """Test the feature layout of an encoded experience"""
+        ai = SensoryAI("Encode", verbose=False)
+        integrated = ai.experience({"touch": "warm water on glass",
+                                    "smell": "coffee"})['integrated_experience']
+        vector = encode_experience(integrated)
+        self.assertEqual(vector.shape, (DIMENSIONS,))
+        on = {feature for feature, column in FEATURES.items() if vector[column] == 1.0}
+        self.assertEqual(on, {('touch', 'smooth'), ('touch', 'warm'), ('smell', 'pleasant'),
+                              ('dominant', 'smell')})
+        self.assertAlmostEqual(vector[FEATURES[('intensity', 'smell')]], 0.7, places=6)
+
+    def test_brute_force_is_exact(self):
+        """Test that small indexes return the exact nearest neighbours"""
+        index = SimilarityIndex()
+        for begin in range(0, 20000, 3000):
+            index.add(self.vectors[begin:begin + 3000])
+        self.assertIsNone(index.centroids)
+        for query in self.queries[:10]:
+            hits = index.search(query, 5)
+            self.assertEqual([position for position, _ in hits], self.exact(query, 5))
+            self.assertAlmostEqual(hits[0][1], float(np.linalg.norm(self.vectors[hits[0][0]] - query)),
+                                   places=5)
+        self.assertNotIn(7, [position for position, _ in index.search(self.vectors[7], 3, exclude=7)])
+
+    def test_ivf_recall(self):
+        """Test that the partitioned index trains past its threshold and keeps recall high"""
+        index = SimilarityIndex(ivf_threshold=5000)
+        for begin in range(0, 20000, 1000):
+            index.add(self.vectors[begin:begin + 1000])
+        self.assertIsNotNone(index.centroids)
+        self.assertEqual(sum(len(positions) for positions in index._lists), 20000)
+        recall = np.mean([len({p for p, _ in index.search(query, 10)} & set(self.exact(query, 10))) / 10
+                          for query in self.queries])
+        self.assertGreater(recall, 0.9)
+
+    def test_agent_recall(self):
+        """Test recalling similar past experiences, catching up and forking"""
+        def environment(**descriptions):
+            return {sense: descriptions.get(sense, "")
+                    for sense in ("vision", "hearing", "touch", "smell", "taste")}
+        ai = SensoryAI("Recall", verbose=False)
+        ai.experience(environment(hearing="thunder", smell="smoke"))
+        ai.experience(environment(vision="red circle", taste="honey"))
+        ai.experience(environment(hearing="thunder", smell="garbage"))
+        self.assertEqual(ai.similar_experiences(k=1)[0].position, 0)
+
+        ai.experience(environment(vision="red circle", taste="sugar"))
+        nearest = ai.similar_experiences(k=2)
+        self.assertEqual(nearest[0].position, 1)
+        self.assertIs(nearest[0].experience, ai.brain.sensory_integration[1])
+        self.assertLessEqual(nearest[0].distance, nearest[1].distance)
+
+        branch = ai.fork()
+        branch.experience(environment(hearing="thunder", smell="smoke"))
+        self.assertEqual(branch.similar_experiences(k=1)[0].position, 0)
+        self.assertEqual(len(ai._similarity), 4)
+
+class TestSituationClusterer(unittest.TestCase):
+    """Test cases for SituationClusterer"""
+
+    def test_recovers_planted_situations(self):
+        """Test that online updates find well-separated clusters and track their means"""
+        rng = np.random.default_rng(4)
+        centers = np.eye(DIMENSIONS)[:3] * 2.0
+        truth = rng.integers(0, 3, 3000)
+        vectors = centers[truth] + rng.normal(0, 0.1, (3000, DIMENSIONS))
+        clusterer = SituationClusterer(k=3, batch_size=16)
+        labels = np.array([clusterer.observe(vector) for vector in vectors])
+        # After the first (initializing) batch each planted cluster maps to one situation
+        for planted in range(3):
+            self.assertEqual(len(set(labels[16:][truth[16:] == planted])), 1)
+        clusterer.flush()
+        self.assertEqual(clusterer.counts.sum(), 3000)
+        for situation in range(3):
+            center = centers[truth[labels == situation][-1]]
+            np.testing.assert_allclose(clusterer.centroids[situation], center, atol=0.02)
+
+        restored = SituationClusterer.from_dict(json.loads(json.dumps(clusterer.to_dict())))
+        np.testing.assert_array_equal(restored.centroids, clusterer.centroids)
+        self.assertEqual(restored.assign(vectors[-1]), labels[-1])
+
+    def test_monotonous_start_still_finds_k_situations(self):
+        """Test that a first batch of one repeated vector doesn't cap the situations"""
+        centers = np.eye(DIMENSIONS)[:3] * 2.0
+        clusterer = SituationClusterer(k=3, batch_size=4)
+        for _ in range(4):
+            clusterer.observe(centers[0])
+        self.assertTrue(clusterer.initialized)
+        self.assertEqual(len(clusterer), 1)
+        labels = [clusterer.observe(centers[i % 3]) for i in range(30)]
+        self.assertEqual(len(clusterer), 3)
+        self.assertEqual(len(set(labels[-3:])), 3)
+        self.assertEqual(labels[-3:], labels[-6:-3])
+
+    def test_to_dict_keeps_pending_batch(self):
+        """Test that serializing mid-batch neither flushes nor loses buffered vectors"""
+        clusterer = SituationClusterer(k=2, batch_size=4)
+        clusterer.observe(np.eye(DIMENSIONS)[0])
+        clusterer.observe(np.eye(DIMENSIONS)[1])
+        state = json.loads(json.dumps(clusterer.to_dict()))
+        self.assertFalse(clusterer.initialized)
+        self.assertEqual(clusterer._pending, 2)
+
+        restored = SituationClusterer.from_dict(state)
+        self.assertEqual(restored.to_dict(), state)
+        for vector in (np.eye(DIMENSIONS)[0], np.eye(DIMENSIONS)[1]):
+            restored.observe(vector)
+            clusterer.observe(vector)
+        self.assertTrue(restored.initialized)
+        np.testing.assert_array_equal(restored.centroids, clusterer.centroids)
+
+    def test_agent_situations(self):
+        """Test situation ids on experience results through fork and snapshot"""
+        ai = SensoryAI("Situations", verbose=False)
+        self.assertNotIn('situation', ai.experience({"vision": "red car"}))
+        ai.enable_situations(k=2, batch_size=4)
+        calm = {"vision": "", "hearing": "whisper", "touch": "", "smell": "flowers", "taste": ""}
+        storm = {"vision": "", "hearing": "thunder", "touch": "", "smell": "smoke", "taste": ""}
+        situations = [ai.experience(calm if i % 2 else storm)['situation'] for i in range(10)]
+        # Ids settle once the first batch of four has initialized the centroids
+        self.assertEqual(len(set(situations[4::2])), 1)
+        self.assertEqual(len(set(situations[5::2])), 1)
+        self.assertNotEqual(situations[-2], situations[-1])
+        self.assertEqual(ai.experience_log[-1]['experience']['situation'], situations[-1])
+
+        branch = ai.fork()
+        self.assertEqual(branch.experience(storm)['situation'], situations[-2])
+        self.assertIsNot(branch.situations, ai.situations)
+
+        restored = SensoryAI.restore(ai.snapshot())
+        np.testing.assert_array_equal(restored.situations.centroids, ai.situations.centroids)
+        self.assertEqual(restored.experience(calm)['situation'], situations[-1])
+
+        # Forks and snapshots part-way through the first batch leave it pending
+        early = SensoryAI("Early", verbose=False)
+        early.enable_situations(k=2, batch_size=4)
+        early.experience(storm)
+        early.fork()
+        early.snapshot()
+        self.assertFalse(early.situations.initialized)
+        for _ in range(3):
+            early.experience(calm)
+        self.assertEqual(len(early.situations), 2)
+
+if __name__ == "__main__":
+    unittest.main()
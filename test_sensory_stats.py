@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Test suite for mergeable intensity distributions and keyword sketches
+"""
+
+import json
+import math
+import random
+import statistics
+import unittest
+from sensory_ai import SensoryAI, format_sensory_stats
+from sensory_stats import IntensityDistribution, KeywordSketch, merge_intensity_stats
+
+class TestIntensityDistribution(unittest.TestCase):
+    """Test cases for IntensityDistribution"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        rng = random.Random(5)
+        self.values = [rng.betavariate(2, 5) for _ in range(10000)]
+
+    def distribution(self, values):
+        distribution = IntensityDistribution()
+        for value in values:
+            distribution.record(value)
+        return distribution
+
+    def test_percentiles_and_moments(self):
+        """Test percentiles within half a bin and exact mean and variance"""
+        distribution = self.distribution(self.values)
+        ordered = sorted(self.values)
+        for p in (50, 90, 99):
+            exact = ordered[math.ceil(p / 100 * len(ordered)) - 1]
+            self.assertAlmostEqual(distribution.percentile(p), exact, delta=0.0005 + 1e-12)
+        self.assertAlmostEqual(distribution.mean, statistics.fmean(self.values))
+        self.assertAlmostEqual(distribution.variance, statistics.pvariance(self.values))
+
+        # Discrete intensities are reported exactly
+        discrete = self.distribution([0.2, 0.5, 0.5, 0.9])
+        self.assertEqual((discrete.percentile(50), discrete.percentile(99)), (0.5, 0.9))
+
+    def test_merge_across_processes(self):
+        """Test that merged (and serialized) parts equal the whole"""
+        parts = [self.distribution(self.values[i::3]) for i in range(3)]
+        shipped = [{'vision': IntensityDistribution.from_dict(json.loads(json.dumps(part.to_dict())))}
+                   for part in parts]
+        merged = merge_intensity_stats(shipped)['vision']
+        whole = self.distribution(self.values)
+        self.assertEqual(merged.bins, whole.bins)
+        self.assertEqual(merged.count, whole.count)
+        self.assertAlmostEqual(merged.mean, whole.mean)
+        self.assertAlmostEqual(merged.variance, whole.variance)
+        self.assertEqual(merged.summary()['p90'], whole.summary()['p90'])
+
+    def test_agent_intensity_stats(self):
+        """Test that the brain tracks per-sense distributions through fork and snapshot"""
+        ai = SensoryAI("Stats", verbose=False)
+        for description in ("thunder", "whisper", "music"):
+            ai.experience({"hearing": description})
+        hearing = ai.get_sensory_stats()['intensity_distributions']['hearing']
+        self.assertEqual((hearing['count'], hearing['p50'], hearing['max']), (3, 0.5, 0.9))
+        lines = format_sensory_stats(ai.get_sensory_stats())
+        self.assertIn("Hearing Intensity: mean 0.53, p50 0.50, p90 0.90, p99 0.90 over 3 inputs", lines)
+        self.assertFalse(any('{' in line for line in lines))
+
+        branch = ai.fork()
+        branch.experience({"hearing": "thunder"})
+        self.assertEqual(ai.brain.intensity_stats['hearing'].count, 3)
+        self.assertEqual(branch.brain.intensity_stats['hearing'].count, 4)
+
+        restored = SensoryAI.restore(branch.snapshot())
+        self.assertEqual(restored.get_sensory_stats()['intensity_distributions'],
+                         branch.get_sensory_stats()['intensity_distributions'])
+
+class TestKeywordSketch(unittest.TestCase):
+    """Test cases for KeywordSketch"""
+
+    def setUp(self):
+        """Set up test fixtures: a Zipf-like stream over 5000 keys"""
+        rng = random.Random(11)
+        keys = [f"key{i}" for i in range(5000)]
+        weights = [1.0 / (rank + 1) for rank in range(len(keys))]
+        self.stream = rng.choices(keys, weights, k=50000)
+        self.counts = {}
+        for key in self.stream:
+            self.counts[key] = self.counts.get(key, 0) + 1
+
+    def test_estimates_and_heavy_hitters(self):
+        """Test bounded overcounting and that the true top keys are found"""
+        sketch = KeywordSketch(width=2048, depth=4, top_k=20)
+        for key in self.stream:
+            sketch.add(key)
+        bound = math.e / sketch.width * len(self.stream)
+        for key, count in list(self.counts.items())[:500]:
+            self.assertGreaterEqual(sketch.estimate(key), count)
+            self.assertLessEqual(sketch.estimate(key), count + bound)
+        exact_top = sorted(self.counts, key=self.counts.get, reverse=True)[:10]
+        self.assertEqual({key for key, _ in sketch.heavy_hitters(10)}, set(exact_top))
+        self.assertEqual(len(sketch.top), 20)
+
+    def test_merge_across_workers(self):
+        """Test that merged (and serialized) worker sketches equal one sketch of the stream"""
+        whole = KeywordSketch(width=512, depth=3, top_k=10, seed=4)
+        parts = [KeywordSketch(width=512, depth=3, top_k=10, seed=4) for _ in range(3)]
+        for index, key in enumerate(self.stream):
+            whole.add(key)
+            parts[index % 3].add(key)
+        merged = KeywordSketch.from_dict(json.loads(json.dumps(parts[0].to_dict())))
+        for part in parts[1:]:
+            merged.merge(KeywordSketch.from_dict(json.loads(json.dumps(part.to_dict()))))
+        self.assertEqual(merged.table, whole.table)
+        self.assertEqual(merged.total, len(self.stream))
+        self.assertEqual(merged.heavy_hitters(5), whole.heavy_hitters(5))
+        with self.assertRaises(ValueError):
+            merged.merge(KeywordSketch(width=512, depth=3, seed=5))
+
+    def test_agent_keyword_hits(self):
+        """Test per-keyword hits from the matching stage, fork and snapshot"""
+        ai = SensoryAI("Keywords", verbose=False)
+        ai.experience({"smell": "coffee"})
+        self.assertEqual(ai.get_keyword_hits(), [])
+
+        ai.enable_keyword_tracking(width=256, top_k=10)
+        for _ in range(3):
+            ai.experience({"smell": "fresh coffee and smoke", "hearing": "thunder"})
+        ai.experience({"taste": "coffee"})
+        hits = dict(ai.get_keyword_hits())
+        self.assertEqual(hits['Smell.scents:coffee'], 3)
+        self.assertEqual(hits['Smell.scents:smoke'], 3)
+        # thunder sits in both hearing tables
+        self.assertEqual(hits['Hearing.sounds:thunder'], 3)
+        self.assertEqual(hits['Hearing.frequencies:thunder'], 3)
+        self.assertEqual(hits['Taste.tastes:coffee'], 1)
+
+        branch = ai.fork()
+        branch.experience({"smell": "coffee"})
+        self.assertEqual(dict(ai.get_keyword_hits())['Smell.scents:coffee'], 3)
+        self.assertEqual(dict(branch.get_keyword_hits())['Smell.scents:coffee'], 4)
+
+        restored = SensoryAI.restore(branch.snapshot())
+        self.assertEqual(restored.get_keyword_hits(), branch.get_keyword_hits())
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Test suite for the multi-resolution intensity timeline
+"""
+
+import random
+import unittest
+from sensory_ai import SensoryAI
+from sensory_timeline import FANOUT, IntensityTimeline, lttb
+
+class TestIntensityTimeline(unittest.TestCase):
+    """Test cases for IntensityTimeline"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        rng = random.Random(3)
+        self.values = [rng.random() for _ in range(5000)]
+        self.timeline = IntensityTimeline()
+        self.timeline.extend((float(i), value) for i, value in enumerate(self.values))
+
+    def test_levels_match_buckets(self):
+        """Test that incrementally maintained levels equal freshly computed buckets"""
+        for level in self.timeline.levels:
+            for bucket in (0, 1, len(level.low) - 1):
+                chunk = self.values[bucket * level.size:(bucket + 1) * level.size]
+                self.assertEqual(level.low[bucket], min(chunk))
+                self.assertEqual(level.high[bucket], max(chunk))
+                self.assertEqual(level.count[bucket], len(chunk))
+                self.assertAlmostEqual(level.total[bucket], sum(chunk))
+        self.assertEqual([level.size for level in self.timeline.levels], [FANOUT, FANOUT ** 2, FANOUT ** 3, FANOUT ** 4])
+
+    def test_query_resolution(self):
+        """Test that queries fit max_points and keep extremes, with detail when zoomed"""
+        series = self.timeline.query(max_points=200)
+        self.assertLessEqual(len(series.time), 200)
+        self.assertEqual(series.points, 5000)
+        self.assertEqual(min(series.low), min(self.values))
+        self.assertEqual(max(series.high), max(self.values))
+
+        zoomed = self.timeline.query(1000.0, 1099.0, max_points=200)
+        self.assertEqual(zoomed.bucket_size, 1)
+        self.assertEqual(zoomed.mean, self.values[1000:1100])
+
+        coarse = self.timeline.query(1000.0, 2999.0, max_points=100)
+        self.assertEqual(coarse.bucket_size, FANOUT ** 2)
+        self.assertLessEqual(coarse.time[0], 1000.0)
+
+    def test_fork_is_independent(self):
+        """Test that a fork sees the points it was made with however either side grows"""
+        branch = self.timeline.fork()
+        self.assertEqual(len(branch), 5000)
+        self.timeline.extend((5000.0 + i, 2.0) for i in range(100))
+        grandchild = branch.fork()
+        branch.extend((5000.0 + i, -1.0) for i in range(3))
+
+        expected = IntensityTimeline()
+        expected.extend((float(i), value) for i, value in enumerate(self.values + [-1.0] * 3))
+        for level, reference in zip(branch.levels, expected.levels):
+            for name in ('start', 'low', 'high', 'count'):
+                self.assertEqual(getattr(level, name), getattr(reference, name))
+            for total, reference_total in zip(level.total, reference.total):
+                self.assertAlmostEqual(total, reference_total)
+        self.assertEqual(len(branch.levels), len(expected.levels))
+        self.assertEqual(branch.query(max_points=100).low, expected.query(max_points=100).low)
+        self.assertEqual(grandchild.span(), (0.0, 4999.0))
+        self.assertEqual(self.timeline.query(4990.0, max_points=200).points, 110)
+
+    def test_compact_keeps_levels(self):
+        """Test that compacted points are still summarised and forks are unaffected"""
+        branch = self.timeline.fork()
+        whole = self.timeline.query(max_points=200)
+        self.timeline.compact(3003)
+        self.assertEqual(len(self.timeline), 5000)
+        self.assertEqual(len(self.timeline.times), 2000)
+        self.assertEqual(self.timeline.query(max_points=200), whole)
+        self.assertEqual(self.timeline.span(), (0.0, 4999.0))
+
+        # The compacted stretch comes back in whole finest buckets
+        old = self.timeline.query(1000.0, 1099.0, max_points=200)
+        self.assertEqual((old.bucket_size, old.points), (FANOUT, 104))
+        self.assertEqual(old.low[0], min(self.values[1000:1008]))
+        self.assertEqual(self.timeline.query(4000.0, 4099.0).mean, self.values[4000:4100])
+        self.assertEqual(self.timeline.query(10.0, 10.5).points, 0)
+
+        late = self.timeline.fork()
+        self.timeline.extend((5000.0 + i, 2.0) for i in range(100))
+        self.timeline.compact(5100)
+        self.assertEqual(len(self.timeline.times), 4)
+        # Forks taken before a compaction see only the raw points it kept
+        self.assertEqual(branch.query(4990.0).mean, self.values[4992:])
+        self.assertEqual(late.query(max_points=200).high, whole.high)
+        branch.extend((5000.0 + i, -1.0) for i in range(3))
+        self.assertEqual(len(branch), 5003)
+        self.assertEqual(branch.query(4995.0).mean, self.values[4995:] + [-1.0] * 3)
+        expected = IntensityTimeline()
+        expected.extend((float(i), value) for i, value in enumerate(self.values + [-1.0] * 3))
+        self.assertEqual(branch.query(max_points=200).low, expected.query(max_points=200).low)
+        self.assertEqual(len(self.timeline.levels), 4)
+
+    def test_lttb(self):
+        """Test LTTB keeps endpoints, the point count and a lone spike"""
+        values = [0.0] * 1000
+        values[437] = 1.0
+        times, sampled = lttb(list(range(1000)), values, 50)
+        self.assertEqual(len(times), 50)
+        self.assertEqual((times[0], times[-1]), (0, 999))
+        self.assertIn(437, times)
+
+        series = self.timeline.query(max_points=100, method="lttb")
+        self.assertEqual(len(series.time), 100)
+
+    def test_agent_timeline(self):
+        """Test that an agent's timeline catches up with its log and forks"""
+        now = [100.0]
+        ai = SensoryAI("Timeline", verbose=False)
+        ai.set_clock(lambda: now[0])
+        for i in range(20):
+            now[0] += 1.0
+            ai.experience({"hearing": "thunder" if i % 2 else "whisper"})
+        series = ai.intensity_timeline()
+        self.assertEqual(series.time, [101.0 + i for i in range(20)])
+        self.assertEqual(series.mean[:2], [0.2, 0.9])
+
+        branch = ai.fork()
+        branch.experience({"hearing": "whisper"})
+        self.assertEqual(branch.intensity_timeline().points, 21)
+        self.assertEqual(ai.intensity_timeline(start=110.0).points, 11)
+
+if __name__ == "__main__":
+    unittest.main()